@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import odoo
+from odoo.cli import Command
+from odoo.tools import config
+
+
+class HotelBenchmark(Command):
+    """Generate the hotel benchmark data set and time the hotel scenarios"""
+    name = 'hotel_benchmark'
+
+    def run(self, cmdargs):
+        """Parse the arguments, run the benchmark on the database and write
+        the results as JSON to the output file or to stdout. The data set is
+        committed so later runs reuse it, the scenarios are rolled back."""
+        parser = argparse.ArgumentParser(
+            prog=f'{Path(sys.argv[0]).name} {self.name}',
+            description=self.__doc__)
+        parser.add_argument('-c', '--config', help="Odoo configuration file")
+        parser.add_argument('-d', '--database', required=True,
+                            help="Database with hotel_management_benchmark "
+                                 "installed")
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--floors', type=int, default=10)
+        parser.add_argument('--rooms-per-floor', type=int, default=50)
+        parser.add_argument('--bookings', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--date-start',
+                            help="Date the bookings are spread around "
+                                 "(YYYY-MM-DD), today by default")
+        parser.add_argument('--scenario', action='append', dest='scenarios',
+                            help="Scenario to run, may be repeated, all by "
+                                 "default")
+        parser.add_argument('-o', '--output',
+                            help="JSON file receiving the results")
+        args = parser.parse_args(cmdargs)
+
+        config_args = ['-d', args.database]
+        if args.config:
+            config_args += ['-c', args.config]
+        config.parse_config(config_args)
+        registry = odoo.modules.registry.Registry(args.database)
+        with registry.cursor() as cr:
+            env = odoo.api.Environment(cr, odoo.SUPERUSER_ID, {})
+            benchmark = env['hotel.benchmark']
+            if not benchmark._get_dataset():
+                benchmark._generate_data(
+                    args.seed, args.floors, args.rooms_per_floor,
+                    args.bookings, odoo.fields.Date.to_date(
+                        args.date_start) or odoo.fields.Date.today())
+                cr.commit()
+            result = benchmark.run_benchmark(
+                seed=args.seed, floors=args.floors,
+                rooms_per_floor=args.rooms_per_floor, bookings=args.bookings,
+                repeat=args.repeat, scenarios=args.scenarios,
+                date_start=args.date_start)
+            cr.rollback()
+        payload = json.dumps(result, indent=2, default=str)
+        if args.output:
+            Path(args.output).write_text(payload)
+        else:
+            print(payload)
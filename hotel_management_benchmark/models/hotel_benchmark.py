@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import platform
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from odoo import api, fields, models, release
+from odoo.addons.hotel_management_odoo.models.room_booking import \
+    DASHBOARD_CACHE
+
+PREFIX = 'Benchmark'
+ROOM_TYPES = [('single', 1), ('double', 2), ('dormitory', 4)]
+# Scenarios run by default, in this order, with the method timing them
+SCENARIOS = [
+    ('search_available', '_bench_search_available'),
+    ('find_conflicts', '_bench_find_conflicts'),
+    ('get_details', '_bench_get_details'),
+    ('compute_amount_untaxed', '_bench_compute_amount_untaxed'),
+    ('action_invoice', '_bench_action_invoice'),
+    ('report_room_booking', '_bench_report_room_booking'),
+    ('report_sale_order', '_bench_report_sale_order'),
+    ('group_checkin', '_bench_group_checkin'),
+]
+
+
+class HotelBenchmark(models.AbstractModel):
+    """Generates the benchmark data set and times the hotel operations"""
+    _name = 'hotel.benchmark'
+    _description = 'Hotel Benchmark'
+
+    @api.model
+    def run_benchmark(self, seed=42, floors=10, rooms_per_floor=50,
+                      bookings=2000, repeat=3, scenarios=None,
+                      date_start=None):
+        """Generate the data set when missing and run the scenarios. Every
+        scenario run is rolled back, so the runs and the scenarios all see
+        the same data.
+        ----------------------------------------
+        @param seed: seed of the random generator of the data set
+        @param floors: number of floors
+        @param rooms_per_floor: number of rooms per floor
+        @param bookings: number of bookings
+        @param repeat: number of runs of each scenario
+        @param scenarios: names of the scenarios to run, all by default
+        @param date_start: date the bookings are spread around, today by
+                           default
+        @return: JSON serializable dict of the results"""
+        date_start = fields.Date.to_date(date_start) or fields.Date.today()
+        params = {
+            'seed': seed,
+            'floors': floors,
+            'rooms_per_floor': rooms_per_floor,
+            'bookings': bookings,
+            'repeat': repeat,
+            'date_start': fields.Date.to_string(date_start),
+        }
+        if not self._get_dataset():
+            self._generate_data(seed, floors, rooms_per_floor, bookings,
+                                date_start)
+        dataset = self._get_dataset()
+        dataset.update(date_start=date_start, block_room_ids=random.Random(
+            seed).sample(dataset['rooms'], min(20, len(dataset['rooms']))))
+        results = {}
+        for name, method in SCENARIOS:
+            if scenarios and name not in scenarios:
+                continue
+            runs = [self._measure(getattr(self, method), dataset)
+                    for _i in range(repeat)]
+            wall_times = [run['wall_time'] for run in runs]
+            results[name] = {
+                'runs': runs,
+                'wall_time': {
+                    'min': min(wall_times),
+                    'median': statistics.median(wall_times),
+                    'max': max(wall_times),
+                },
+                'queries': runs[0]['queries'],
+            }
+        return {
+            'version': release.version,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'date': fields.Datetime.to_string(fields.Datetime.now()),
+            'params': params,
+            'dataset': {key: len(dataset[key])
+                        for key in ('rooms', 'bookings', 'invoices')},
+            'scenarios': results,
+        }
+
+    def _measure(self, scenario, dataset):
+        """Run the scenario once on a cold cache inside a savepoint rolled
+        back afterwards, and return its wall time and query count"""
+        cr = self.env.cr
+        self.env.flush_all()
+        self.env.invalidate_all()
+        with cr.savepoint() as savepoint:
+            queries = cr.sql_log_count
+            start = time.perf_counter()
+            scenario(dataset)
+            self.env.flush_all()
+            wall_time = time.perf_counter() - start
+            queries = cr.sql_log_count - queries
+            savepoint.rollback()
+        self.env.invalidate_all()
+        return {'wall_time': round(wall_time, 6), 'queries': queries}
+
+    @api.model
+    def _get_dataset(self):
+        """Return the ids of the generated records, empty when the data set
+        was not generated yet"""
+        rooms = self.env['hotel.room'].search(
+            [('floor_id.name', '=like', f'{PREFIX} %')], order='id')
+        if not rooms:
+            return {}
+        bookings = self.env['room.booking'].search(
+            [('partner_id.name', '=like', f'{PREFIX} %')], order='id')
+        [(date_end,)] = self.env['room.booking.line']._read_group(
+            [('booking_id', 'in', bookings.ids)], [], ['checkout_date:max'])
+        return {
+            'rooms': rooms.ids,
+            'bookings': bookings.ids,
+            'date_end': date_end,
+            'invoices': self.env['account.move'].search(
+                [('booking_id', 'in', bookings.ids)]).ids,
+        }
+
+    @api.model
+    def _generate_data(self, seed, floors, rooms_per_floor, bookings,
+                       date_start):
+        """Create the data set. The records only depend on the parameters:
+        the stays are laid out room after room from 60 days before
+        date_start on, and their state follows from the current date."""
+        rng = random.Random(seed)
+        env = self.env
+        company = env.company
+        partners = env['res.partner'].create([
+            {'name': f'{PREFIX} Guest {index:05d}'}
+            for index in range(max(bookings // 10, 1))])
+        floor_records = env['hotel.floor'].create([
+            {'name': f'{PREFIX} {index + 1:02d}', 'user_id': env.ref(
+                'base.user_admin').id}
+            for index in range(floors)])
+        room_vals = []
+        for floor in floor_records:
+            for index in range(rooms_per_floor):
+                room_type, num_person = rng.choice(ROOM_TYPES)
+                room_vals.append({
+                    'name': f'B{floor.name[-2:]}{index + 1:03d}',
+                    'floor_id': floor.id,
+                    'room_type': room_type,
+                    'num_person': num_person,
+                    'list_price': rng.randrange(50, 300, 5),
+                })
+        rooms = env['hotel.room'].create(room_vals)
+        category = env['lunch.product.category'].create(
+            {'name': f'{PREFIX} Food'})
+        foods = env['lunch.product'].create([
+            {'name': f'{PREFIX} Dish {index:02d}', 'category_id': category.id,
+             'price': rng.randrange(5, 40)} for index in range(20)])
+        services = env['hotel.service'].create([
+            {'name': f'{PREFIX} Service {index:02d}',
+             'unit_price': rng.randrange(10, 80)} for index in range(10)])
+        brand = env['fleet.vehicle.model.brand'].create(
+            {'name': f'{PREFIX} Motors'})
+        vehicles = env['fleet.vehicle.model'].create([
+            {'name': f'{PREFIX} Car {index:02d}', 'brand_id': brand.id,
+             'price_per_km': rng.randrange(1, 5)} for index in range(5)])
+        ticket = env['product.product'].create({
+            'name': f'{PREFIX} Ticket',
+            'type': 'service',
+            'service_tracking': 'event',
+            'list_price': 25,
+        })
+        origin = datetime.combine(date_start - timedelta(days=60),
+                                  datetime.min.time())
+        events = env['event.event'].create([{
+            'name': f'{PREFIX} Event {index:02d}',
+            'date_begin': origin + timedelta(days=7 * index, hours=18),
+            'date_end': origin + timedelta(days=7 * index, hours=22),
+        } for index in range(20)])
+
+        now = fields.Datetime.now()
+        next_free = dict.fromkeys(rooms.ids, origin)
+        bookings_by_state = {}
+        Booking = env['room.booking'].with_context(tracking_disable=True)
+        for index in range(bookings):
+            room = rooms[index % len(rooms)]
+            nights = rng.randint(1, 6)
+            checkin = next_free[room.id] + timedelta(
+                days=rng.randint(0, 3), hours=14)
+            checkout = checkin.replace(hour=11) + timedelta(days=nights)
+            next_free[room.id] = checkout.replace(hour=0)
+            vals = {
+                'partner_id': rng.choice(partners).id,
+                'company_id': company.id,
+                'checkin_date': checkin,
+                'checkout_date': checkout,
+                'room_line_ids': [fields.Command.create({
+                    'room_id': room.id,
+                    'checkin_date': checkin,
+                    'checkout_date': checkout,
+                    'uom_qty': nights,
+                })],
+            }
+            if rng.random() < 0.5:
+                vals.update(need_food=True, food_order_line_ids=[
+                    fields.Command.create({'food_id': rng.choice(foods).id,
+                                           'uom_qty': rng.randint(1, 4)})
+                    for _i in range(rng.randint(1, 3))])
+            if rng.random() < 0.3:
+                vals.update(need_service=True, service_line_ids=[
+                    fields.Command.create({
+                        'service_id': rng.choice(services).id,
+                        'uom_qty': rng.randint(1, 2)})])
+            if rng.random() < 0.1:
+                vals.update(need_fleet=True, vehicle_line_ids=[
+                    fields.Command.create({'fleet_id': rng.choice(vehicles).id,
+                                           'uom_qty': rng.randint(10, 200)})])
+            if rng.random() < 0.1:
+                vals.update(need_event=True, event_line_ids=[
+                    fields.Command.create({'event_id': rng.choice(events).id,
+                                           'ticket_id': ticket.id,
+                                           'uom_qty': rng.randint(1, 3)})])
+            if checkout <= now:
+                state = 'check_out'
+            elif checkin <= now:
+                state = 'check_in'
+            else:
+                state = 'reserved' if rng.random() < 0.8 else 'draft'
+            bookings_by_state.setdefault(state, []).append(
+                Booking.create(vals).id)
+        for state, booking_ids in bookings_by_state.items():
+            if state != 'draft':
+                Booking.browse(booking_ids).write({'state': state})
+        rooms._recompute_status()
+        departed = Booking.browse(bookings_by_state.get('check_out', []))
+        invoices = departed._create_invoices()
+        invoices.filtered(lambda move: move.id % 2).action_post()
+
+    def _bench_search_available(self, dataset):
+        """Free rooms of the hotel for a week"""
+        date_from = dataset['date_start']
+        self.env['hotel.room'].search_available(
+            date_from, date_from + timedelta(days=7))
+
+    def _bench_find_conflicts(self, dataset):
+        """Availability of every room for a three nights stay"""
+        start = datetime.combine(dataset['date_start'], datetime.min.time())
+        self.env['hotel.room']._find_conflicts([
+            (room_id, start, start + timedelta(days=3))
+            for room_id in dataset['rooms']])
+
+    def _bench_get_details(self, dataset):
+        """Dashboard counts, the shared snapshot being dropped first"""
+        DASHBOARD_CACHE.clear()
+        self.env['room.booking'].get_details()
+
+    def _bench_compute_amount_untaxed(self, dataset):
+        """Totals of all the bookings"""
+        self.env['room.booking'].browse(
+            dataset['bookings'])._compute_amount_untaxed()
+
+    def _bench_action_invoice(self, dataset):
+        """Invoice of 50 checked-in or reserved bookings, one by one"""
+        bookings = self.env['room.booking'].search([
+            ('id', 'in', dataset['bookings']),
+            ('state', 'in', ['reserved', 'check_in']),
+        ], order='id', limit=50)
+        for booking in bookings:
+            booking.action_invoice()
+
+    def _bench_report_room_booking(self, dataset):
+        """Room booking xlsx report over all the bookings"""
+        with tempfile.TemporaryFile() as output:
+            self.env['room.booking.detail'].get_xlsx_report({}, output)
+
+    def _bench_report_sale_order(self, dataset):
+        """Sale order xlsx report over all the bookings"""
+        with tempfile.TemporaryFile() as output:
+            self.env['sale.order.detail'].get_xlsx_report({}, output)
+
+    def _bench_group_checkin(self, dataset):
+        """Block of 20 rooms booked after the generated stays and checked
+        in at once"""
+        checkin = (dataset['date_end'] or datetime.now()) + timedelta(days=1)
+        booking = self.env['room.booking'].create_block(
+            self.env.user.partner_id.id, dataset['block_room_ids'], checkin,
+            checkin + timedelta(days=2))
+        booking.action_checkin()
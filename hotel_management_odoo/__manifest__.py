@@ -21,7 +21,7 @@
 ###############################################################################
 {
     'name': 'Hotel Management',
-    'version': '18.0.1.1.1',
+    'version': '18.0.1.2.0',
     'category': 'Industries',
     'summary': """A complete Hotel Management System that cover all areas of 
      Hotel services""" ,
@@ -38,24 +38,34 @@
         'security/hotel_management_odoo_security.xml',
         'security/ir.model.access.csv',
         'data/ir_data_sequence.xml',
+        'data/hotel_room_night_data.xml',
+        'data/hotel_revenue_daily_data.xml',
+        'data/hotel_room_block_data.xml',
+        'data/ir_cron_data.xml',
         'views/account_move_views.xml',
         'views/hotel_menu_views.xml',
         'views/hotel_amenity_views.xml',
         'views/hotel_service_views.xml',
         'views/hotel_floor_views.xml',
         'views/hotel_room_views.xml',
+        'views/hotel_rate_plan_views.xml',
         'views/lunch_product_views.xml',
         'views/fleet_vehicle_model_views.xml',
         'views/room_booking_views.xml',
         'views/maintenance_team_views.xml',
         'views/maintenance_request_views.xml',
+        'views/hotel_room_block_views.xml',
         'views/cleaning_team_views.xml',
         'views/cleaning_request_views.xml',
         'views/food_booking_line_views.xml',
         'views/dashboard_view.xml',
         'wizard/room_booking_detail_views.xml',
         'wizard/sale_order_detail_views.xml',
+        'wizard/room_booking_block_wizard_views.xml',
         'views/reporting_views.xml',
+        'views/hotel_room_night_views.xml',
+        'views/hotel_night_audit_views.xml',
+        'views/hotel_report_job_views.xml',
         'report/room_booking_reports.xml',
         'report/sale_order_reports.xml',
     ],
@@ -20,3 +20,6 @@
 #
 ###############################################################################
 from . import hotel_management_odoo
+from . import hotel_ari
+from . import hotel_timeline
+from . import hotel_kitchen
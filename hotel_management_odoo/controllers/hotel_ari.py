@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import http
+from odoo.http import request
+
+
+class HotelAriController(http.Controller):
+    """Feed of the availability and rate changes for the distribution
+    channels"""
+
+    @http.route('/hotel/ari/changes', type='http', auth='user',
+                methods=['GET'])
+    def get_ari_changes(self, cursor=0, limit=1000):
+        """Return the room type and night cells changed since the cursor as
+        JSON lines, the cursor to use for the next call being sent in the
+        X-ARI-Cursor header"""
+        if not request.env.user.has_group(
+                'hotel_management_odoo.hotel_group_admin'):
+            raise request.not_found()
+        cursor, cells = request.env['hotel.ari.change'].sudo().export_changes(
+            int(cursor), min(int(limit), 10000))
+        return request.make_response(
+            request.env['hotel.ari.change']._to_jsonl(cells),
+            headers=[('Content-Type', 'application/x-ndjson'),
+                     ('X-ARI-Cursor', str(cursor))])
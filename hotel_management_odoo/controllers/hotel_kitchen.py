@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import http
+from odoo.http import request
+
+
+class HotelKitchenController(http.Controller):
+    """Food order queue of the kitchen screens"""
+
+    @http.route('/hotel/kitchen/queue', type='http', auth='user',
+                methods=['GET'])
+    def get_kitchen_queue(self, cursor=None, limit=100):
+        """Return the food orders changed since the cursor as JSON, see
+        food.booking.line.get_kitchen_queue"""
+        return request.make_json_response(
+            request.env['food.booking.line'].get_kitchen_queue(
+                cursor or None, min(int(limit), 1000)))
@@ -20,6 +20,8 @@
 #
 ###############################################################################
 import json
+import tempfile
+from werkzeug.wsgi import wrap_file
 from odoo import http
 from odoo.http import content_disposition, request
 from odoo.tools import html_escape
@@ -32,18 +34,27 @@ class XLSXReportController(http.Controller):
                 methods=['POST'], csrf=False)
     def get_room_booking_report_xlsx(self, model, options, output_format,
                                      report_name):
-        """Function for generating xlsx report"""
-        report_obj = request.env[model].sudo()
+        """Function for generating xlsx report, the options are the filter
+        criteria of the report. The workbook is written to a temporary file
+        which is then streamed to the client."""
+        report_obj = request.env[model]
         options = json.loads(options)
         try:
             if output_format == 'xlsx':
-                response = request.make_response(
-                    None,
+                output = tempfile.TemporaryFile()
+                try:
+                    report_obj.get_xlsx_report(options, output)
+                    output.seek(0)
+                except Exception:
+                    output.close()
+                    raise
+                response = http.Response(
+                    wrap_file(request.httprequest.environ, output),
                     headers=[('Content-Type', 'application/vnd.ms-excel'),
                              ('Content-Disposition',
-                              content_disposition(report_name + '.xlsx'))]
+                              content_disposition(report_name + '.xlsx'))],
+                    direct_passthrough=True,
                 )
-                report_obj.get_xlsx_report(options, response)
                 response.set_cookie('fileToken', 'dummy token')
                 return response
         except Exception as e:
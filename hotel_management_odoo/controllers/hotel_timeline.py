@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import hashlib
+import json
+from odoo import http
+from odoo.http import request
+
+
+class HotelTimelineController(http.Controller):
+    """Data of the reservation chart"""
+
+    @http.route('/hotel/timeline', type='http', auth='user',
+                methods=['GET'])
+    def get_timeline(self, date_from, date_to, floor_id=None,
+                     room_type=None, page=0):
+        """Return the columnar timeline of hotel.room.get_timeline as JSON.
+        The ETag is the hash of the payload, when it matches the one of the
+        client a 304 without body is returned."""
+        timeline = request.env['hotel.room'].get_timeline(
+            date_from, date_to, floor_id=int(floor_id) if floor_id else False,
+            room_type=room_type or False, page=int(page))
+        body = json.dumps(timeline, separators=(',', ':'))
+        etag = hashlib.sha1(body.encode()).hexdigest()
+        headers = [('ETag', '"%s"' % etag),
+                   ('Cache-Control', 'private, no-cache')]
+        if request.httprequest.if_none_match.contains(etag):
+            return request.make_response('', headers=headers, status=304)
+        return request.make_response(
+            body, headers=headers + [('Content-Type', 'application/json')])
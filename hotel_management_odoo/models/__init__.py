@@ -21,18 +21,29 @@
 ###############################################################################
 from . import account_move
 from . import account_move_line
+from . import hotel_booking_line_mixin
 from . import cleaning_request
 from . import cleaning_team
 from . import event_booking_line
+from . import event_event
 from . import fleet_booking_line
 from . import fleet_vehicle_model
 from . import food_booking_line
 from . import hotel_amenity
+from . import hotel_ari_change
 from . import hotel_floor
+from . import hotel_night_audit
+from . import hotel_rate_calendar
+from . import hotel_rate_plan
+from . import hotel_report_job
 from . import hotel_room
+from . import hotel_room_block
+from . import hotel_room_night
+from . import hotel_revenue_daily
 from . import hotel_service
 from . import maintenance_request
 from . import maintenance_team
+from . import res_company
 from . import room_booking
 from . import room_booking_line
 from . import service_booking_line
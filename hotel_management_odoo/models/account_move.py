@@ -19,7 +19,7 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 ###############################################################################
-from odoo import fields, models
+from odoo import api, fields, models
 
 
 class AccountMove(models.Model):
@@ -27,7 +27,47 @@ class AccountMove(models.Model):
     invoicing model."""
     _inherit = "account.move"
 
-    hotel_booking_id = fields.Many2one('room.booking',
+    booking_id = fields.Many2one('room.booking', string="Booking",
+                                 readonly=True, index='btree_not_null',
+                                 copy=False,
+                                 help="Booking invoiced by this move")
+    hotel_booking_id = fields.Many2one(related='booking_id',
                                        string="Booking Reference",
-                                       readonly=True, help="Choose the Booking"
-                                                           "Reference")
+                                       help="Booking invoiced by this move")
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Refresh the revenue of the hotel dashboard"""
+        moves = super().create(vals_list)
+        moves._invalidate_hotel_dashboard()
+        return moves
+
+    def write(self, vals):
+        """Refresh the revenue of the hotel dashboard and the daily revenue
+        of the days the folio invoices leave or enter"""
+        revenue_fields = {'state', 'date', 'company_id', 'booking_id'}
+        if revenue_fields & set(vals):
+            self.env['hotel.revenue.daily']._mark_moves(self)
+        result = super().write(vals)
+        if revenue_fields & set(vals):
+            self.env['hotel.revenue.daily']._mark_moves(self)
+        self._invalidate_hotel_dashboard()
+        return result
+
+    def unlink(self):
+        """Refresh the daily revenue of the deleted folio invoices"""
+        self.env['hotel.revenue.daily']._mark_moves(self)
+        return super().unlink()
+
+    def _compute_payment_state(self):
+        """Payments do not write on the invoices, refresh the revenue of the
+        hotel dashboard when their payment state is recomputed"""
+        super()._compute_payment_state()
+        self.env['hotel.revenue.daily']._mark_moves(self)
+        self._invalidate_hotel_dashboard()
+
+    def _invalidate_hotel_dashboard(self):
+        """Invalidate the dashboard of the companies of the folio invoices"""
+        moves = self.filtered(lambda move: move.id and move.booking_id)
+        if moves:
+            self.env['room.booking']._invalidate_dashboard(moves.company_id)
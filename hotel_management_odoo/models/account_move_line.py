@@ -32,3 +32,33 @@ class AccountMoveLine(models.Model):
                                      ('fleet', 'Fleet')],
                                     string="Product Type",
                                     help="Choose the product type")
+    room_booking_line_id = fields.Many2one('room.booking.line',
+                                           string="Room Booking Line",
+                                           index='btree_not_null', copy=False,
+                                           readonly=True,
+                                           help="Room line invoiced by this "
+                                                "line")
+    food_booking_line_id = fields.Many2one('food.booking.line',
+                                           string="Food Booking Line",
+                                           index='btree_not_null', copy=False,
+                                           readonly=True,
+                                           help="Food line invoiced by this "
+                                                "line")
+    service_booking_line_id = fields.Many2one('service.booking.line',
+                                              string="Service Booking Line",
+                                              index='btree_not_null',
+                                              copy=False, readonly=True,
+                                              help="Service line invoiced by "
+                                                   "this line")
+    fleet_booking_line_id = fields.Many2one('fleet.booking.line',
+                                            string="Fleet Booking Line",
+                                            index='btree_not_null',
+                                            copy=False, readonly=True,
+                                            help="Fleet line invoiced by this "
+                                                 "line")
+    event_booking_line_id = fields.Many2one('event.booking.line',
+                                            string="Event Booking Line",
+                                            index='btree_not_null',
+                                            copy=False, readonly=True,
+                                            help="Event line invoiced by this "
+                                                 "line")
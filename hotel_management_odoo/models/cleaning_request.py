@@ -19,8 +19,19 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 ###############################################################################
+import logging
+from datetime import datetime, timedelta
+
 from odoo import api, fields, models, _
 from odoo.exceptions import ValidationError
+from ..tools.housekeeping_dispatch import dispatch_tasks
+
+_logger = logging.getLogger(__name__)
+
+# Workload of the cleaning of a room by origin of the request, a room left
+# by its guests taking longer than the daily service of an occupied room.
+DISPATCH_WEIGHTS = {'checkout': 1.0, 'stay_over': 0.5}
+OPEN_STATES = ['draft', 'assign', 'ongoing', 'support']
 
 
 class CleaningRequest(models.Model):
@@ -71,15 +82,91 @@ class CleaningRequest(models.Model):
     domain_partner_ids = fields.Many2many('res.partner',
                                           string="Domain Partner",
                                           help="Choose the Domain Partner")
+    origin = fields.Selection([('checkout', 'Check-Out'),
+                               ('stay_over', 'Stay-Over')],
+                              string="Origin", readonly=True,
+                              help="Set on the requests created by the "
+                                   "housekeeping dispatcher")
 
-    @api.model
+    @api.model_create_multi
     def create(self, vals_list):
         """Sequence Generation"""
-        if vals_list.get('sequence', 'New') == 'New':
-            vals_list['sequence'] = self.env['ir.sequence'].next_by_code(
-                'cleaning.request')
+        for vals in vals_list:
+            if vals.get('sequence', 'New') == 'New':
+                vals['sequence'] = self.env['ir.sequence'].next_by_code(
+                    'cleaning.request')
         return super().create(vals_list)
 
+    @api.model
+    def _dispatch_rooms(self, rooms, origin):
+        """Create the cleaning requests of the rooms and assign them to the
+        members of the cleaning teams, balancing their open workload and
+        keeping each of them on close floors (tools/housekeeping_dispatch.py).
+        Rooms which already have an open request are skipped. All the
+        requests are created at once.
+        ----------------------------------------
+        @param rooms: hotel.room recordset
+        @param origin: 'checkout' or 'stay_over'
+        @return: the created cleaning.request records"""
+        busy_rooms = self.search([('room_id', 'in', rooms.ids),
+                                  ('state', 'in', OPEN_STATES)]).room_id
+        rooms = (rooms - busy_rooms).sorted(
+            lambda room: (room.floor_id.level, room.name))
+        if not rooms:
+            return self.browse()
+        teams = self.env['cleaning.team'].search([('member_ids', '!=', False)])
+        if not teams:
+            _logger.warning("No cleaning team to dispatch the cleaning of %s "
+                            "rooms to", len(rooms))
+            return self.browse()
+        team_by_member = {}
+        for team in teams:
+            for member in team.member_ids:
+                team_by_member.setdefault(member.id, team.id)
+        # Open workload of the members and floor of their latest request
+        open_requests = self.search_read(
+            [('assigned_id', 'in', list(team_by_member)),
+             ('state', 'in', OPEN_STATES)],
+            ['assigned_id', 'room_id', 'origin'], order='id')
+        levels = {room.id: room.floor_id.level
+                  for room in self.env['hotel.room'].browse(
+                      {req['room_id'][0] for req in open_requests
+                       if req['room_id']})}
+        workload = dict.fromkeys(team_by_member, 0.0)
+        position = dict.fromkeys(team_by_member)
+        for req in open_requests:
+            member_id = req['assigned_id'][0]
+            workload[member_id] += DISPATCH_WEIGHTS.get(req['origin'], 1.0)
+            if req['room_id']:
+                position[member_id] = levels[req['room_id'][0]]
+        assignments = dispatch_tasks(
+            [(room.id, room.floor_id.level, DISPATCH_WEIGHTS[origin])
+             for room in rooms],
+            [(member_id, workload[member_id], position[member_id])
+             for member_id in team_by_member])
+        return self.with_context(
+            tracking_disable=True, mail_create_nolog=True).create([{
+                'cleaning_type': 'room',
+                'room_id': room.id,
+                'origin': origin,
+                'state': 'assign',
+                'team_id': team_by_member[assignments[room.id]],
+                'assigned_id': assignments[room.id],
+            } for room in rooms]).with_env(self.env)
+
+    @api.model
+    def _cron_dispatch_stay_overs(self):
+        """Dispatch the daily cleaning of the rooms whose guests stay
+        another night"""
+        today = datetime.combine(fields.Date.today(), datetime.min.time())
+        lines = self.env['room.booking.line'].search([
+            ('booking_id.state', '=', 'check_in'),
+            ('room_id', '!=', False),
+            ('checkin_date', '<', today),
+            ('checkout_date', '>=', today + timedelta(days=1)),
+        ])
+        self._dispatch_rooms(lines.room_id, 'stay_over')
+
     @api.onchange('team_id')
     def _onchange_team_id(self):
         """Function for updating the domain partner ids"""
@@ -25,6 +25,7 @@ from odoo import api, fields, models
 class EventBookingLine(models.Model):
     """Model that handles the event booking form"""
     _name = "event.booking.line"
+    _inherit = ["hotel.booking.line.mixin"]
     _description = "Hotel Event Line"
     _rec_name = 'event_id'
 
@@ -33,6 +34,10 @@ class EventBookingLine(models.Model):
                                  ondelete="cascade")
     event_id = fields.Many2one('event.event', string="Event",
                                help="Choose the Event")
+    available_event_ids = fields.Many2many(
+        'event.event', string="Available Events",
+        compute='_compute_available_event_ids',
+        help="Events taking place during the stay")
     ticket_id = fields.Many2one('product.product', string="Ticket",
                                 help="Choose the Ticket Type",
                                 domain=[('service_tracking', '=', 'event')]
@@ -75,21 +80,32 @@ class EventBookingLine(models.Model):
     state = fields.Selection(related='booking_id.state',
                              string="Order Status",
                              help="State of Room Booking", copy=False)
+    invoice_line_ids = fields.One2many(inverse_name='event_booking_line_id')
+
+    @api.depends('booking_id.checkin_date', 'booking_id.checkout_date')
+    def _compute_available_event_ids(self):
+        """Events taking place during the stay of the lines, with one query
+        per distinct stay"""
+        for (date_from, date_to), lines in self.grouped(
+                lambda line: (line.booking_id.checkin_date,
+                              line.booking_id.checkout_date)).items():
+            if not (date_from and date_to):
+                events = self.env['event.event'].search([])
+            else:
+                events = self.env['event.event'].search_available(
+                    date_from, date_to)
+            for line in lines:
+                line.available_event_ids = events | line.event_id
 
     @api.depends('uom_qty', 'price_unit', 'tax_ids','currency_id')
     def _compute_price_subtotal(self):
         """Compute the amounts of the room booking line."""
-        for line in self:
-            base_line = line._prepare_base_line_for_taxes_computation()
-            self.env['account.tax']._add_tax_details_in_base_line(base_line, self.env.company)
-            line.price_subtotal = base_line['tax_details']['raw_total_excluded_currency']
-            line.price_total = base_line['tax_details']['raw_total_included_currency']
-            line.price_tax = line.price_total - line.price_subtotal
-            if self.env.context.get('import_file',
-                                    False) and not self.env.user. \
-                    user_has_groups('account.group_account_manager'):
-                line.tax_id.invalidate_recordset(
-                    ['invoice_repartition_line_ids'])
+        self._compute_tax_amounts()
+
+    def _prepare_invoice_line(self, quantity):
+        """Invoice the event of the line"""
+        return dict(super()._prepare_invoice_line(quantity),
+                    name=self.event_id.name, product_type='event')
 
     def _prepare_base_line_for_taxes_computation(self):
         """ Convert the current record to a dictionary in order to use the generic taxes computation method
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import api, models
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+# Date range of an event as indexed by ``event_event_date_range_idx``, the
+# event booking lines of the folios offering the events of the stay.
+EVENT_RANGE = ("tsrange({alias}date_begin, GREATEST({alias}date_begin, "
+               "{alias}date_end), '[]')")
+
+
+class EventEvent(models.Model):
+    """Inherited event.event to refresh the hotel dashboard when the events
+    change and to look up the events of a stay"""
+    _inherit = 'event.event'
+
+    def init(self):
+        """Index the date range of the events for the lookups of
+        search_available."""
+        create_index(self.env.cr, 'event_event_date_range_idx', self._table,
+                     [EVENT_RANGE.format(alias='')], method='gist')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Refresh the event counts of the hotel dashboard"""
+        events = super().create(vals_list)
+        self.env['room.booking']._invalidate_dashboard(self.env.companies)
+        return events
+
+    def write(self, vals):
+        """Refresh the event counts of the hotel dashboard"""
+        result = super().write(vals)
+        self.env['room.booking']._invalidate_dashboard(self.env.companies)
+        return result
+
+    def unlink(self):
+        """Refresh the event counts of the hotel dashboard"""
+        self.env['room.booking']._invalidate_dashboard(self.env.companies)
+        return super().unlink()
+
+    @api.model
+    def search_available(self, date_from, date_to, domain=None):
+        """Return the active events taking place, at least partly, between
+        date_from and date_to, in one query going through the date range
+        index of the events.
+        ----------------------------------------
+        @param date_from: beginning of the window (datetime)
+        @param date_to: end of the window (datetime)
+        @param domain: additional domain on the events
+        @return: event.event recordset"""
+        self.flush_model(['date_begin', 'date_end', 'active'])
+        query = self._search(domain or [])
+        query.add_where(SQL(
+            "%(event_range)s && tsrange(%(date_from)s, GREATEST("
+            "%(date_from)s, %(date_to)s), '[]')",
+            event_range=SQL(EVENT_RANGE.format(alias='"%s".' % query.table)),
+            date_from=date_from, date_to=date_to))
+        return self.browse(query)
@@ -20,11 +20,19 @@
 #
 ###############################################################################
 from odoo import api, fields, models, tools
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+# Rental range of a fleet line as indexed by ``fleet_booking_line_rental_idx``,
+# to be used as is by the availability queries for the index to be picked.
+RENTAL_RANGE = ("tsrange({alias}date_from, GREATEST({alias}date_from, "
+                "{alias}date_to), '[]')")
 
 
 class FleetBookingLine(models.Model):
     """Model that handles the fleet booking"""
     _name = "fleet.booking.line"
+    _inherit = ["hotel.booking.line.mixin"]
     _description = "Hotel Fleet Line"
     _rec_name = 'fleet_id'
 
@@ -80,21 +88,60 @@ class FleetBookingLine(models.Model):
                              string="Order Status",
                              help=" Status of the Order",
                              copy=False)
+    invoice_line_ids = fields.One2many(inverse_name='fleet_booking_line_id')
+    date_from = fields.Datetime(string="From",
+                                compute='_compute_rental_dates', store=True,
+                                readonly=False, precompute=True,
+                                help="Start of the rental, the check-in of "
+                                     "the booking by default")
+    date_to = fields.Datetime(string="To",
+                              compute='_compute_rental_dates', store=True,
+                              readonly=False, precompute=True,
+                              help="End of the rental, the check-out of the "
+                                   "booking by default")
+    available_fleet_ids = fields.Many2many(
+        'fleet.vehicle.model', string="Available Vehicles",
+        compute='_compute_available_fleet_ids',
+        help="Vehicles free for the whole rental")
+
+    def init(self):
+        """Index the rental range of the lines for the vehicle availability
+        lookups of fleet.vehicle.model.search_available."""
+        create_index(self.env.cr, 'fleet_booking_line_rental_idx',
+                     self._table, [RENTAL_RANGE.format(alias='')],
+                     method='gist')
+
+    @api.depends('booking_id.checkin_date', 'booking_id.checkout_date')
+    def _compute_rental_dates(self):
+        """The vehicles are rented for the stay of the booking"""
+        for line in self:
+            line.date_from = line.booking_id.checkin_date
+            line.date_to = line.booking_id.checkout_date
+
+    @api.depends('date_from', 'date_to')
+    def _compute_available_fleet_ids(self):
+        """Vehicles free over the rental of the lines, with one query per
+        distinct rental"""
+        for (date_from, date_to), lines in self.grouped(
+                lambda line: (line.date_from, line.date_to)).items():
+            if not (date_from and date_to):
+                vehicles = self.env['fleet.vehicle.model'].search([])
+            else:
+                vehicles = self.env['fleet.vehicle.model'].search_available(
+                    date_from, date_to,
+                    exclude_line_ids=lines._origin.ids)
+            for line in lines:
+                line.available_fleet_ids = vehicles | line.fleet_id
 
     @api.depends('uom_qty', 'price_unit', 'tax_ids')
     def _compute_price_subtotal(self):
         """Compute the amounts of the room booking line."""
-        for line in self:
-            base_line = line._prepare_base_line_for_taxes_computation()
-            self.env['account.tax']._add_tax_details_in_base_line(base_line, self.env.company)
-            line.price_subtotal = base_line['tax_details']['raw_total_excluded_currency']
-            line.price_total = base_line['tax_details']['raw_total_included_currency']
-            line.price_tax = line.price_total - line.price_subtotal
-            if self.env.context.get('import_file',
-                                    False) and not self.env.user. \
-                    user_has_groups('account.group_account_manager'):
-                line.tax_id.invalidate_recordset(
-                    ['invoice_repartition_line_ids'])
+        self._compute_tax_amounts()
+
+    def _prepare_invoice_line(self, quantity):
+        """Invoice the vehicle of the line"""
+        return dict(super()._prepare_invoice_line(quantity),
+                    name=self.fleet_id.name, product_type='fleet')
 
     def _prepare_base_line_for_taxes_computation(self):
         """ Convert the current record to a dictionary in order to use the generic taxes computation method
@@ -114,6 +161,7 @@ class FleetBookingLine(models.Model):
         )
 
     def search_available_vehicle(self):
-        """Returns list of booked vehicles"""
-        return (self.env['fleet.vehicle.model'].search(
-            [('id', 'in', self.search([]).mapped('fleet_id').ids)]).ids)
+        """Returns the ids of the vehicles booked at the moment"""
+        now = fields.Datetime.now()
+        return self.env['fleet.vehicle.model']._get_booked_vehicle_ids(
+            now, now)
@@ -19,7 +19,9 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 ###############################################################################
-from odoo import fields, models, tools
+from odoo import api, fields, models, tools
+from odoo.tools import SQL
+from .fleet_booking_line import RENTAL_RANGE
 
 
 class FleetVehicleModel(models.Model):
@@ -37,3 +39,60 @@ class FleetVehicleModel(models.Model):
                              string='Reference Uom',
                              help="UOM of the product",
                              default=_set_default_uom_id, required=True)
+
+    @api.model
+    def search_available(self, date_from, date_to, domain=None,
+                         exclude_line_ids=None):
+        """Return the vehicles matching the domain which are not rented by
+        a reserved or checked-in booking between date_from and date_to, in
+        one query going through the rental range index of the fleet lines.
+        ----------------------------------------
+        @param date_from: start of the rental (datetime)
+        @param date_to: end of the rental (datetime)
+        @param domain: additional domain on the vehicles
+        @param exclude_line_ids: fleet lines to ignore, e.g. the ones being
+                                 edited
+        @return: fleet.vehicle.model recordset"""
+        self._flush_rentals()
+        query = self._search(domain or [])
+        query.add_where(SQL("NOT EXISTS (%s)", self._rentals_query(
+            date_from, date_to, exclude_line_ids,
+            SQL("line.fleet_id = %s", SQL.identifier(query.table, 'id')))))
+        return self.browse(query)
+
+    @api.model
+    def _get_booked_vehicle_ids(self, date_from, date_to):
+        """Return the ids of the vehicles rented between date_from and
+        date_to"""
+        self._flush_rentals()
+        self.env.cr.execute(self._rentals_query(
+            date_from, date_to, select=SQL("DISTINCT line.fleet_id")))
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    def _flush_rentals(self):
+        """Flush the fields read by _rentals_query"""
+        self.env['fleet.booking.line'].flush_model(
+            ['fleet_id', 'date_from', 'date_to', 'booking_id'])
+        self.env['room.booking'].flush_model(['state'])
+
+    @api.model
+    def _rentals_query(self, date_from, date_to, exclude_line_ids=None,
+                       condition=None, select=None):
+        """Query of the fleet lines of the reserved and checked-in bookings
+        overlapping the given window"""
+        return SQL("""
+            SELECT %(select)s
+              FROM fleet_booking_line line
+              JOIN room_booking booking ON booking.id = line.booking_id
+             WHERE booking.state IN ('reserved', 'check_in')
+               AND line.fleet_id IS NOT NULL
+               AND %(rental)s && tsrange(%(date_from)s,
+                                         GREATEST(%(date_from)s,
+                                                  %(date_to)s), '[]')
+               AND line.id != ALL(%(exclude)s)
+               AND %(condition)s
+        """, select=select or SQL("1"),
+            rental=SQL(RENTAL_RANGE.format(alias='line.')),
+            date_from=date_from, date_to=date_to,
+            exclude=list(exclude_line_ids or []),
+            condition=condition or SQL("TRUE"))
@@ -19,12 +19,24 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 ###############################################################################
+from datetime import timedelta
 from odoo import api, fields, models, tools
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+# Booking states in which the food orders are still to be served
+ACTIVE_STATES = ['draft', 'reserved', 'check_in']
+
+# Write dates are the start of the writing transaction, which may commit
+# after later changes were read: the kitchen queue reads the changes of this
+# last period again, longer than the transactions of the workers.
+KITCHEN_QUEUE_OVERLAP = timedelta(minutes=5)
 
 
 class FoodBookingLine(models.Model):
     """Model that handles the food booking"""
     _name = "food.booking.line"
+    _inherit = ["hotel.booking.line.mixin"]
     _description = "Hotel Food Line"
     _rec_name = 'food_id'
 
@@ -35,7 +47,7 @@ class FoodBookingLine(models.Model):
 
     booking_id = fields.Many2one("room.booking", string="Booking",
                                  help="Shows the room Booking",
-                                 ondelete="cascade")
+                                 ondelete="cascade", index=True)
     food_id = fields.Many2one('lunch.product', string="Product",
                               help="Indicates the Food Product")
     description = fields.Char(string='Description',
@@ -78,21 +90,17 @@ class FoodBookingLine(models.Model):
                              string="Order Status",
                              help=" Status of the Order",
                              copy=False)
+    invoice_line_ids = fields.One2many(inverse_name='food_booking_line_id')
 
     @api.depends('uom_qty', 'price_unit', 'tax_ids')
     def _compute_price_subtotal(self):
         """Compute the amounts of the room booking line."""
-        for line in self:
-            base_line = line._prepare_base_line_for_taxes_computation()
-            self.env['account.tax']._add_tax_details_in_base_line(base_line, self.env.company)
-            line.price_subtotal = base_line['tax_details']['raw_total_excluded_currency']
-            line.price_total = base_line['tax_details']['raw_total_included_currency']
-            line.price_tax = line.price_total - line.price_subtotal
-            if self.env.context.get('import_file',
-                                    False) and not self.env.user. \
-                    user_has_groups('account.group_account_manager'):
-                line.tax_id.invalidate_recordset(
-                    ['invoice_repartition_line_ids'])
+        self._compute_tax_amounts()
+
+    def _prepare_invoice_line(self, quantity):
+        """Invoice the food of the line"""
+        return dict(super()._prepare_invoice_line(quantity),
+                    name=self.food_id.name, product_type='food')
 
     def _prepare_base_line_for_taxes_computation(self):
         """ Convert the current record to a dictionary in order to use the generic taxes computation method
@@ -111,7 +119,97 @@ class FoodBookingLine(models.Model):
             },
         )
 
+    def init(self):
+        """Index the write dates read by the kitchen queue cursor"""
+        create_index(self.env.cr, 'food_booking_line_write_date_idx',
+                     self._table, ['write_date', 'id'])
+        create_index(self.env.cr, 'room_booking_write_date_idx',
+                     'room_booking', ['write_date'])
+
+    @api.model
+    def _get_active_domain(self):
+        """Domain of the food orders still to be served, going through the
+        index on the booking state"""
+        return ['|', ('booking_id', '=', False),
+                ('booking_id.state', 'in', ACTIVE_STATES)]
+
     def search_food_orders(self):
         """Returns list of food orders"""
-        return (self.search([]).filtered(lambda r: r.booking_id.state not in [
-            'check_out', 'cancel', 'done']).ids)
+        return self.search(self._get_active_domain()).ids
+
+    @api.model
+    def get_kitchen_queue(self, cursor=None, limit=100):
+        """Return the food orders changed since the cursor for the kitchen
+        screen. Without cursor the active orders are returned, otherwise the
+        orders whose line or booking changed after it, the orders which left
+        the active states being flagged so the screen drops them. Orders are
+        sorted by their last change, a page ending where the next one starts.
+        Once the last page is read, the cursor goes back to the start of the
+        overlap period so that the changes committed late are not missed:
+        the screens replace the orders they already have by id. Only the
+        orders of the allowed companies are returned. Deleted orders are not
+        reported: orders are removed from the screens by cancelling or
+        checking out their booking.
+        ----------------------------------------
+        @param cursor: cursor returned by the previous call, as a string
+        @param limit: maximum number of orders returned
+        @return: dict with the orders, the cursor of the next call and
+                 whether more orders are waiting"""
+        self.check_access('read')
+        self.flush_model(['booking_id', 'food_id', 'uom_qty'])
+        self.env['room.booking'].flush_model(['state', 'company_id'])
+        # Record rules and the allowed companies of the user
+        allowed = self._search([
+            '|', ('booking_id', '=', False),
+            ('booking_id.company_id', 'in', self.env.companies.ids)])
+        # GREATEST ignores the NULL write date of the missing bookings
+        stamp = SQL("GREATEST(line.write_date, booking.write_date)")
+        if cursor:
+            since, last_id = cursor.split(',')
+            last_id = int(last_id)
+            # Lines changed and lines of the bookings changed, each branch
+            # going through its write_date index.
+            changed = SQL("""
+                (SELECT line.id FROM food_booking_line line
+                  WHERE line.write_date >= %(since)s
+                 UNION
+                 SELECT line.id FROM room_booking booking
+                   JOIN food_booking_line line
+                     ON line.booking_id = booking.id
+                  WHERE booking.write_date >= %(since)s)
+            """, since=since)
+            where = SQL("line.id IN %s AND (%s, line.id) > (%s, %s)",
+                        changed, stamp, since, last_id)
+        else:
+            where = SQL("booking.id IS NULL OR booking.state IN %s",
+                        tuple(ACTIVE_STATES))
+        self.env.cr.execute(SQL("""
+            SELECT line.id, %(stamp)s
+              FROM food_booking_line line
+              LEFT JOIN room_booking booking ON booking.id = line.booking_id
+             WHERE (%(where)s) AND line.id IN %(allowed)s
+             ORDER BY 2, 1
+             LIMIT %(limit)s
+        """, stamp=stamp, where=where, allowed=allowed.subselect(),
+            limit=limit + 1))
+        rows = self.env.cr.fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        lines = self.browse([line_id for line_id, _stamp in rows])
+        orders = [{
+            'id': line.id,
+            'food': line.food_id.display_name,
+            'quantity': line.uom_qty,
+            'booking': line.booking_id.name,
+            'rooms': line.booking_id.room_line_ids.room_id.mapped('name'),
+            'active': not line.booking_id or
+                      line.booking_id.state in ACTIVE_STATES,
+            'changed': fields.Datetime.to_string(changed_on),
+        } for line, (_line_id, changed_on) in zip(lines, rows)]
+        next_key = rows and tuple(reversed(rows[-1]))
+        if not has_more:
+            horizon = (self.env.cr.now() - KITCHEN_QUEUE_OVERLAP, 0)
+            next_key = min(next_key or horizon, horizon)
+        if next_key:
+            cursor = '%s,%s' % (next_key[0].isoformat(sep=' '), next_key[1])
+        return {'orders': orders, 'cursor': cursor, 'has_more': has_more}
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import json
+import logging
+from datetime import timedelta
+from urllib.parse import urlparse
+import requests
+from odoo import api, fields, models
+from odoo.tools import SQL
+from .hotel_room_block import BLOCK_RANGE
+from .room_booking_line import STAY_RANGE
+
+_logger = logging.getLogger(__name__)
+
+# Booking states holding the inventory of the hotel.
+ACTIVE_STATES = ('reserved', 'check_in')
+
+
+class HotelAriChange(models.Model):
+    """Journal of the availability and rate changes by room type and range
+    of nights, written by the booking lines, bookings, rooms and rate plans.
+    The journal id is the cursor of the ARI (availability, rates and
+    inventory) feed: distribution channels only receive the room type and
+    night cells changed since their cursor."""
+    _name = 'hotel.ari.change'
+    _description = 'Availability and Rate Change'
+    _order = 'id'
+    _log_access = False
+
+    kind = fields.Selection([('availability', 'Availability'),
+                             ('rate', 'Rate')], string="Kind",
+                            required=True, readonly=True,
+                            help="What changed on the nights")
+    room_type = fields.Selection([('single', 'Single'),
+                                  ('double', 'Double'),
+                                  ('dormitory', 'Dormitory')],
+                                 string="Room Type", required=True,
+                                 readonly=True,
+                                 help="Room type whose nights changed")
+    date_from = fields.Date(string="From", required=True, readonly=True,
+                            help="First night changed")
+    date_to = fields.Date(string="To", readonly=True,
+                          help="Last night changed, all the following "
+                               "nights when empty")
+    create_date = fields.Datetime(string="Logged On", readonly=True,
+                                  help="Date the change was logged")
+
+    @api.model
+    def _log_changes(self, changes):
+        """Append changes to the journal when the transaction is about to be
+        committed, with one insert
+        ----------------------------------------
+        @param changes: list of (kind, room_type, date_from, date_to) tuples,
+                        date_to being inclusive or None for open ranges"""
+        changes = [change for change in changes if change[1]]
+        if not changes:
+            return
+        pending = self.env.cr.precommit.data.setdefault(
+            'hotel.ari.change', set())
+        if not pending:
+            self.env.cr.precommit.add(self._insert_changes)
+        pending.update(changes)
+
+    @api.model
+    def _insert_changes(self):
+        """Insert the changes logged by the transaction. The journal is
+        locked until the commit so that the ids are committed in order and
+        an export never skips a lower id committed after it was read."""
+        changes = self.env.cr.precommit.data.pop('hotel.ari.change', set())
+        if not changes:
+            return
+        kinds, room_types, dates_from, dates_to = zip(*changes)
+        self.env.cr.execute(SQL(
+            "LOCK TABLE hotel_ari_change IN EXCLUSIVE MODE"))
+        self.env.cr.execute(SQL("""
+            INSERT INTO hotel_ari_change (kind, room_type, date_from,
+                                          date_to, create_date)
+                 SELECT *, NOW() AT TIME ZONE 'UTC'
+                   FROM unnest(%s::varchar[], %s::varchar[], %s::date[],
+                               %s::date[])
+        """, list(kinds), list(room_types), list(dates_from), list(dates_to)))
+
+    @api.model
+    def _get_horizon(self):
+        """Number of days from today covered by the feed"""
+        return int(self.env['ir.config_parameter'].sudo().get_param(
+            'hotel_management_odoo.ari_horizon', 365))
+
+    @api.model
+    def export_changes(self, cursor=0, limit=1000):
+        """Return the current availability and rate of the room type and
+        night cells changed after the cursor, reading at most limit journal
+        entries. Several changes of a cell are sent once.
+        ----------------------------------------
+        @param cursor: journal id returned by the previous export
+        @param limit: maximum number of journal entries to read
+        @return: tuple of the new cursor and of the list of cells, as dicts
+                 with the room type, date, number of available rooms and
+                 nightly rate"""
+        self.env.cr.execute(SQL("""
+            SELECT id, room_type, date_from, date_to
+              FROM hotel_ari_change
+             WHERE id > %s
+          ORDER BY id
+             LIMIT %s
+        """, cursor, limit))
+        rows = self.env.cr.fetchall()
+        if not rows:
+            return cursor, []
+        today = fields.Date.context_today(self)
+        last_day = today + timedelta(days=self._get_horizon())
+        cells = set()
+        for _id, room_type, date_from, date_to in rows:
+            day = max(date_from, today)
+            date_to = min(date_to or last_day, last_day)
+            while day <= date_to:
+                cells.add((room_type, day))
+                day += timedelta(days=1)
+        return rows[-1][0], self._get_cells(sorted(cells))
+
+    @api.model
+    def _get_cells(self, cells):
+        """Compute the availability and rate of (room type, night) cells,
+        the availability with one query and the rates with one rate
+        calendar lookup"""
+        if not cells:
+            return []
+        availability = self._get_availability(cells)
+        # Rates are quoted for the cheapest room of each type.
+        cheapest = self.env['hotel.room']._get_cheapest_rooms(
+            cell[0] for cell in cells)
+        priced = [cell for cell in cells if cell[0] in cheapest]
+        prices = self.env['hotel.rate.calendar']._get_stay_prices(
+            [(cheapest[room_type], night, 1, self.env.company)
+             for room_type, night in priced])
+        rates = {cell: price[0] for cell, price in zip(priced, prices)}
+        return [{
+            'room_type': room_type,
+            'date': fields.Date.to_string(night),
+            'available': availability.get((room_type, night), 0),
+            'rate': rates.get((room_type, night)),
+        } for room_type, night in cells]
+
+    @api.model
+    def _get_availability(self, cells):
+        """Return the number of rooms left for the (room type, night) cells,
+        counting the stays booked by room type or by room and the out of
+        order rooms, with one query"""
+        if not cells:
+            return {}
+        self.env['room.booking.line'].flush_model(
+            ['room_id', 'room_type', 'checkin_date', 'checkout_date',
+             'booking_id'])
+        self.env['room.booking'].flush_model(['state'])
+        self.env['hotel.room'].flush_model(['room_type', 'list_price'])
+        self.env['hotel.room.block'].flush_model(
+            ['room_id', 'date_from', 'date_to'])
+        room_types, nights = zip(*cells)
+        self.env.cr.execute(SQL("""
+            WITH cell AS (
+                SELECT * FROM unnest(%(room_types)s::varchar[],
+                                     %(nights)s::date[]) AS cell(room_type, night)
+            ), sold AS (
+                SELECT line.room_type, night::date AS night, count(*) AS sold
+                  FROM room_booking_line line
+                  JOIN room_booking booking ON booking.id = line.booking_id
+            CROSS JOIN LATERAL generate_series(
+                           line.checkin_date::date,
+                           GREATEST(line.checkout_date::date - 1,
+                                    line.checkin_date::date),
+                           interval '1 day') AS night
+                 WHERE booking.state = ANY(%(states)s)
+                   AND line.room_type = ANY(%(room_types)s)
+                   AND %(stay_range)s && tsrange(%(date_from)s,
+                                                 %(date_to)s, '[]')
+              GROUP BY line.room_type, night::date
+            ), blocked AS (
+                -- Out of order rooms not already counted as sold
+                SELECT room.room_type, night::date AS night,
+                       count(DISTINCT room.id) AS blocked
+                  FROM hotel_room_block block
+                  JOIN hotel_room room ON room.id = block.room_id
+            CROSS JOIN LATERAL generate_series(
+                           GREATEST(block.date_from::date, %(date_from)s),
+                           LEAST(COALESCE(block.date_to::date,
+                                          %(date_to)s), %(date_to)s)
+                           - 1,
+                           interval '1 day') AS night
+                 WHERE room.room_type = ANY(%(room_types)s)
+                   AND %(block_range)s && tsrange(%(date_from)s,
+                                                  %(date_to)s, '[]')
+                   AND NOT EXISTS (
+                       SELECT 1 FROM room_booking_line line
+                         JOIN room_booking booking
+                           ON booking.id = line.booking_id
+                        WHERE line.room_id = room.id
+                          AND booking.state = ANY(%(states)s)
+                          AND night::date >= line.checkin_date::date
+                          AND night::date < GREATEST(
+                              line.checkout_date::date,
+                              line.checkin_date::date + 1))
+              GROUP BY room.room_type, night::date
+            ), room AS (
+                SELECT room_type, count(*) AS total
+                  FROM hotel_room
+              GROUP BY room_type
+            )
+            SELECT cell.room_type, cell.night,
+                   COALESCE(room.total, 0) - COALESCE(sold.sold, 0)
+                   - COALESCE(blocked.blocked, 0)
+              FROM cell
+         LEFT JOIN room ON room.room_type = cell.room_type
+         LEFT JOIN sold ON sold.room_type = cell.room_type
+                       AND sold.night = cell.night
+         LEFT JOIN blocked ON blocked.room_type = cell.room_type
+                          AND blocked.night = cell.night
+        """, room_types=list(room_types), nights=list(nights),
+            states=list(ACTIVE_STATES),
+            stay_range=SQL(STAY_RANGE.format(alias='line.')),
+            block_range=SQL(BLOCK_RANGE.format(alias='block.')),
+            date_from=min(nights), date_to=max(nights) + timedelta(days=1)))
+        return {(room_type, night): max(available, 0)
+                for room_type, night, available in self.env.cr.fetchall()}
+
+    @api.model
+    def _to_jsonl(self, cells):
+        """Serialize cells as compact JSON lines"""
+        return ''.join(json.dumps(cell, separators=(',', ':')) + '\n'
+                       for cell in cells)
+
+    @api.model
+    def _cron_push_changes(self, limit=1000):
+        """Push the changes since the last pushed cursor to the target of
+        the hotel_management_odoo.ari_target parameter, a file:// url the
+        JSON lines are appended to or an http(s) url they are posted to"""
+        params = self.env['ir.config_parameter'].sudo()
+        target = params.get_param('hotel_management_odoo.ari_target')
+        if not target:
+            return
+        cursor = int(params.get_param('hotel_management_odoo.ari_cursor', 0))
+        while True:
+            new_cursor, cells = self.export_changes(cursor, limit)
+            if new_cursor == cursor:
+                return
+            if cells:
+                self._push(target, self._to_jsonl(cells))
+            cursor = new_cursor
+            params.set_param('hotel_management_odoo.ari_cursor', cursor)
+            _logger.info("ARI feed: %s cells pushed up to change %s",
+                         len(cells), cursor)
+
+    @api.model
+    def _push(self, target, payload):
+        """Send a JSONL payload to the target url"""
+        url = urlparse(target)
+        if url.scheme == 'file':
+            with open(url.path, 'a', encoding='utf-8') as feed:
+                feed.write(payload)
+        else:
+            response = requests.post(
+                target, data=payload.encode(), timeout=30,
+                headers={'Content-Type': 'application/x-ndjson'})
+            response.raise_for_status()
+
+    @api.autovacuum
+    def _gc_changes(self):
+        """Drop the journal entries older than a month, keeping the ones not
+        pushed yet to the target of the feed"""
+        params = self.env['ir.config_parameter'].sudo()
+        pushed = SQL()
+        if params.get_param('hotel_management_odoo.ari_target'):
+            pushed = SQL("AND id <= %s", int(params.get_param(
+                'hotel_management_odoo.ari_cursor', 0)))
+        self.env.cr.execute(SQL("""
+            DELETE FROM hotel_ari_change
+             WHERE create_date < NOW() AT TIME ZONE 'UTC' - interval '30 days'
+                   %s
+        """, pushed))
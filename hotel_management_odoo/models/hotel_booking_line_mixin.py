@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import api, fields, models
+
+
+class HotelBookingLineMixin(models.AbstractModel):
+    """Amounts computation and invoicing shared by the folio line models.
+    The taxes of a whole recordset are computed together: lines with the
+    same taxes, price, quantity and currency are computed once and the
+    remaining base lines go through the tax engine in one call per company
+    and currency. The models set the inverse field of invoice_line_ids."""
+    _name = 'hotel.booking.line.mixin'
+    _description = 'Hotel Folio Line Mixin'
+
+    invoice_line_ids = fields.One2many('account.move.line',
+                                       string="Invoice Lines", copy=False,
+                                       readonly=True,
+                                       help="Invoice lines of this line")
+    qty_invoiced = fields.Float(string="Invoiced Quantity",
+                                compute='_compute_qty_invoiced', store=True,
+                                help="Quantity already invoiced")
+
+    @api.depends('invoice_line_ids.quantity', 'invoice_line_ids.parent_state')
+    def _compute_qty_invoiced(self):
+        """Compute the quantity invoiced from the linked invoice lines,
+        credit notes reducing it"""
+        for line in self:
+            line.qty_invoiced = sum(
+                -invoice_line.quantity
+                if invoice_line.move_id.move_type == 'out_refund'
+                else invoice_line.quantity
+                for invoice_line in line.invoice_line_ids
+                if invoice_line.parent_state != 'cancel')
+
+    def _prepare_invoice_line(self, quantity):
+        """Returns the values of the invoice line invoicing the given
+        quantity of the line, the models adding the name and product type"""
+        self.ensure_one()
+        return {
+            'quantity': quantity,
+            'price_unit': self.price_unit,
+            self._fields['invoice_line_ids'].inverse_name: self.id,
+        }
+
+    def _get_tax_computation_key(self, base_line):
+        """Returns the values a line's tax amounts depend on"""
+        return (
+            tuple(base_line['tax_ids'].ids),
+            base_line['price_unit'],
+            base_line['quantity'],
+            base_line['discount'],
+            base_line['currency_id'].id,
+            base_line['rate'],
+            base_line['product_id'].id,
+            base_line['is_refund'],
+            base_line['special_mode'],
+        )
+
+    def _compute_tax_amounts(self):
+        """Set price_subtotal, price_tax and price_total of the lines"""
+        account_tax = self.env['account.tax']
+        base_lines_by_group = {}
+        keys_by_line = {}
+        for line in self:
+            base_line = line._prepare_base_line_for_taxes_computation()
+            company = line.booking_id.company_id or self.env.company
+            # Taxes are computed with the settings of the company
+            key = (company.id,) + line._get_tax_computation_key(base_line)
+            keys_by_line[line] = key
+            group = base_lines_by_group.setdefault(
+                (company, base_line['currency_id']), {})
+            group.setdefault(key, base_line)
+        tax_details = {}
+        for (company, _currency), base_lines in base_lines_by_group.items():
+            account_tax._add_tax_details_in_base_lines(
+                list(base_lines.values()), company)
+            for key, base_line in base_lines.items():
+                tax_details[key] = base_line['tax_details']
+        for line, key in keys_by_line.items():
+            line.price_subtotal = tax_details[key][
+                'raw_total_excluded_currency']
+            line.price_total = tax_details[key]['raw_total_included_currency']
+            line.price_tax = line.price_total - line.price_subtotal
+        if self.env.context.get('import_file', False) and not \
+                self.env.user.has_group('account.group_account_manager'):
+            self.tax_ids.invalidate_recordset(
+                ['invoice_repartition_line_ids'])
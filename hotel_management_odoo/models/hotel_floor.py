@@ -32,3 +32,7 @@ class HotelFloor(models.Model):
     user_id = fields.Many2one('res.users', string='Manager',
                               help="Manager of the Floor",
                               required=True)
+    level = fields.Integer(string="Level",
+                           help="Level of the floor in the building, used to "
+                                "give the cleaning of close rooms to the same "
+                                "person")
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import logging
+import threading
+import time
+from datetime import datetime, time as dt_time, timedelta
+from odoo import api, fields, models, _
+
+_logger = logging.getLogger(__name__)
+
+# Stages of the night audit, in the order they are processed.
+AUDIT_STAGES = [('charges', 'Room Charges'),
+                ('departures', 'Departures'),
+                ('roll', 'Business Date'),
+                ('done', 'Done')]
+
+
+class HotelNightAudit(models.Model):
+    """Night audit of a business date: posts the charges of the in-house
+    bookings, invoices and checks out the departures and rolls the business
+    date. Bookings are processed in chunks, the progress being committed
+    after every chunk so that a failed audit resumes where it stopped."""
+    _name = 'hotel.night.audit'
+    _description = 'Hotel Night Audit'
+    _order = 'business_date desc, id desc'
+    _rec_name = 'business_date'
+
+    business_date = fields.Date(string="Business Date", required=True,
+                                readonly=True,
+                                help="Date of the nights being audited")
+    company_id = fields.Many2one('res.company', string="Company",
+                                 required=True, readonly=True,
+                                 default=lambda self: self.env.company,
+                                 help="Company of the audited bookings")
+    chunk_size = fields.Integer(string="Chunk Size", default=200,
+                                required=True,
+                                help="Number of bookings processed and "
+                                     "committed at once")
+    state = fields.Selection([('draft', 'Draft'),
+                              ('running', 'Running'),
+                              ('failed', 'Failed'),
+                              ('done', 'Done')],
+                             string="State", default='draft', readonly=True,
+                             help="State of the audit")
+    stage = fields.Selection(AUDIT_STAGES, string="Stage", default='charges',
+                             readonly=True, help="Stage being processed")
+    last_booking_id = fields.Integer(string="Last Booking", readonly=True,
+                                     help="Last booking processed by the "
+                                          "current stage, the audit resumes "
+                                          "after it")
+    charged_count = fields.Integer(string="Charged Bookings", readonly=True,
+                                   help="In-house bookings charged")
+    departure_count = fields.Integer(string="Departures", readonly=True,
+                                     help="Bookings checked out")
+    charges_duration = fields.Float(string="Charges Time (s)", readonly=True,
+                                    help="Time spent posting the charges")
+    departures_duration = fields.Float(string="Departures Time (s)",
+                                       readonly=True,
+                                       help="Time spent on departures")
+    throughput = fields.Float(string="Bookings per Second",
+                              compute='_compute_throughput',
+                              help="Bookings processed per second")
+    error = fields.Text(string="Error", readonly=True,
+                        help="Error which stopped the last run")
+
+    @api.depends('charged_count', 'departure_count', 'charges_duration',
+                 'departures_duration')
+    def _compute_throughput(self):
+        """Compute the number of bookings processed per second"""
+        for audit in self:
+            duration = audit.charges_duration + audit.departures_duration
+            audit.throughput = (audit.charged_count + audit.departure_count
+                                ) / duration if duration else 0.0
+
+    @api.model
+    def _cron_night_audit(self):
+        """Run the night audit of every company, resuming the unfinished
+        ones first"""
+        today = fields.Date.context_today(self)
+        for company in self.env['res.company'].search([]):
+            audit = self.search([('company_id', '=', company.id),
+                                 ('state', '!=', 'done')], limit=1)
+            if not audit:
+                # Only the nights that are over are audited, the first one
+                # being last night.
+                business_date = company.hotel_business_date or \
+                    today - timedelta(days=1)
+                if business_date >= today:
+                    continue
+                audit = self.create({'company_id': company.id,
+                                     'business_date': business_date})
+            audit.with_company(company)._run()
+
+    def action_run(self):
+        """Button action running or resuming the audit"""
+        for audit in self:
+            audit._run()
+
+    def _run(self):
+        """Process the remaining stages of the audit"""
+        self.ensure_one()
+        self.write({'state': 'running', 'error': False})
+        try:
+            while self.stage != 'done':
+                getattr(self, '_run_stage_%s' % self.stage)()
+        except Exception as error:
+            self.env.cr.rollback()
+            _logger.exception("Night audit %s failed", self.business_date)
+            self.write({'state': 'failed', 'error': str(error)})
+            self._commit()
+            return
+        self.state = 'done'
+        _logger.info(
+            "Night audit %s done: %s bookings charged in %.2fs, "
+            "%s departures in %.2fs", self.business_date, self.charged_count,
+            self.charges_duration, self.departure_count,
+            self.departures_duration)
+        self._commit()
+
+    def _get_night_end(self):
+        """Returns the end of the business date, as a naive UTC datetime"""
+        return datetime.combine(self.business_date + timedelta(days=1),
+                                dt_time.min)
+
+    def _run_stage_charges(self):
+        """Charge the in-house bookings up to the business date"""
+        self._process_chunks([('state', '=', 'check_in')],
+                             self._charge_bookings, 'departures')
+
+    def _run_stage_departures(self):
+        """Invoice and check out the bookings leaving on the business date"""
+        self._process_chunks([('state', '=', 'check_in'),
+                              ('checkout_date', '<', self._get_night_end())],
+                             self._check_out_bookings, 'roll')
+
+    def _run_stage_roll(self):
+        """Move the business date of the company to the next day, never
+        back when an older date is audited again"""
+        next_date = self.business_date + timedelta(days=1)
+        self.company_id.hotel_business_date = max(
+            self.company_id.hotel_business_date or next_date, next_date)
+        self.stage = 'done'
+        self._commit()
+
+    def _process_chunks(self, domain, process, next_stage):
+        """Call process on the bookings matching the domain, chunk by chunk,
+        and go to the next stage once they are all processed"""
+        domain = domain + [('company_id', '=', self.company_id.id)]
+        while True:
+            bookings = self.env['room.booking'].search(
+                domain + [('id', '>', self.last_booking_id)], order='id',
+                limit=self.chunk_size)
+            if not bookings:
+                self.write({'stage': next_stage, 'last_booking_id': 0})
+                self._commit()
+                return
+            started = time.perf_counter()
+            process(bookings)
+            self.write({'last_booking_id': bookings[-1].id})
+            self._commit()
+            self.env.invalidate_all()
+            _logger.info("Night audit %s: %s bookings processed in %.2fs",
+                         self.business_date, len(bookings),
+                         time.perf_counter() - started)
+
+    def _charge_bookings(self, bookings):
+        """Post the room charges of the bookings up to the business date"""
+        started = time.perf_counter()
+        bookings._post_room_charges(self.business_date)
+        self.write({
+            'charged_count': self.charged_count + len(bookings),
+            'charges_duration': self.charges_duration +
+            time.perf_counter() - started,
+        })
+
+    def _check_out_bookings(self, bookings):
+        """Post the invoices of the departing bookings and check them out"""
+        started = time.perf_counter()
+        invoices = bookings._post_room_charges(self.business_date)
+        invoices.filtered(lambda move: move.invoice_line_ids).action_post()
+        # The guests left at their planned check-out, not when the audit
+        # runs, which would overlap the next stays of the rooms.
+        bookings._check_out()
+        self.write({
+            'departure_count': self.departure_count + len(bookings),
+            'departures_duration': self.departures_duration +
+            time.perf_counter() - started,
+        })
+
+    def _commit(self):
+        """Commit the progress of the audit, unless running tests"""
+        if not getattr(threading.current_thread(), 'testing', False):
+            self.env.cr.commit()
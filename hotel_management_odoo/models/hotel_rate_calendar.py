@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import api, fields, models
+from odoo.tools import SQL
+from .hotel_room_night import SOLD_STATES
+
+
+class HotelRateCalendar(models.Model):
+    """Nights of the rate plans, one row per plan, room type and night.
+    Rows are generated by hotel.rate.plan, the conditions depending on the
+    stay (length of stay, occupancy) are checked when pricing it."""
+    _name = 'hotel.rate.calendar'
+    _description = 'Rate Calendar'
+    _order = 'date, room_type, sequence'
+    _rec_name = 'date'
+
+    plan_id = fields.Many2one('hotel.rate.plan', string="Rate Plan",
+                              required=True, index=True, readonly=True,
+                              ondelete='cascade',
+                              help="Plan the night comes from")
+    company_id = fields.Many2one('res.company', string="Company",
+                                 readonly=True,
+                                 help="Company of the rate plan")
+    room_type = fields.Selection([('single', 'Single'),
+                                  ('double', 'Double'),
+                                  ('dormitory', 'Dormitory')],
+                                 string="Room Type", required=True,
+                                 readonly=True, help="Room type priced")
+    date = fields.Date(string="Night", required=True, readonly=True,
+                       help="Night priced")
+    sequence = fields.Integer(string="Priority", readonly=True,
+                              help="Priority of the rate plan")
+    min_stay = fields.Integer(string="Minimum Stay", readonly=True,
+                              help="Minimum number of nights of the stay")
+    max_stay = fields.Integer(string="Maximum Stay", readonly=True,
+                              help="Maximum number of nights of the stay, "
+                                   "no maximum when 0")
+    occupancy_min = fields.Float(string="Minimum Occupancy (%)",
+                                 readonly=True,
+                                 help="Minimum occupancy of the night")
+    price_type = fields.Selection([('fixed', 'Fixed Price'),
+                                   ('percent', 'Rent Adjustment')],
+                                  string="Price Type", readonly=True,
+                                  help="Fixed price or rent adjustment")
+    price = fields.Float(string="Price", digits='Product Price',
+                         readonly=True, help="Price of the night")
+    percent = fields.Float(string="Adjustment (%)", readonly=True,
+                           help="Percentage added to the rent of the room")
+
+    def init(self):
+        """Index the lookups of the nights of a room type"""
+        self.env.cr.execute(SQL("""
+            CREATE INDEX IF NOT EXISTS hotel_rate_calendar_lookup_idx
+                ON hotel_rate_calendar (company_id, room_type, date, sequence)
+        """))
+
+    @api.model
+    def _get_stay_prices(self, stays):
+        """Return the price of every night of the given stays, as a list of
+        lists of prices in the order of the stays. The nights of all the
+        stays of a company are priced with one query, nights without a
+        matching rate plan cost the rent of the room.
+        ----------------------------------------
+        @param stays: list of (room, first night, number of nights, company)
+        @return: list of lists of nightly prices"""
+        prices = [[stay[0].list_price] * stay[2] for stay in stays]
+        stays_by_company = {}
+        for index, (room, date_from, nights, company) in enumerate(stays):
+            if nights > 0:
+                stays_by_company.setdefault(company, []).append(
+                    (index, room, date_from, nights))
+        if not stays_by_company:
+            return prices
+        self.flush_model()
+        self.env['hotel.room.night'].flush_model(['night', 'state',
+                                                  'company_id'])
+        for company, company_stays in stays_by_company.items():
+            room_count = self.env['hotel.room'].search_count(
+                [('company_id', '=', company.id)])
+            indexes, rooms, starts, nights = zip(*company_stays)
+            self.env.cr.execute(SQL("""
+                WITH stay AS (
+                    SELECT stay.idx, stay.room_type, stay.nights,
+                           stay.date_from, night::date AS night
+                      FROM unnest(%(indexes)s::int[], %(room_types)s::varchar[],
+                                  %(starts)s::date[], %(nights)s::int[])
+                           AS stay(idx, room_type, date_from, nights)
+                CROSS JOIN LATERAL generate_series(
+                               stay.date_from,
+                               stay.date_from + stay.nights - 1,
+                               interval '1 day') AS night
+                ), occupancy AS (
+                    SELECT night, count(*) AS sold
+                      FROM hotel_room_night
+                     WHERE company_id = %(company_id)s
+                       AND state = ANY(%(states)s)
+                       AND night IN (SELECT night FROM stay)
+                  GROUP BY night
+                )
+                SELECT DISTINCT ON (stay.idx, stay.night)
+                       stay.idx, stay.night - stay.date_from, cal.price_type,
+                       cal.price, cal.percent
+                  FROM stay
+                  JOIN hotel_rate_calendar cal
+                    ON cal.company_id = %(company_id)s
+                   AND cal.room_type = stay.room_type
+                   AND cal.date = stay.night
+             LEFT JOIN occupancy ON occupancy.night = stay.night
+                 WHERE cal.min_stay <= stay.nights
+                   AND (cal.max_stay = 0 OR cal.max_stay >= stay.nights)
+                   AND COALESCE(occupancy.sold, 0) * 100.0
+                       >= cal.occupancy_min * %(room_count)s
+              ORDER BY stay.idx, stay.night, cal.sequence, cal.plan_id
+            """, indexes=list(indexes),
+                room_types=[room.room_type for room in rooms],
+                starts=list(starts), nights=list(nights),
+                company_id=company.id, states=list(SOLD_STATES),
+                room_count=room_count))
+            for index, offset, price_type, price, percent in \
+                    self.env.cr.fetchall():
+                if price_type == 'fixed':
+                    prices[index][offset] = price
+                else:
+                    prices[index][offset] *= 1 + (percent or 0.0) / 100
+        return prices
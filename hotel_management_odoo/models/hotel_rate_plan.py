@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import api, fields, models, _
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+
+# Weekday fields of the rate plans, in ISO order (monday is 1).
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday',
+            'saturday', 'sunday']
+
+
+class HotelRatePlan(models.Model):
+    """Pricing rule of the rooms for a season. The nights a plan applies to
+    are expanded in the hotel.rate.calendar table whenever the plan
+    changes, so that pricing a stay does not evaluate the rules."""
+    _name = 'hotel.rate.plan'
+    _description = 'Rate Plan'
+    _order = 'sequence, id'
+
+    name = fields.Char(string="Name", required=True, translate=True,
+                       help="Name of the rate plan")
+    active = fields.Boolean(string="Active", default=True,
+                            help="Inactive plans are not applied")
+    sequence = fields.Integer(string="Priority", default=10,
+                              help="When several plans apply to a night, the"
+                                   " one with the lowest priority is used")
+    company_id = fields.Many2one('res.company', string="Company",
+                                 required=True,
+                                 default=lambda self: self.env.company,
+                                 help="Company the plan applies to")
+    room_type = fields.Selection([('single', 'Single'),
+                                  ('double', 'Double'),
+                                  ('dormitory', 'Dormitory')],
+                                 string="Room Type",
+                                 help="Room type the plan applies to, all "
+                                      "room types when empty")
+    date_from = fields.Date(string="Start Date", required=True,
+                            help="First night of the season")
+    date_to = fields.Date(string="End Date", required=True,
+                          help="Last night of the season")
+    monday = fields.Boolean(string="Monday", default=True,
+                            help="Apply the plan on monday nights")
+    tuesday = fields.Boolean(string="Tuesday", default=True,
+                             help="Apply the plan on tuesday nights")
+    wednesday = fields.Boolean(string="Wednesday", default=True,
+                               help="Apply the plan on wednesday nights")
+    thursday = fields.Boolean(string="Thursday", default=True,
+                              help="Apply the plan on thursday nights")
+    friday = fields.Boolean(string="Friday", default=True,
+                            help="Apply the plan on friday nights")
+    saturday = fields.Boolean(string="Saturday", default=True,
+                              help="Apply the plan on saturday nights")
+    sunday = fields.Boolean(string="Sunday", default=True,
+                            help="Apply the plan on sunday nights")
+    min_stay = fields.Integer(string="Minimum Stay", default=1,
+                              help="Minimum number of nights of the stay")
+    max_stay = fields.Integer(string="Maximum Stay", default=0,
+                              help="Maximum number of nights of the stay, "
+                                   "no maximum when 0")
+    occupancy_min = fields.Float(string="Minimum Occupancy (%)",
+                                 default=0.0,
+                                 help="The plan only applies to nights on "
+                                      "which at least this percentage of "
+                                      "the rooms is sold")
+    price_type = fields.Selection([('fixed', 'Fixed Price'),
+                                   ('percent', 'Rent Adjustment')],
+                                  string="Price Type", default='fixed',
+                                  required=True,
+                                  help="Use a fixed nightly price or adjust "
+                                       "the rent of the room")
+    price = fields.Float(string="Price", digits='Product Price',
+                         help="Price of a night")
+    percent = fields.Float(string="Adjustment (%)",
+                           help="Percentage added to the rent of the room, "
+                                "negative for a discount")
+
+    @api.constrains('date_from', 'date_to', 'min_stay', 'max_stay')
+    def _check_dates(self):
+        """Check the season and the length of stay of the plans"""
+        for plan in self:
+            if plan.date_from > plan.date_to:
+                raise ValidationError(
+                    _("The start date of the season must be before its end "
+                      "date."))
+            if plan.min_stay < 1 or (plan.max_stay and
+                                     plan.max_stay < plan.min_stay):
+                raise ValidationError(
+                    _("The maximum stay must be 0 or greater than the "
+                      "minimum stay, which must be at least one night."))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Expand the nights of the new plans in the rate calendar"""
+        plans = super().create(vals_list)
+        plans._refresh_calendar()
+        plans._log_ari_changes()
+        return plans
+
+    def write(self, vals):
+        """Refresh the nights of the modified plans"""
+        if not set(vals) - {'name'}:
+            return super().write(vals)
+        ari_changes = self._get_ari_changes()
+        result = super().write(vals)
+        self._refresh_calendar()
+        self._log_ari_changes(ari_changes)
+        return result
+
+    def unlink(self):
+        """Log the rate change of the nights of the removed plans"""
+        ari_changes = self._get_ari_changes()
+        result = super().unlink()
+        self.env['hotel.ari.change']._log_changes(ari_changes)
+        return result
+
+    def _get_ari_changes(self):
+        """Returns the rate changes of the nights of the plans for the ARI
+        journal"""
+        room_types = [room_type for room_type, _label
+                      in self._fields['room_type'].selection]
+        return [('rate', room_type, plan.date_from, plan.date_to)
+                for plan in self
+                for room_type in ([plan.room_type] if plan.room_type
+                                  else room_types)]
+
+    def _log_ari_changes(self, ari_changes=()):
+        """Log the rate changes of the plans and the given ones"""
+        self.env['hotel.ari.change']._log_changes(
+            list(ari_changes) + self._get_ari_changes())
+
+    def _refresh_calendar(self):
+        """Regenerate the rate calendar rows of the plans, one per room type
+        and night of the season matching the weekdays of the plan"""
+        if not self:
+            return
+        self.flush_recordset()
+        calendar = self.env['hotel.rate.calendar']
+        calendar.flush_model()
+        room_types = [room_type for room_type, _label
+                      in self._fields['room_type'].selection]
+        self.env.cr.execute(SQL("""
+            DELETE FROM hotel_rate_calendar WHERE plan_id = ANY(%(ids)s);
+            INSERT INTO hotel_rate_calendar (plan_id, company_id, room_type,
+                                             date, sequence, min_stay,
+                                             max_stay, occupancy_min,
+                                             price_type, price, percent,
+                                             create_uid, create_date,
+                                             write_uid, write_date)
+                 SELECT plan.id, plan.company_id, room_type, day::date,
+                        plan.sequence, plan.min_stay, plan.max_stay,
+                        plan.occupancy_min, plan.price_type, plan.price,
+                        plan.percent,
+                        %(uid)s, NOW() AT TIME ZONE 'UTC',
+                        %(uid)s, NOW() AT TIME ZONE 'UTC'
+                   FROM hotel_rate_plan plan
+             CROSS JOIN LATERAL unnest(
+                            CASE WHEN plan.room_type IS NULL
+                                 THEN %(room_types)s::varchar[]
+                                 ELSE ARRAY[plan.room_type] END) AS room_type
+             CROSS JOIN LATERAL generate_series(
+                            plan.date_from, plan.date_to,
+                            interval '1 day') AS day
+                  WHERE plan.id = ANY(%(ids)s)
+                    AND plan.active
+                    AND (ARRAY[%(weekdays)s])[extract(isodow FROM day)::int]
+        """, ids=self.ids, uid=self.env.uid, room_types=room_types,
+            weekdays=SQL(', ').join(SQL.identifier('plan', weekday)
+                                    for weekday in WEEKDAYS)))
+        calendar.invalidate_model()
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+import base64
+import hashlib
+import json
+import logging
+import tempfile
+import threading
+from datetime import timedelta
+from odoo import api, fields, models, _
+
+_logger = logging.getLogger(__name__)
+
+# Wizard model and report action of each report kind.
+REPORT_KINDS = {
+    'room_booking': ('room.booking.detail',
+                     'hotel_management_odoo.action_report_room_booking'),
+    'sale_order': ('sale.order.detail',
+                   'hotel_management_odoo.action_report_sale_order'),
+}
+
+
+class HotelReportJob(models.Model):
+    """Report rendered in the background by the report job cron. The result
+    is kept as an attachment keyed by the criteria of the report and the
+    version of the booking data, identical requests being served from the
+    attachment as long as no booking, room or customer changed."""
+    _name = 'hotel.report.job'
+    _description = 'Hotel Report Job'
+    _order = 'id desc'
+
+    name = fields.Char(string="Name", required=True,
+                       help="Name of the report")
+    report_kind = fields.Selection([('room_booking', 'Room Booking'),
+                                    ('sale_order', 'Sale Order')],
+                                   string="Report", required=True,
+                                   help="Report to generate")
+    output_format = fields.Selection([('pdf', 'PDF'), ('xlsx', 'XLSX')],
+                                     string="Format", required=True,
+                                     help="Format of the generated file")
+    criteria = fields.Text(string="Criteria", required=True,
+                           help="Filters of the report, in JSON")
+    cache_key = fields.Char(string="Cache Key", required=True, index=True,
+                            help="Hash of the report, format, criteria, "
+                                 "company and booking data version")
+    user_id = fields.Many2one('res.users', string="Requested By",
+                              required=True, index=True,
+                              default=lambda self: self.env.user,
+                              help="User the report is generated for")
+    company_id = fields.Many2one('res.company', string="Company",
+                                 required=True,
+                                 default=lambda self: self.env.company,
+                                 help="Company the report is generated for")
+    state = fields.Selection([('queued', 'Queued'),
+                              ('running', 'Running'),
+                              ('done', 'Done'),
+                              ('failed', 'Failed')],
+                             string="State", default='queued',
+                             required=True, readonly=True,
+                             help="Progress of the generation")
+    attachment_id = fields.Many2one('ir.attachment', string="File",
+                                    readonly=True, ondelete='set null',
+                                    help="Generated report")
+    date_done = fields.Datetime(string="Generated On", readonly=True,
+                                help="Date the report was generated")
+    error = fields.Text(string="Error", readonly=True,
+                        help="Error raised by the last generation")
+
+    @api.model
+    def _get_data_version(self):
+        """Return a value changing whenever a booking, a booking line or a
+        room or customer shown on the reports is created, modified or
+        deleted"""
+        version = []
+        for model in ('room.booking', 'room.booking.line', 'hotel.room',
+                      'res.partner'):
+            [(write_date, count, max_id)] = self.env[model].sudo()._read_group(
+                [], aggregates=['write_date:max', '__count', 'id:max'])
+            version.append([fields.Datetime.to_string(write_date), count,
+                            max_id])
+        return version
+
+    @api.model
+    def _get_cache_key(self, report_kind, output_format, criteria):
+        """Hash identifying a report of the current user for the current data
+        version"""
+        payload = json.dumps([report_kind, output_format, criteria,
+                              self.env.uid, self.env.company.id,
+                              self.env.lang,
+                              self._get_data_version()], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @api.model
+    def _enqueue(self, report_kind, output_format, criteria):
+        """Return the job generating the report, reusing a job of the same
+        key when one is generated or being generated, otherwise queueing a
+        new job for the report cron"""
+        cache_key = self._get_cache_key(report_kind, output_format, criteria)
+        job = self.search([('cache_key', '=', cache_key),
+                           ('state', 'in', ['queued', 'running', 'done']),
+                           '|', ('state', '!=', 'done'),
+                           ('attachment_id', '!=', False)], limit=1)
+        if job:
+            return job
+        job = self.create({
+            'name': '%s (%s)' % (dict(self._fields['report_kind'].selection
+                                      )[report_kind],
+                                 output_format.upper()),
+            'report_kind': report_kind,
+            'output_format': output_format,
+            'criteria': json.dumps(criteria),
+            'cache_key': cache_key,
+        })
+        self.env.ref('hotel_management_odoo.ir_cron_hotel_report_job'
+                     )._trigger()
+        return job
+
+    def action_open_result(self):
+        """Download the generated file, or notify that the report is being
+        generated"""
+        self.ensure_one()
+        if self.state == 'done' and self.attachment_id:
+            return {
+                'type': 'ir.actions.act_url',
+                'url': '/web/content/%s?download=true' %
+                       self.attachment_id.id,
+                'target': 'self',
+            }
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'type': 'info',
+                'message': _("The report is being generated, you will be "
+                             "notified when it is ready."),
+                'next': {'type': 'ir.actions.act_window_close'},
+            }
+        }
+
+    def action_retry(self):
+        """Queue the failed jobs again"""
+        self.write({'state': 'queued', 'error': False})
+        self.env.ref('hotel_management_odoo.ir_cron_hotel_report_job'
+                     )._trigger()
+
+    @api.model
+    def _cron_process_jobs(self, limit=20):
+        """Generate the queued reports, committing after each of them"""
+        jobs = self.search([('state', '=', 'queued')], limit=limit,
+                           order='id')
+        for job in jobs:
+            job.state = 'running'
+            job._commit()
+            try:
+                job._generate()
+            except Exception as error:
+                self.env.cr.rollback()
+                _logger.exception("Report job %s failed", job.id)
+                job.write({'state': 'failed', 'error': str(error)})
+                job._notify(_("The report %s could not be generated.",
+                              job.name), 'danger')
+            else:
+                job._notify(_("The report %s is ready, you can download it "
+                              "from Reporting > Report Jobs.", job.name),
+                            'success')
+            job._commit()
+
+    def _generate(self):
+        """Render the report with the rights of the requesting user and
+        store it as an attachment of the job"""
+        self.ensure_one()
+        wizard_model, report_ref = REPORT_KINDS[self.report_kind]
+        wizard = self.env[wizard_model].with_user(self.user_id).with_company(
+            self.company_id).with_context(lang=self.user_id.lang)
+        criteria = json.loads(self.criteria)
+        if self.output_format == 'xlsx':
+            with tempfile.TemporaryFile() as output:
+                wizard.get_xlsx_report(criteria, output)
+                output.seek(0)
+                content = output.read()
+            extension = 'xlsx'
+        else:
+            content, extension = self.env['ir.actions.report'].with_env(
+                wizard.env)._render_qweb_pdf(
+                report_ref, data={
+                    'booking': list(wizard._iter_report_rows(criteria))})
+        attachment = self.env['ir.attachment'].create({
+            'name': '%s.%s' % (self.name, extension),
+            'datas': base64.b64encode(content),
+            'res_model': self._name,
+            'res_id': self.id,
+        })
+        self.write({
+            'state': 'done',
+            'attachment_id': attachment.id,
+            'date_done': fields.Datetime.now(),
+        })
+
+    def _notify(self, message, notification_type):
+        """Send a notification to the user who requested the report"""
+        self.env['bus.bus']._sendone(self.user_id.partner_id,
+                                     'simple_notification', {
+                                         'type': notification_type,
+                                         'title': _("Hotel Report"),
+                                         'message': message,
+                                     })
+
+    def _commit(self):
+        """Commit the progress of the jobs, unless running tests"""
+        if not getattr(threading.current_thread(), 'testing', False):
+            self.env.cr.commit()
+
+    @api.autovacuum
+    def _gc_report_jobs(self):
+        """Remove the jobs and their files after a week"""
+        jobs = self.search([('create_date', '<', fields.Datetime.now() -
+                             timedelta(days=7))])
+        jobs.attachment_id.unlink()
+        jobs.unlink()
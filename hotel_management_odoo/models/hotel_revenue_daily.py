@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import api, fields, models
+from odoo.tools import SQL
+from odoo.tools.sql import column_exists
+
+# Move types of the folio invoices, the credit notes reducing the revenue.
+INVOICE_TYPES = ('out_invoice', 'out_refund')
+
+
+class HotelRevenueDaily(models.Model):
+    """Posted folio invoices summed per company and accounting date, so that
+    the revenue figures are read from a few rows per day instead of the
+    invoices. Rows are refreshed when folio invoices are posted, reset or
+    paid."""
+    _name = 'hotel.revenue.daily'
+    _description = 'Hotel Daily Revenue'
+    _order = 'date desc, company_id'
+    _rec_name = 'date'
+    _log_access = False
+
+    date = fields.Date(string="Date", required=True, readonly=True,
+                       help="Accounting date of the invoices")
+    company_id = fields.Many2one('res.company', string="Company",
+                                 required=True, readonly=True,
+                                 ondelete='cascade',
+                                 help="Company of the invoices")
+    currency_id = fields.Many2one(related='company_id.currency_id',
+                                  string="Currency",
+                                  help="Currency of the company")
+    invoice_count = fields.Integer(string="Invoices", readonly=True,
+                                   help="Number of posted folio invoices")
+    amount_total = fields.Monetary(string="Invoiced", readonly=True,
+                                   help="Total of the posted folio invoices")
+    amount_paid = fields.Monetary(string="Paid", readonly=True,
+                                  help="Total of the paid folio invoices")
+    amount_not_paid = fields.Monetary(string="Not Paid", readonly=True,
+                                      help="Total of the folio invoices "
+                                           "not paid yet")
+
+    _sql_constraints = [
+        ('company_date_uniq', 'unique(company_id, date)',
+         'There is one revenue row per company and day.'),
+    ]
+
+    @api.model
+    def _mark_moves(self, moves):
+        """Queue the days of the given folio invoices for a refresh before
+        the transaction is committed"""
+        keys = {(move.company_id.id, move.date) for move in moves
+                if move.booking_id and move.date
+                and move.move_type in INVOICE_TYPES}
+        if not keys:
+            return
+        pending = self.env.cr.precommit.data.setdefault(
+            'hotel_revenue.keys', set())
+        if not pending:
+            self.env.cr.precommit.add(self._flush_pending)
+        pending.update(keys)
+
+    @api.model
+    def _flush_pending(self):
+        """Refresh the days queued by _mark_moves, also called before the
+        rollup is read so that it reflects the current transaction"""
+        keys = self.env.cr.precommit.data.pop('hotel_revenue.keys', set())
+        if keys:
+            self._refresh(keys)
+
+    @api.model
+    def _refresh(self, keys=None):
+        """Recompute the rows of the given (company id, date) keys, or all
+        of them, from the posted folio invoices"""
+        self.env['account.move'].flush_model(
+            ['booking_id', 'company_id', 'date', 'state', 'move_type',
+             'payment_state', 'amount_total_signed'])
+        if keys is None:
+            self.env.cr.execute(SQL("DELETE FROM hotel_revenue_daily"))
+            key_filter = SQL("TRUE")
+        else:
+            company_ids, dates = zip(*keys)
+            keys_table = SQL(
+                "unnest(%s::int[], %s::date[]) AS key(company_id, date)",
+                list(company_ids), list(dates))
+            self.env.cr.execute(SQL("""
+                DELETE FROM hotel_revenue_daily revenue
+                 USING %s
+                 WHERE revenue.company_id = key.company_id
+                   AND revenue.date = key.date
+            """, keys_table))
+            key_filter = SQL(
+                "(move.company_id, move.date) IN (SELECT * FROM %s)",
+                keys_table)
+        self.env.cr.execute(SQL("""
+            INSERT INTO hotel_revenue_daily (company_id, date, invoice_count,
+                                             amount_total, amount_paid,
+                                             amount_not_paid)
+                 SELECT move.company_id, move.date, count(*),
+                        sum(move.amount_total_signed),
+                        COALESCE(sum(move.amount_total_signed) FILTER (
+                            WHERE move.payment_state = 'paid'), 0),
+                        COALESCE(sum(move.amount_total_signed) FILTER (
+                            WHERE move.payment_state = 'not_paid'), 0)
+                   FROM account_move move
+                  WHERE move.booking_id IS NOT NULL
+                    AND move.state = 'posted'
+                    AND move.move_type IN %s
+                    AND %s
+               GROUP BY move.company_id, move.date
+        """, INVOICE_TYPES, key_filter))
+        self.invalidate_model()
+
+    @api.model
+    def _init_revenue(self):
+        """Link the folio invoices created before the booking_id field to
+        their booking and build the rollup, used when the module is
+        installed or updated"""
+        cr = self.env.cr
+        if column_exists(cr, 'account_move', 'hotel_booking_id'):
+            cr.execute(SQL("""
+                UPDATE account_move SET booking_id = hotel_booking_id
+                 WHERE booking_id IS NULL AND hotel_booking_id IS NOT NULL
+            """))
+        cr.execute(SQL("""
+            UPDATE account_move move SET booking_id = booking.id
+              FROM room_booking booking
+             WHERE move.booking_id IS NULL
+               AND move.move_type IN %s
+               AND move.ref = booking.name
+        """, INVOICE_TYPES))
+        self.env['account.move'].invalidate_model(['booking_id'])
+        self._refresh()
+
+    @api.model
+    def _get_revenue(self, company, date=None):
+        """Return the paid and not paid totals of the company, of the given
+        day or of all time, summed over the daily rows"""
+        self._flush_pending()
+        domain = [('company_id', '=', company.id)]
+        if date:
+            domain.append(('date', '=', date))
+        paid, not_paid = self._read_group(
+            domain, aggregates=['amount_paid:sum', 'amount_not_paid:sum'])[0]
+        return paid or 0.0, not_paid or 0.0
@@ -19,8 +19,12 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 ###############################################################################
+from datetime import datetime, time, timedelta
 from odoo import api, fields, models, tools, _
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+from .hotel_room_block import BLOCK_RANGE
+from .room_booking_line import STAY_RANGE
 
 
 class HotelRoom(models.Model):
@@ -83,6 +87,45 @@ class HotelRoom(models.Model):
                                 tracking=True)
     description = fields.Html(string='Description', help="Add description",
                               translate=True)
+    company_id = fields.Many2one('res.company', string="Company",
+                                 index=True,
+                                 default=lambda self: self.env.company,
+                                 help="Company the room belongs to, its "
+                                      "inventory counting in the occupancy "
+                                      "of the company")
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Log the new inventory in the ARI journal"""
+        rooms = super().create(vals_list)
+        rooms._log_ari_changes()
+        return rooms
+
+    def write(self, vals):
+        """Log the inventory and rent changes in the ARI journal"""
+        old_types = set(self.mapped('room_type')) if 'room_type' in vals \
+            else set()
+        result = super().write(vals)
+        if 'room_type' in vals:
+            self._log_ari_changes(old_types)
+        elif 'list_price' in vals:
+            self._log_ari_changes(kind='rate')
+        return result
+
+    def unlink(self):
+        """Log the removed inventory in the ARI journal"""
+        room_types = set(self.mapped('room_type'))
+        result = super().unlink()
+        self.browse()._log_ari_changes(room_types)
+        return result
+
+    def _log_ari_changes(self, room_types=(), kind='availability'):
+        """Log a change of all the future nights of the room types of the
+        rooms and of the given room types"""
+        today = fields.Date.context_today(self)
+        self.env['hotel.ari.change']._log_changes([
+            (kind, room_type, today, None)
+            for room_type in set(room_types) | set(self.mapped('room_type'))])
 
     @api.constrains("num_person")
     def _check_capacity(self):
@@ -102,3 +145,291 @@ class HotelRoom(models.Model):
             self.num_person = 2
         else:
             self.num_person = 4
+
+    def _recompute_status(self, tracking=False):
+        """Recompute the status of the rooms from the active bookings
+        holding them, checked-in bookings make a room occupied and reserved
+        ones make it reserved. The bookings of all the rooms are grouped in
+        one query and each distinct status is written once.
+        ----------------------------------------
+        @param tracking: keep the chatter tracking of the status change,
+                         operational flips are not tracked by default"""
+        rooms = self.filtered('id')
+        if not rooms:
+            return
+        self.env['room.booking.line'].flush_model(['room_id', 'booking_id'])
+        self.env['room.booking'].flush_model(['state'])
+        self.env.cr.execute(SQL("""
+            SELECT line.room_id, bool_or(booking.state = 'check_in')
+              FROM room_booking_line line
+              JOIN room_booking booking ON booking.id = line.booking_id
+             WHERE line.room_id = ANY(%s)
+               AND booking.state IN ('reserved', 'check_in')
+          GROUP BY line.room_id
+        """, rooms.ids))
+        checked_in = dict(self.env.cr.fetchall())
+        room_ids_by_status = {}
+        for room in rooms:
+            if room.id not in checked_in:
+                status = 'available'
+            else:
+                status = 'occupied' if checked_in[room.id] else 'reserved'
+            if (room.status, room.is_room_avail) != (
+                    status, status == 'available'):
+                room_ids_by_status.setdefault(status, []).append(room.id)
+        if not tracking:
+            rooms = rooms.with_context(tracking_disable=True)
+        for status, room_ids in room_ids_by_status.items():
+            rooms.browse(room_ids).write({
+                'status': status,
+                'is_room_avail': status == 'available',
+            })
+
+    @api.model
+    def find_conflicts(self, room_ids, start, end, exclude_line_ids=None):
+        """Return the booking lines of reserved or checked-in bookings which
+        hold one of the given rooms at some point between start and end.
+        ----------------------------------------
+        @param room_ids: ids of the rooms to check
+        @param start: beginning of the stay (datetime)
+        @param end: end of the stay (datetime)
+        @param exclude_line_ids: booking lines to ignore, e.g. the ones being
+                                 edited
+        @return: room.booking.line recordset"""
+        return self._find_conflicts([(room_id, start, end)
+                                     for room_id in room_ids],
+                                    exclude_line_ids=exclude_line_ids)
+
+    @api.model
+    def _find_conflicts(self, stays, exclude_line_ids=None):
+        """Batched version of find_conflicts, stays is a list of
+        (room_id, start, end) tuples which are all checked in one query
+        going through the stay range index of room.booking.line."""
+        booking_lines = self.env['room.booking.line']
+        if not stays:
+            return booking_lines
+        booking_lines.flush_model(['room_id', 'checkin_date', 'checkout_date',
+                                   'booking_id'])
+        self.env['room.booking'].flush_model(['state'])
+        room_ids, starts, ends = zip(*stays)
+        self.env.cr.execute(SQL("""
+            SELECT DISTINCT line.id
+              FROM unnest(%s::int[], %s::timestamp[], %s::timestamp[])
+                   AS stay(room_id, date_from, date_to)
+              JOIN room_booking_line line
+                ON line.room_id = stay.room_id
+               AND %s && tsrange(stay.date_from,
+                                 GREATEST(stay.date_from, stay.date_to), '[]')
+              JOIN room_booking booking ON booking.id = line.booking_id
+             WHERE booking.state IN ('reserved', 'check_in')
+               AND line.id != ALL(%s)
+        """, list(room_ids), list(starts), list(ends),
+            SQL(STAY_RANGE.format(alias='line.')),
+            list(exclude_line_ids or [])))
+        return booking_lines.browse([row[0] for row in self.env.cr.fetchall()])
+
+    @api.model
+    def _get_cheapest_rooms(self, room_types):
+        """Return the cheapest room of each of the given room types, the one
+        rates are quoted for when no room is assigned yet
+        ----------------------------------------
+        @param room_types: iterable of room types
+        @return: dict mapping the room types to a hotel.room"""
+        cheapest = {}
+        for room in self.search([('room_type', 'in', list(set(room_types)))],
+                                order='list_price, id'):
+            cheapest.setdefault(room.room_type, room)
+        return cheapest
+
+    @api.model
+    def search_available(self, date_from, date_to, room_type=False,
+                         num_person=0, amenity_ids=None, floor_id=False,
+                         horizon=365):
+        """Search the rooms matching the given criteria and tell, for each of
+        them, whether it is free for the whole stay and which is the first
+        date from date_from on where a stay of the same length fits.
+        ----------------------------------------
+        @param date_from: first night of the stay
+        @param date_to: departure date
+        @param room_type: restrict to this room type
+        @param num_person: minimum capacity of the room
+        @param amenity_ids: amenities the room must all provide
+        @param floor_id: restrict to this floor
+        @param horizon: number of days scanned for the first free slot
+        @return: list of dicts with the room id, name, availability, first
+                 free date and price of the stay"""
+        date_from = fields.Date.to_date(date_from)
+        date_to = fields.Date.to_date(date_to)
+        if date_from > date_to:
+            raise ValidationError(
+                _("Check-in date should be less than Check-out date"))
+        domain = []
+        if room_type:
+            domain.append(('room_type', '=', room_type))
+        if num_person:
+            domain.append(('num_person', '>=', num_person))
+        if floor_id:
+            domain.append(('floor_id', '=', floor_id))
+        for amenity_id in amenity_ids or []:
+            domain.append(('room_amenities_ids', 'in', [amenity_id]))
+        rooms = self.search(domain)
+        nights = max((date_to - date_from).days, 1)
+        days = max(horizon, nights)
+        occupancy = self._get_occupancy_bitmaps(rooms.ids, date_from, days)
+        prices = self.env['hotel.rate.calendar']._get_stay_prices([
+            (room, date_from, nights, self.env.company) for room in rooms])
+        stay_mask = (1 << nights) - 1
+        calendar_mask = (1 << days) - 1
+        result = []
+        for room, nightly_prices in zip(rooms, prices):
+            free = ~occupancy.get(room.id, 0) & calendar_mask
+            # Keep only the days starting a run of `nights` free days, by
+            # and-ing the bitmap with shifted copies of itself.
+            starts, width = free, 1
+            while width < nights:
+                step = min(width, nights - width)
+                starts &= starts >> step
+                width += step
+            starts &= (1 << (days - nights + 1)) - 1
+            first_free = False
+            if starts:
+                first_free = date_from + timedelta(
+                    days=(starts & -starts).bit_length() - 1)
+            result.append({
+                'id': room.id,
+                'name': room.name,
+                'available': not (occupancy.get(room.id, 0) & stay_mask),
+                'first_free_date': fields.Date.to_string(first_free),
+                'price': sum(nightly_prices),
+            })
+        return result
+
+    @api.model
+    def _get_occupancy_bitmaps(self, room_ids, date_from, days):
+        """Return a dict mapping the room ids to an integer used as a bitmap
+        of the nights, bit i being set when the room is not available the
+        night of date_from + i days. Reserved and checked-in booking lines
+        as well as the out of order periods are taken into account."""
+        occupancy = dict.fromkeys(room_ids, 0)
+        if not room_ids:
+            return occupancy
+        self.env['room.booking.line'].flush_model(
+            ['room_id', 'checkin_date', 'checkout_date', 'booking_id'])
+        self.env['room.booking'].flush_model(['state'])
+        date_stop = date_from + timedelta(days=days)
+        self.env.cr.execute(SQL("""
+            SELECT line.room_id,
+                   GREATEST(line.checkin_date::date, %(start)s) - %(start)s,
+                   LEAST(GREATEST(line.checkout_date::date - 1,
+                                  line.checkin_date::date),
+                         %(stop)s - 1) - %(start)s
+              FROM room_booking_line line
+              JOIN room_booking booking ON booking.id = line.booking_id
+             WHERE booking.state IN ('reserved', 'check_in')
+               AND line.room_id = ANY(%(room_ids)s)
+               AND %(stay)s && tsrange(%(start)s, %(stop)s, '[)')
+        """, start=date_from, stop=date_stop, room_ids=list(room_ids),
+            stay=SQL(STAY_RANGE.format(alias='line.'))))
+        for room_id, first, last in self.env.cr.fetchall():
+            if first <= last:
+                occupancy[room_id] |= ((1 << (last - first + 1)) - 1) << first
+        # Out of order periods block the nights they touch, the ones still
+        # open until the end of the bitmap.
+        self.env['hotel.room.block'].flush_model(
+            ['room_id', 'date_from', 'date_to'])
+        self.env.cr.execute(SQL("""
+            SELECT block.room_id,
+                   GREATEST(block.date_from::date, %(start)s) - %(start)s,
+                   LEAST(COALESCE(block.date_to::date, %(stop)s),
+                         %(stop)s) - %(start)s
+              FROM hotel_room_block block
+             WHERE block.room_id = ANY(%(room_ids)s)
+               AND %(block)s && tsrange(%(start)s, %(stop)s, '[)')
+        """, start=date_from, stop=date_stop, room_ids=list(room_ids),
+            block=SQL(BLOCK_RANGE.format(alias='block.'))))
+        for room_id, first, stop in self.env.cr.fetchall():
+            if first < stop:
+                occupancy[room_id] |= ((1 << (stop - first)) - 1) << first
+        return occupancy
+
+    @api.model
+    def get_timeline(self, date_from, date_to, floor_id=False,
+                     room_type=False, page=0):
+        """Return the stays of the rooms between date_from and date_to for
+        the reservation chart, one floor per page. The payload is columnar:
+        every key of rooms and stays holds a list, stays referencing their
+        room by index and their state by index in states.
+        ----------------------------------------
+        @param date_from: first day of the window
+        @param date_to: last day of the window
+        @param floor_id: only show this floor
+        @param room_type: only show rooms of this type
+        @param page: index of the floor to show, ignored with floor_id
+        @return: dict with the window, the page, rooms and stays"""
+        date_from = fields.Date.to_date(date_from)
+        date_to = fields.Date.to_date(date_to)
+        if date_from > date_to:
+            raise ValidationError(
+                _("Check-in date should be less than Check-out date"))
+        self.check_access('read')
+        self.env['room.booking.line'].check_access('read')
+        floor_ids = [floor_id] if floor_id else \
+            self.env['hotel.floor'].search([], order='id').ids + [None]
+        page = min(max(int(page), 0), len(floor_ids) - 1)
+        states = [state for state, _label in
+                  self.env['room.booking']._fields['state'].selection]
+        window_start = datetime.combine(date_from, time.min)
+        self.env['room.booking.line'].flush_model(
+            ['room_id', 'checkin_date', 'checkout_date', 'booking_id'])
+        self.env['room.booking'].flush_model(['state'])
+        self.flush_model(['name', 'floor_id', 'room_type'])
+        self.env.cr.execute(SQL("""
+            SELECT room.id,
+                   COALESCE(room.name->>%(lang)s, room.name->>'en_US'),
+                   room.room_type, line.id, line.booking_id,
+                   booking.state,
+                   (EXTRACT(EPOCH FROM line.checkin_date - %(start)s) / 60
+                   )::int,
+                   (EXTRACT(EPOCH FROM GREATEST(line.checkin_date,
+                                                line.checkout_date)
+                                       - %(start)s) / 60)::int
+              FROM hotel_room room
+         LEFT JOIN (room_booking_line line
+                    JOIN room_booking booking
+                      ON booking.id = line.booking_id
+                     AND booking.state != 'cancel')
+                ON line.room_id = room.id
+               AND %(stay_range)s && tsrange(%(start)s, %(end)s, '[)')
+             WHERE room.floor_id IS NOT DISTINCT FROM %(floor_id)s
+               AND (%(room_type)s IS NULL OR room.room_type = %(room_type)s)
+          ORDER BY room.name->>'en_US', room.id, line.checkin_date
+        """, lang=self.env.lang or 'en_US', start=window_start,
+            end=window_start + timedelta(days=(date_to - date_from).days + 1),
+            stay_range=SQL(STAY_RANGE.format(alias='line.')),
+            floor_id=floor_ids[page], room_type=room_type or None))
+        rooms = {'id': [], 'name': [], 'room_type': []}
+        stays = {'room': [], 'start': [], 'end': [], 'state': [],
+                 'booking_id': [], 'line_id': []}
+        for (room_id, name, type_, line_id, booking_id, state, start,
+             end) in self.env.cr.fetchall():
+            if not rooms['id'] or rooms['id'][-1] != room_id:
+                rooms['id'].append(room_id)
+                rooms['name'].append(name)
+                rooms['room_type'].append(type_)
+            if line_id:
+                stays['room'].append(len(rooms['id']) - 1)
+                stays['start'].append(start)
+                stays['end'].append(end)
+                stays['state'].append(states.index(state))
+                stays['booking_id'].append(booking_id)
+                stays['line_id'].append(line_id)
+        return {
+            'date_from': fields.Date.to_string(date_from),
+            'date_to': fields.Date.to_string(date_to),
+            'floor_id': floor_ids[page] or False,
+            'page': page,
+            'page_count': len(floor_ids),
+            'states': states,
+            'rooms': rooms,
+            'stays': stays,
+        }
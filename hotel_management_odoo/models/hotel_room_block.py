@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import api, fields, models, _
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+# Out of order range of a room as indexed by ``hotel_room_block_range_idx``,
+# open upwards while the maintenance is not verified.
+BLOCK_RANGE = "tsrange({alias}date_from, {alias}date_to, '[)')"
+
+
+class HotelRoomBlock(models.Model):
+    """Periods during which a room is out of order, generated from the room
+    maintenance requests between their start and their verification"""
+    _name = 'hotel.room.block'
+    _description = 'Out of Order Room'
+    _order = 'date_from desc, id desc'
+    _rec_name = 'room_id'
+
+    room_id = fields.Many2one('hotel.room', string="Room", required=True,
+                              index=True, ondelete='cascade',
+                              help="Room out of order")
+    maintenance_id = fields.Many2one('maintenance.request',
+                                     string="Maintenance Request",
+                                     index='btree_not_null',
+                                     ondelete='cascade',
+                                     help="Maintenance request blocking the "
+                                          "room")
+    date_from = fields.Datetime(string="From", required=True,
+                                default=fields.Datetime.now,
+                                help="Start of the out of order period")
+    date_to = fields.Datetime(string="To",
+                              help="End of the out of order period, empty "
+                                   "while the room is being repaired")
+    reason = fields.Char(string="Reason", help="Why the room is blocked")
+
+    def init(self):
+        """Index the out of order ranges for the availability lookups of
+        hotel.room."""
+        create_index(self.env.cr, 'hotel_room_block_range_idx', self._table,
+                     [BLOCK_RANGE.format(alias='')], method='gist')
+
+    @api.constrains('date_from', 'date_to')
+    def _check_dates(self):
+        """The end of a period can't be before its start"""
+        for block in self:
+            if block.date_to and block.date_to < block.date_from:
+                raise ValidationError(
+                    _("The end of the out of order period must be after "
+                      "its start."))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Log the blocked inventory in the ARI journal"""
+        blocks = super().create(vals_list)
+        blocks._log_ari_changes()
+        return blocks
+
+    def write(self, vals):
+        """Log the inventory blocked or released in the ARI journal"""
+        if {'room_id', 'date_from', 'date_to'} & set(vals):
+            self._log_ari_changes()
+        result = super().write(vals)
+        if {'room_id', 'date_from', 'date_to'} & set(vals):
+            self._log_ari_changes()
+        return result
+
+    def unlink(self):
+        """Log the released inventory in the ARI journal"""
+        self._log_ari_changes()
+        return super().unlink()
+
+    def _log_ari_changes(self):
+        """Log the nights covered by the blocks as availability changes"""
+        self.env['hotel.ari.change']._log_changes([
+            ('availability', block.room_id.room_type, block.date_from.date(),
+             block.date_to.date() if block.date_to else None)
+            for block in self])
+
+    @api.model
+    def _find_blocks(self, stays):
+        """Return the blocks overlapping the given stays, a list of
+        (room_id, start, end) tuples all checked in one query going through
+        the range index"""
+        if not stays:
+            return self.browse()
+        self.flush_model(['room_id', 'date_from', 'date_to'])
+        room_ids, starts, ends = zip(*stays)
+        self.env.cr.execute(SQL("""
+            SELECT DISTINCT block.id
+              FROM unnest(%s::int[], %s::timestamp[], %s::timestamp[])
+                   AS stay(room_id, date_from, date_to)
+              JOIN hotel_room_block block
+                ON block.room_id = stay.room_id
+               AND %s && tsrange(stay.date_from,
+                                 GREATEST(stay.date_from, stay.date_to), '[]')
+        """, list(room_ids), list(starts), list(ends),
+            SQL(BLOCK_RANGE.format(alias='block.'))))
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+
+    @api.model
+    def _raise_if_blocked(self, stays):
+        """Raise when one of the stays hits an out of order period"""
+        blocks = self._find_blocks(stays)
+        if blocks:
+            raise ValidationError(
+                _("The room %(room)s is out of order from %(date)s.",
+                  room=blocks[0].room_id.name,
+                  date=fields.Datetime.to_string(blocks[0].date_from)))
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+# Booking states for which the nights count as sold in occupancy figures.
+SOLD_STATES = ('reserved', 'check_in', 'check_out', 'done')
+
+
+class HotelRoomNight(models.Model):
+    """Materialized occupancy of the rooms, one row per room and night of
+    every booking line. Rows are maintained by room.booking.line and
+    room.booking so that occupancy figures are range aggregations."""
+    _name = 'hotel.room.night'
+    _description = 'Room Night'
+    _order = 'night, room_id'
+    _rec_name = 'night'
+
+    night = fields.Date(string="Night", required=True, index=True,
+                        readonly=True, help="Date of the night")
+    room_id = fields.Many2one('hotel.room', string="Room", required=True,
+                              index=True, readonly=True,
+                              ondelete='cascade', help="Occupied room")
+    booking_line_id = fields.Many2one('room.booking.line',
+                                      string="Booking Line", required=True,
+                                      index=True, readonly=True,
+                                      ondelete='cascade',
+                                      help="Booking line of the night")
+    booking_id = fields.Many2one('room.booking', string="Booking",
+                                 readonly=True, index=True,
+                                 ondelete='cascade',
+                                 help="Booking of the night")
+    company_id = fields.Many2one('res.company', string="Company",
+                                 readonly=True, help="Company of the booking")
+    state = fields.Selection(selection=[('draft', 'Draft'),
+                                        ('reserved', 'Reserved'),
+                                        ('check_in', 'Check In'),
+                                        ('check_out', 'Check Out'),
+                                        ('cancel', 'Cancelled'),
+                                        ('done', 'Done')], string='State',
+                             readonly=True, index=True,
+                             help="State of the booking")
+
+    _sql_constraints = [
+        ('booking_line_night_uniq', 'unique(booking_line_id, night)',
+         'A booking line can only occupy a room once per night.'),
+    ]
+
+    @api.model
+    def _sync_booking_lines(self, line_ids):
+        """Regenerate the nights of the given booking lines. A line occupies
+        its room every night from the check-in date up to the day before
+        the check-out date, and at least one night."""
+        if not line_ids:
+            return
+        self.env['room.booking.line'].flush_model(
+            ['room_id', 'checkin_date', 'checkout_date', 'booking_id'])
+        self.env['room.booking'].flush_model(['state', 'company_id'])
+        self.flush_model()
+        self.env.cr.execute(SQL("""
+            DELETE FROM hotel_room_night WHERE booking_line_id = ANY(%(ids)s);
+            INSERT INTO hotel_room_night (night, room_id, booking_line_id,
+                                          booking_id, company_id, state,
+                                          create_uid, create_date,
+                                          write_uid, write_date)
+                 SELECT night::date, line.room_id, line.id, line.booking_id,
+                        booking.company_id, booking.state,
+                        %(uid)s, NOW() AT TIME ZONE 'UTC',
+                        %(uid)s, NOW() AT TIME ZONE 'UTC'
+                   FROM room_booking_line line
+                   JOIN room_booking booking ON booking.id = line.booking_id
+             CROSS JOIN LATERAL generate_series(
+                            line.checkin_date::date,
+                            GREATEST(line.checkout_date::date - 1,
+                                     line.checkin_date::date),
+                            interval '1 day') AS night
+                  WHERE line.id = ANY(%(ids)s)
+                    AND line.room_id IS NOT NULL
+        """, ids=list(line_ids), uid=self.env.uid))
+        self.invalidate_model()
+
+    @api.model
+    def _sync_booking_state(self, bookings):
+        """Propagate the state of the given bookings to their nights"""
+        if not bookings:
+            return
+        bookings.flush_recordset(['state'])
+        self.flush_model()
+        self.env.cr.execute(SQL("""
+            UPDATE hotel_room_night night
+               SET state = booking.state,
+                   write_uid = %s,
+                   write_date = NOW() AT TIME ZONE 'UTC'
+              FROM room_booking booking
+             WHERE booking.id = night.booking_id
+               AND booking.id = ANY(%s)
+               AND night.state IS DISTINCT FROM booking.state
+        """, self.env.uid, bookings.ids))
+        self.invalidate_model(['state', 'write_uid', 'write_date'])
+
+    @api.model
+    def _init_room_nights(self):
+        """Generate the nights of the booking lines which have none yet,
+        used to fill the table when the module is installed or updated."""
+        self.env.cr.execute(SQL("""
+            SELECT line.id
+              FROM room_booking_line line
+             WHERE NOT EXISTS (SELECT 1 FROM hotel_room_night night
+                                WHERE night.booking_line_id = line.id)
+        """))
+        self._sync_booking_lines([row[0] for row in self.env.cr.fetchall()])
+
+    @api.model
+    def get_occupied_room_ids(self, night=None):
+        """Return the ids of the rooms sold for the given night (tonight by
+        default)."""
+        night = fields.Date.to_date(night) or fields.Date.context_today(self)
+        return self.search([('night', '=', night),
+                            ('state', 'in', SOLD_STATES)]).room_id.ids
+
+    @api.model
+    def get_occupancy_stats(self, date_from, date_to, company_id=None):
+        """Return the occupancy, ADR and RevPAR of the nights from date_from
+        up to date_to excluded.
+        ----------------------------------------
+        @param date_from: first night of the period
+        @param date_to: end of the period (excluded)
+        @param company_id: company of the bookings, current one by default
+        @return: dict of the figures"""
+        date_from = fields.Date.to_date(date_from)
+        date_to = fields.Date.to_date(date_to)
+        company_id = company_id or self.env.company.id
+        self.flush_model()
+        self.env['room.booking.line'].flush_model(
+            ['price_subtotal', 'checkin_date', 'checkout_date'])
+        self.env.cr.execute(SQL("""
+            SELECT COUNT(*),
+                   COALESCE(SUM(line.price_subtotal
+                                / GREATEST(line.checkout_date::date
+                                           - line.checkin_date::date, 1)), 0)
+              FROM hotel_room_night night
+              JOIN room_booking_line line ON line.id = night.booking_line_id
+             WHERE night.night >= %s AND night.night < %s
+               AND night.state IN %s
+               AND night.company_id = %s
+        """, date_from, date_to, SOLD_STATES, company_id))
+        rooms_sold, revenue = self.env.cr.fetchone()
+        rooms_available = self.env['hotel.room'].search_count(
+            [('company_id', '=', company_id)]) * max(
+            (date_to - date_from).days, 0)
+        return {
+            'rooms_available': rooms_available,
+            'rooms_sold': rooms_sold,
+            'revenue': revenue,
+            'occupancy': rooms_sold / rooms_available * 100
+            if rooms_available else 0.0,
+            'adr': revenue / rooms_sold if rooms_sold else 0.0,
+            'revpar': revenue / rooms_available if rooms_available else 0.0,
+        }
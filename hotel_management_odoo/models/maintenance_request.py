@@ -88,6 +88,10 @@ class MaintenanceRequest(models.Model):
     domain_partner_ids = fields.Many2many('res.partner',
                                           string="Partner",
                                           help="For filtering Users")
+    room_block_ids = fields.One2many('hotel.room.block', 'maintenance_id',
+                                     string="Out of Order Periods",
+                                     help="Periods the rooms are blocked "
+                                          "by this request")
 
     @api.model
     def create(self, vals_list):
@@ -121,8 +125,41 @@ class MaintenanceRequest(models.Model):
                 _("Please assign a User"))
 
     def action_start(self):
-        """Button action for changing the state to ongoing"""
+        """Button action for changing the state to ongoing, the rooms being
+        out of order until the request is verified"""
         self.state = 'ongoing'
+        self._open_room_blocks()
+
+    def _open_room_blocks(self):
+        """Block the rooms of the room requests which are not blocked by
+        them yet"""
+        now = fields.Datetime.now()
+        vals_list = []
+        for request in self.filtered(lambda req: req.type == 'room'):
+            blocked = request.room_block_ids.filtered(
+                lambda block: not block.date_to).room_id
+            vals_list += [{
+                'room_id': room.id,
+                'maintenance_id': request.id,
+                'date_from': now,
+                'reason': request.sequence,
+            } for room in request.room_maintenance_ids - blocked]
+        self.env['hotel.room.block'].sudo().create(vals_list)
+
+    @api.model
+    def _init_room_blocks(self):
+        """Block the rooms of the room requests which were already started
+        before their rooms could be put out of order"""
+        self.search([
+            ('type', '=', 'room'),
+            ('state', 'in', ['ongoing', 'support', 'verify']),
+            ('room_block_ids', '=', False),
+        ])._open_room_blocks()
+
+    def _close_room_blocks(self):
+        """Release the rooms blocked by the requests"""
+        self.room_block_ids.filtered(lambda block: not block.date_to).sudo(
+        ).write({'date_to': fields.Datetime.now()})
 
     def action_support(self):
         """Button action for changing the state to support"""
@@ -148,5 +185,6 @@ class MaintenanceRequest(models.Model):
     def action_verify(self):
         """Button action for changing the state to done"""
         self.state = 'done'
+        self._close_room_blocks()
         if self.vehicle_maintenance_id:
             self.vehicle_maintenance_id.status = 'available'
@@ -19,11 +19,29 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 ###############################################################################
+import time
 from datetime import datetime, timedelta
-from odoo import api, fields, models, _
-from odoo.exceptions import ValidationError
+from odoo import api, Command, fields, models, SUPERUSER_ID, _
+from odoo.exceptions import AccessError, ValidationError
+from odoo.tools import float_compare, float_is_zero, SQL
 from odoo.tools.safe_eval import pytz
 
+# Dashboard snapshots by (database, company), holding the expiry time, the
+# start of the transaction that computed them and the counts returned by
+# room.booking.get_details.
+DASHBOARD_CACHE = {}
+DASHBOARD_CACHE_TTL = 60
+
+# Kinds of booking lines with the field holding them on room.booking, the
+# kind is the suffix of the amount fields and the invoice line product type.
+BOOKING_LINE_FIELDS = [
+    ('room', 'room_line_ids'),
+    ('food', 'food_order_line_ids'),
+    ('service', 'service_line_ids'),
+    ('fleet', 'vehicle_line_ids'),
+    ('event', 'event_line_ids'),
+]
+
 
 class RoomBooking(models.Model):
     """Model that handles the hotel room booking and all operations related
@@ -136,7 +154,7 @@ class RoomBooking(models.Model):
                                         ('check_out', 'Check Out'),
                                         ('cancel', 'Cancelled'),
                                         ('done', 'Done')], string='State',
-                             help="State of the Booking",
+                             help="State of the Booking", index=True,
                              default='draft', tracking=True,copy=False,)
     user_id = fields.Many2one(comodel_name='res.partner',
                               string="Invoice Address",
@@ -239,7 +257,32 @@ class RoomBooking(models.Model):
         if vals_list.get('name', 'New') == 'New':
             vals_list['name'] = self.env['ir.sequence'].next_by_code(
                 'room.booking')
-        return super().create(vals_list)
+        booking = super().create(vals_list)
+        self._invalidate_dashboard(booking.company_id)
+        return booking
+
+    def write(self, vals):
+        """Keep the room nights in line with the state of the bookings and
+        log the availability of the bookings entering or leaving the
+        reserved and checked-in states"""
+        active_states = ('reserved', 'check_in')
+        was_active = self.filtered(lambda booking: booking.state in
+                                   active_states)
+        result = super().write(vals)
+        if 'state' in vals:
+            self.env['hotel.room.night']._sync_booking_state(self)
+            is_active = self.filtered(
+                lambda booking: booking.state in active_states)
+            changed = (was_active | is_active) - (was_active & is_active)
+            self.env['hotel.ari.change']._log_changes(
+                changed.room_line_ids._get_ari_changes(active_only=False))
+        self._invalidate_dashboard(self.company_id)
+        return result
+
+    def unlink(self):
+        """Refresh the dashboard of the companies of the bookings"""
+        self._invalidate_dashboard(self.company_id)
+        return super().unlink()
 
     @api.depends('partner_id')
     def _compute_user_id(self):
@@ -250,10 +293,12 @@ class RoomBooking(models.Model):
                     'invoice'] if order.partner_id else False
 
     def _compute_invoice_count(self):
-        """Compute the invoice count"""
+        """Compute the invoice count with one grouped query on the indexed
+        booking of the invoices"""
+        counts = dict(self.env['account.move']._read_group(
+            [('booking_id', 'in', self.ids)], ['booking_id'], ['__count']))
         for record in self:
-            record.invoice_count = self.env['account.move'].search_count(
-                [('ref', '=', self.name)])
+            record.invoice_count = counts.get(record, 0)
 
     @api.depends('partner_id')
     def _compute_pricelist_id(self):
@@ -277,117 +322,82 @@ class RoomBooking(models.Model):
                  'event_line_ids.price_subtotal', 'event_line_ids.price_tax',
                  'event_line_ids.price_total',
                  )
-    def _compute_amount_untaxed(self, flag=False):
-        """Compute the total amounts of the Sale Order"""
-        amount_untaxed_room = 0.0
-        amount_untaxed_food = 0.0
-        amount_untaxed_fleet = 0.0
-        amount_untaxed_event = 0.0
-        amount_untaxed_service = 0.0
-        amount_taxed_room = 0.0
-        amount_taxed_food = 0.0
-        amount_taxed_fleet = 0.0
-        amount_taxed_event = 0.0
-        amount_taxed_service = 0.0
-        amount_total_room = 0.0
-        amount_total_food = 0.0
-        amount_total_fleet = 0.0
-        amount_total_event = 0.0
-        amount_total_service = 0.0
-        room_lines = self.room_line_ids
-        food_lines = self.food_order_line_ids
-        service_lines = self.service_line_ids
-        fleet_lines = self.vehicle_line_ids
-        event_lines = self.event_line_ids
-        booking_list = []
-        account_move_line = self.env['account.move.line'].search_read(
-            domain=[('ref', '=', self.name),
-                    ('display_type', '!=', 'payment_term')],
-            fields=['name', 'quantity', 'price_unit', 'product_type'], )
-        for rec in account_move_line:
-            del rec['id']
-        if room_lines:
-            amount_untaxed_room += sum(room_lines.mapped('price_subtotal'))
-            amount_taxed_room += sum(room_lines.mapped('price_tax'))
-            amount_total_room += sum(room_lines.mapped('price_total'))
-            for room in room_lines:
-                booking_dict = {'name': room.room_id.name,
-                                'quantity': room.uom_qty,
-                                'price_unit': room.price_unit,
-                                'product_type': 'room'}
-                if booking_dict not in account_move_line:
-                    if not account_move_line:
-                        booking_list.append(booking_dict)
-                    else:
-                        for rec in account_move_line:
-                            if rec['product_type'] == 'room':
-                                if booking_dict['name'] == rec['name'] and \
-                                        booking_dict['price_unit'] == rec[
-                                    'price_unit'] and booking_dict['quantity']\
-                                        != rec['quantity']:
-                                    booking_list.append(
-                                        {'name': room.room_id.name,
-                                         "quantity": booking_dict[
-                                                         'quantity'] - rec[
-                                                         'quantity'],
-                                         "price_unit": room.price_unit,
-                                         "product_type": 'room'})
-                                else:
-                                    booking_list.append(booking_dict)
-                    if flag:
-                        room.booking_line_visible = True
-        if food_lines:
-            for food in food_lines:
-                booking_list.append(self.create_list(food))
-            amount_untaxed_food += sum(food_lines.mapped('price_subtotal'))
-            amount_taxed_food += sum(food_lines.mapped('price_tax'))
-            amount_total_food += sum(food_lines.mapped('price_total'))
-        if service_lines:
-            for service in service_lines:
-                booking_list.append(self.create_list(service))
-            amount_untaxed_service += sum(
-                service_lines.mapped('price_subtotal'))
-            amount_taxed_service += sum(service_lines.mapped('price_tax'))
-            amount_total_service += sum(service_lines.mapped('price_total'))
-        if fleet_lines:
-            for fleet in fleet_lines:
-                booking_list.append(self.create_list(fleet))
-            amount_untaxed_fleet += sum(fleet_lines.mapped('price_subtotal'))
-            amount_taxed_fleet += sum(fleet_lines.mapped('price_tax'))
-            amount_total_fleet += sum(fleet_lines.mapped('price_total'))
-        if event_lines:
-            for event in event_lines:
-                booking_list.append(self.create_list(event))
-            amount_untaxed_event += sum(event_lines.mapped('price_subtotal'))
-            amount_taxed_event += sum(event_lines.mapped('price_tax'))
-            amount_total_event += sum(event_lines.mapped('price_total'))
+    def _compute_amount_untaxed(self):
+        """Compute the total amounts of the bookings per kind of line. Saved
+        bookings get their totals from one grouped query per line model,
+        bookings being edited in a form are summed from their lines."""
+        bookings = self.filtered('id')
+        totals = {}
+        for kind, field_name in BOOKING_LINE_FIELDS:
+            if bookings:
+                for booking, *amounts in self.env[
+                    self._fields[field_name].comodel_name]._read_group(
+                        [('booking_id', 'in', bookings.ids)], ['booking_id'],
+                        ['price_subtotal:sum', 'price_tax:sum',
+                         'price_total:sum']):
+                    totals[booking.id, kind] = amounts
+            for booking in self - bookings:
+                lines = booking[field_name]
+                totals[booking.id, kind] = [
+                    sum(lines.mapped('price_subtotal')),
+                    sum(lines.mapped('price_tax')),
+                    sum(lines.mapped('price_total'))]
         for rec in self:
-            rec.amount_untaxed = amount_untaxed_food + amount_untaxed_room + \
-                                 amount_untaxed_fleet + \
-                                 amount_untaxed_event + amount_untaxed_service
-            rec.amount_untaxed_food = amount_untaxed_food
-            rec.amount_untaxed_room = amount_untaxed_room
-            rec.amount_untaxed_fleet = amount_untaxed_fleet
-            rec.amount_untaxed_event = amount_untaxed_event
-            rec.amount_untaxed_service = amount_untaxed_service
-            rec.amount_tax = (amount_taxed_food + amount_taxed_room
-                              + amount_taxed_fleet
-                              + amount_taxed_event + amount_taxed_service)
-            rec.amount_taxed_food = amount_taxed_food
-            rec.amount_taxed_room = amount_taxed_room
-            rec.amount_taxed_fleet = amount_taxed_fleet
-            rec.amount_taxed_event = amount_taxed_event
-            rec.amount_taxed_service = amount_taxed_service
-            rec.amount_total = (amount_total_food + amount_total_room
-                                + amount_total_fleet + amount_total_event
-                                + amount_total_service)
-            rec.amount_total_food = amount_total_food
-            rec.amount_total_room = amount_total_room
-            rec.amount_total_fleet = amount_total_fleet
-            rec.amount_total_event = amount_total_event
-            rec.amount_total_service = amount_total_service
+            amount_untaxed = amount_tax = amount_total = 0.0
+            for kind, _field_name in BOOKING_LINE_FIELDS:
+                untaxed, tax, total = totals.get((rec.id, kind),
+                                                 (0.0, 0.0, 0.0))
+                rec['amount_untaxed_%s' % kind] = untaxed
+                rec['amount_taxed_%s' % kind] = tax
+                rec['amount_total_%s' % kind] = total
+                amount_untaxed += untaxed
+                amount_tax += tax
+                amount_total += total
+            rec.amount_untaxed = amount_untaxed
+            rec.amount_tax = amount_tax
+            rec.amount_total = amount_total
+
+    def _get_invoice_booking_list(self, flag=False, until=None):
+        """Returns the values of the invoice lines to create for the
+        quantities of the booking lines which are not invoiced yet. When
+        until is given, rooms are only charged up to that night included."""
+        self.ensure_one()
+        precision = self.env['decimal.precision'].precision_get(
+            'Product Unit of Measure')
+        booking_list = []
+        for kind, field_name in BOOKING_LINE_FIELDS:
+            for line in self[field_name]:
+                quantity = line.uom_qty
+                if until and kind == 'room':
+                    quantity = min(quantity, max(
+                        (until - line.checkin_date.date()).days + 1, 0))
+                quantity -= line.qty_invoiced
+                if float_is_zero(quantity, precision_digits=precision) or (
+                        until and quantity < 0):
+                    continue
+                booking_list.append(line._prepare_invoice_line(quantity))
+                if flag and kind == 'room':
+                    line.booking_line_visible = True
         return booking_list
 
+    @api.model
+    def _search_read_chunks(self, domain, fields_list, chunk_size=1000):
+        """Yield the search_read results of the bookings matching the domain
+        by chunks of chunk_size bookings, ordered by id. The cache is cleared
+        after each chunk so that the memory used by reports stays bounded
+        whatever the number of bookings."""
+        self.check_access('read')
+        last_id = 0
+        while True:
+            records = self.search_read(domain + [('id', '>', last_id)],
+                                       fields_list, limit=chunk_size,
+                                       order='id')
+            if not records:
+                return
+            yield records
+            last_id = records[-1]['id']
+            self.env.invalidate_all()
+
     @api.onchange('need_food')
     def _onchange_need_food(self):
         """Unlink Food Booking Line if Need Food is false"""
@@ -436,7 +446,7 @@ class RoomBooking(models.Model):
         for record in self:
             # Create a set of unique ids
             ids = set()
-            for line in record.room_line_ids:
+            for line in record.room_line_ids.filtered('room_id'):
                 if line.room_id.id in ids:
                     raise ValidationError(
                         _(
@@ -447,35 +457,89 @@ class RoomBooking(models.Model):
                     )
                 ids.add(line.room_id.id)
 
-    def create_list(self, line_ids):
-        """Returns a Dictionary containing the Booking line Values"""
-        account_move_line = self.env['account.move.line'].search_read(
-            domain=[('ref', '=', self.name),
-                    ('display_type', '!=', 'payment_term')],
-            fields=['name', 'quantity', 'price_unit', 'product_type'], )
-        for rec in account_move_line:
-            del rec['id']
-        booking_dict = {}
-        for line in line_ids:
-            name = ""
-            product_type = ""
-            if line_ids._name == 'food.booking.line':
-                name = line.food_id.name
-                product_type = 'food'
-            elif line_ids._name == 'fleet.booking.line':
-                name = line.fleet_id.name
-                product_type = 'fleet'
-            elif line_ids._name == 'service.booking.line':
-                name = line.service_id.name
-                product_type = 'service'
-            elif line_ids._name == 'event.booking.line':
-                name = line.event_id.name
-                product_type = 'event'
-            booking_dict = {'name': name,
-                            'quantity': line.uom_qty,
-                            'price_unit': line.price_unit,
-                            'product_type': product_type}
-        return booking_dict
+    @api.model
+    def create_block(self, partner_id, room_ids, checkin_date, checkout_date,
+                     reserve=True, booking_vals=None):
+        """Create a booking holding all the given rooms for the same stay,
+        e.g. for a conference block. The availability of the whole block is
+        checked with one query on the stay range index, the lines are
+        created together and the room statuses are updated in one go.
+        ----------------------------------------
+        @param partner_id: customer of the booking
+        @param room_ids: ids of the rooms of the block
+        @param checkin_date: check-in date of the stay
+        @param checkout_date: check-out date of the stay
+        @param reserve: reserve the rooms, otherwise the booking stays draft
+        @param booking_vals: additional values of the booking
+        @return: the created room.booking"""
+        checkin_date = fields.Datetime.to_datetime(checkin_date)
+        checkout_date = fields.Datetime.to_datetime(checkout_date)
+        room_ids = list(dict.fromkeys(room_ids))
+        if not room_ids:
+            raise ValidationError(_("Please Enter Room Details"))
+        if checkout_date < checkin_date:
+            raise ValidationError(
+                _("Checkout must be greater or equal checkin date"))
+        if reserve:
+            # Serialize the blocks and bookings on the same rooms until the
+            # end of the transaction.
+            self.env.cr.execute(SQL("""
+                SELECT id FROM hotel_room WHERE id = ANY(%s)
+                 ORDER BY id FOR NO KEY UPDATE
+            """, room_ids))
+            conflicts = self.env['hotel.room']._find_conflicts(
+                [(room_id, checkin_date, checkout_date)
+                 for room_id in room_ids])
+            if conflicts:
+                raise ValidationError(
+                    _("The rooms %(rooms)s are not available for the "
+                      "whole stay.",
+                      rooms=", ".join(conflicts.room_id.mapped('name'))))
+            self.env['hotel.room.block']._raise_if_blocked(
+                [(room_id, checkin_date, checkout_date)
+                 for room_id in room_ids])
+        duration = checkout_date - checkin_date
+        nights = duration.days + (1 if duration.total_seconds() > 0 else 0)
+        booking = self.create(
+            dict(booking_vals or {}, partner_id=partner_id,
+                 checkin_date=checkin_date, checkout_date=checkout_date,
+                 room_line_ids=[Command.create({
+                     'room_id': room_id,
+                     'checkin_date': checkin_date,
+                     'checkout_date': checkout_date,
+                     'uom_qty': nights,
+                 }) for room_id in room_ids]))
+        if reserve:
+            booking.room_line_ids._check_room_type_capacity()
+            booking.write({'state': 'reserved'})
+            booking.room_line_ids.room_id._recompute_status()
+        return booking.with_env(self.env)
+
+    def action_assign_rooms(self):
+        """Button assigning a room to the lines booked by room type"""
+        assignments, unassigned = self.room_line_ids._assign_rooms()
+        if unassigned:
+            return {
+                'type': 'ir.actions.client',
+                'tag': 'display_notification',
+                'params': {
+                    'type': 'warning',
+                    'message': _("No room is free for %(count)s line(s) of "
+                                 "type %(types)s.", count=len(unassigned),
+                                 types=", ".join(set(
+                                     unassigned.mapped('room_type')))),
+                    'next': {'type': 'ir.actions.act_window_close'},
+                }
+            }
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'type': 'success',
+                'message': _("%s room(s) assigned.", len(assignments)),
+                'next': {'type': 'ir.actions.act_window_close'},
+            }
+        }
 
     def action_reserve(self):
         """Button Reserve Function"""
@@ -491,12 +555,10 @@ class RoomBooking(models.Model):
                 }
             }
         if self.room_line_ids:
-            for room in self.room_line_ids:
-                room.room_id.write({
-                    'status': 'reserved',
-                })
-                room.room_id.is_room_avail = False
+            self.room_line_ids._check_room_availability()
+            self.room_line_ids._check_room_type_capacity()
             self.write({"state": "reserved"})
+            self.room_line_ids.room_id._recompute_status()
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
@@ -512,13 +574,8 @@ class RoomBooking(models.Model):
         """
         @param self: object pointer
         """
-        if self.room_line_ids:
-            for room in self.room_line_ids:
-                room.room_id.write({
-                    'status': 'available',
-                })
-                room.room_id.is_room_avail = True
         self.write({"state": "cancel"})
+        self.room_line_ids.room_id._recompute_status()
 
     def action_maintenance_request(self):
         """
@@ -570,37 +627,25 @@ class RoomBooking(models.Model):
 
     def action_checkout(self):
         """Button action_heck_out function"""
+        self._check_out(datetime.today())
+
+    def _check_out(self, checkout_date=None):
+        """Check the bookings out, the room lines leaving at checkout_date
+        or, when not given, at their planned check-out"""
         self.write({"state": "check_out"})
-        for room in self.room_line_ids:
-            room.room_id.write({
-                'status': 'available',
-                'is_room_avail': True
-            })
-            room.write({'checkout_date': datetime.today()})
+        if checkout_date:
+            self.room_line_ids.write({'checkout_date': checkout_date})
+        self.room_line_ids.room_id._recompute_status()
+        # The housekeeping is dispatched on behalf of the front desk
+        self.env['cleaning.request'].sudo()._dispatch_rooms(
+            self.room_line_ids.room_id, 'checkout')
 
     def action_invoice(self):
         """Method for creating invoice"""
         if not self.room_line_ids:
             raise ValidationError(_("Please Enter Room Details"))
-        booking_list = self._compute_amount_untaxed(True)
-        if booking_list:
-            account_move = self.env["account.move"].create([{
-                'move_type': 'out_invoice',
-                'invoice_date': fields.Date.today(),
-                'partner_id': self.partner_id.id,
-                'ref': self.name,
-            }])
-            for rec in booking_list:
-                account_move.invoice_line_ids.create([{
-                    'name': rec['name'],
-                    'quantity': rec['quantity'],
-                    'price_unit': rec['price_unit'],
-                    'move_id': account_move.id,
-                    'price_subtotal': rec['quantity'] * rec['price_unit'],
-                    'product_type': rec['product_type'],
-                }])
-            self.write({'invoice_status': "invoiced"})
-            self.invoice_button_visible = True
+        account_move = self._create_invoices()
+        if account_move:
             return {
                 'type': 'ir.actions.act_window',
                 'name': 'Invoices',
@@ -612,6 +657,70 @@ class RoomBooking(models.Model):
                 'context': "{'create': False}"
             }
 
+    def _create_invoices(self, until=None):
+        """Create one invoice per booking for the quantities not invoiced
+        yet, all the invoices and their lines being created at once.
+        ----------------------------------------
+        @param until: only charge the rooms up to this night included
+        @return: the created account.move records"""
+        invoice_vals_list = []
+        for booking in self:
+            booking_list = booking._get_invoice_booking_list(True, until)
+            if not booking_list:
+                continue
+            invoice_vals_list.append({
+                'move_type': 'out_invoice',
+                'invoice_date': fields.Date.today(),
+                'partner_id': booking.partner_id.id,
+                'ref': booking.name,
+                'booking_id': booking.id,
+                'invoice_line_ids': [Command.create(vals)
+                                     for vals in booking_list],
+            })
+        account_moves = self.env['account.move'].create(invoice_vals_list)
+        bookings = account_moves.booking_id
+        invoiced = bookings.filtered(lambda b: b._is_fully_invoiced())
+        invoiced.write({'invoice_status': 'invoiced'})
+        (bookings - invoiced).write({'invoice_status': 'to_invoice'})
+        bookings.write({'invoice_button_visible': True})
+        return account_moves
+
+    def _is_fully_invoiced(self):
+        """Returns whether the whole quantity of every booking line has
+        been invoiced"""
+        self.ensure_one()
+        precision = self.env['decimal.precision'].precision_get(
+            'Product Unit of Measure')
+        return all(
+            float_compare(line.qty_invoiced, line.uom_qty,
+                          precision_digits=precision) >= 0
+            for _kind, field_name in BOOKING_LINE_FIELDS
+            for line in self[field_name])
+
+    def _post_room_charges(self, until):
+        """Charge the quantities not invoiced yet up to the given night on
+        the draft invoice of each booking, the invoices missing being
+        created. Used by the night audit to process many bookings at once.
+        ----------------------------------------
+        @return: the draft invoices of the bookings"""
+        drafts = {move.booking_id.id: move
+                  for move in self.env['account.move'].search([
+                      ('booking_id', 'in', self.ids),
+                      ('move_type', '=', 'out_invoice'),
+                      ('state', '=', 'draft')])}
+        line_vals_list = []
+        to_invoice = self.browse()
+        for booking in self:
+            if booking.id not in drafts:
+                to_invoice |= booking
+                continue
+            line_vals_list += [
+                dict(vals, move_id=drafts[booking.id].id)
+                for vals in booking._get_invoice_booking_list(True, until)]
+        self.env['account.move.line'].create(line_vals_list)
+        return to_invoice._create_invoices(until) | self.env[
+            'account.move'].union(*drafts.values())
+
     def action_view_invoices(self):
         """Method for Returning invoice View"""
         return {
@@ -620,7 +729,7 @@ class RoomBooking(models.Model):
             'view_mode': 'list,form',
             'view_type': 'list,form',
             'res_model': 'account.move',
-            'domain': [('ref', '=', self.name)],
+            'domain': [('booking_id', '=', self.id)],
             'context': "{'create': False}"
         }
 
@@ -630,13 +739,14 @@ class RoomBooking(models.Model):
         """
         if not self.room_line_ids:
             raise ValidationError(_("Please Enter Room Details"))
+        elif self.room_line_ids.filtered(lambda line: not line.room_id):
+            raise ValidationError(
+                _("Please assign a room to every room line before the "
+                  "check-in."))
         else:
-            for room in self.room_line_ids:
-                room.room_id.write({
-                    'status': 'occupied',
-                })
-                room.room_id.is_room_avail = False
+            self.room_line_ids._check_room_availability()
             self.write({"state": "check_in"})
+            self.room_line_ids.room_id._recompute_status()
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
@@ -647,78 +757,87 @@ class RoomBooking(models.Model):
                 }
             }
 
-    def get_details(self):
-        """ Returns different counts for displaying in dashboard"""
-        today = datetime.today()
-        tz_name = self.env.user.tz
-        today_utc = pytz.timezone('UTC').localize(today,
-                                                  is_dst=False)
-        context_today = today_utc.astimezone(pytz.timezone(tz_name))
+    def get_details(self, since=None):
+        """ Returns different counts for displaying in dashboard, served from
+        a short-lived snapshot shared by the users of the company.
+
+        ``since`` is the timestamp sent with a refresh signal, snapshots
+        computed by a transaction started before it are recomputed."""
+        if not self.env.user.has_group(
+                'hotel_management_odoo.hotel_group_reception'):
+            raise AccessError(_("Only hotel users can see the dashboard."))
+        company = self.env.company
+        key = (self.env.cr.dbname, company.id)
+        snapshot = DASHBOARD_CACHE.get(key)
+        if snapshot and snapshot[0] > time.monotonic() and (
+                not since or snapshot[1] >= fields.Datetime.to_datetime(
+                    since)):
+            return dict(snapshot[2])
+        details = self.sudo().with_company(company).with_context(
+            tz=company.partner_id.tz or 'UTC')._get_dashboard_details()
+        DASHBOARD_CACHE[key] = (time.monotonic() + DASHBOARD_CACHE_TTL,
+                                self.env.cr.now(), details)
+        return dict(details)
+
+    @api.model
+    def _get_dashboard_details(self):
+        """Compute the dashboard counts of the current company, each of them
+        being a single aggregate query"""
+        company = self.env.company
+        tz = pytz.timezone(self.env.context.get('tz') or 'UTC')
+        today = fields.Date.context_today(self)
+        day_start = tz.localize(datetime.combine(
+            today, datetime.min.time())).astimezone(pytz.utc).replace(
+            tzinfo=None)
+        day_end = day_start + timedelta(days=1)
+        booking_domain = [('company_id', '=', company.id)]
         total_room = self.env['hotel.room'].search_count([])
-        check_in = self.env['room.booking'].search_count(
-            [('state', '=', 'check_in')])
-        available_room = self.env['hotel.room'].search(
+        available_room = self.env['hotel.room'].search_count(
             [('status', '=', 'available')])
-        reservation = self.env['room.booking'].search_count(
-            [('state', '=', 'reserved')])
-        check_outs = self.env['room.booking'].search([])
-        check_out = 0
-        staff = 0
-        for rec in check_outs:
-            for room in rec.room_line_ids:
-                if room.checkout_date.date() == context_today.date():
-                    check_out += 1
-            """staff"""
-            staff = self.env['res.users'].search_count(
-                [('groups_id', 'in',
-                  [self.env.ref('hotel_management_odoo.hotel_group_admin').id,
-                   self.env.ref(
-                       'hotel_management_odoo.cleaning_team_group_head').id,
-                   self.env.ref(
-                       'hotel_management_odoo.cleaning_team_group_user').id,
-                   self.env.ref(
-                       'hotel_management_odoo.hotel_group_reception').id,
-                   self.env.ref(
-                       'hotel_management_odoo.maintenance_team_group_leader').id,
-                   self.env.ref(
-                       'hotel_management_odoo.maintenance_team_group_user').id
-                   ])])
+        check_in = self.search_count(
+            booking_domain + [('state', '=', 'check_in')])
+        reservation = self.search_count(
+            booking_domain + [('state', '=', 'reserved')])
+        check_out = self.env['room.booking.line'].search_count([
+            ('booking_id.company_id', '=', company.id),
+            ('checkout_date', '>=', day_start),
+            ('checkout_date', '<', day_end),
+        ])
+        """staff"""
+        staff = self.env['res.users'].search_count(
+            [('groups_id', 'in',
+              [self.env.ref('hotel_management_odoo.hotel_group_admin').id,
+               self.env.ref(
+                   'hotel_management_odoo.cleaning_team_group_head').id,
+               self.env.ref(
+                   'hotel_management_odoo.cleaning_team_group_user').id,
+               self.env.ref(
+                   'hotel_management_odoo.hotel_group_reception').id,
+               self.env.ref(
+                   'hotel_management_odoo.maintenance_team_group_leader').id,
+               self.env.ref(
+                   'hotel_management_odoo.maintenance_team_group_user').id
+               ])])
         total_vehicle = self.env['fleet.vehicle.model'].search_count([])
         available_vehicle = total_vehicle - self.env[
             'fleet.booking.line'].search_count(
-            [('state', '=', 'check_in')])
-        total_event = self.env['event.event'].search_count([])
-        pending_event = self.env['event.event'].search([])
-        pending_events = 0
-        today_events = 0
-        for pending in pending_event:
-            if pending.date_end >= fields.datetime.now():
-                pending_events += 1
-            if pending.date_end.date() == fields.date.today():
-                today_events += 1
+            [('booking_id.state', '=', 'check_in')])
+        events = self.env['event.event']
+        total_event = events.search_count([])
+        pending_events = events.search_count(
+            [('date_end', '>=', fields.Datetime.now())])
+        today_events = events.search_count([('date_end', '>=', day_start),
+                                            ('date_end', '<', day_end)])
         food_items = self.env['lunch.product'].search_count([])
-        food_order = len(self.env['food.booking.line'].search([]).filtered(
-            lambda r: r.booking_id.state not in ['check_out', 'cancel',
-                                                 'done']))
+        food_order = self.env['food.booking.line'].search_count(
+            self.env['food.booking.line']._get_active_domain())
         """total Revenue"""
-        total_revenue = 0
-        today_revenue = 0
-        pending_payment = 0
-        for rec in self.env['account.move'].search(
-                [('payment_state', '=', 'paid')]):
-            if rec.ref:
-                if 'BOOKING' in rec.ref:
-                    total_revenue += rec.amount_total
-                    if rec.date == fields.date.today():
-                        today_revenue += rec.amount_total
-        for rec in self.env['account.move'].search(
-                [('payment_state', '=', 'not_paid')]):
-            if rec.ref:
-                if 'BOOKING' in rec.ref:
-                    pending_payment += rec.amount_total
+        revenue = self.env['hotel.revenue.daily']
+        total_revenue, pending_payment = revenue._get_revenue(company)
+        today_revenue, _pending = revenue._get_revenue(company, today)
         return {
             'total_room': total_room,
-            'available_room': len(available_room),
+            'available_room': available_room,
             'staff': staff,
             'check_in': check_in,
             'reservation': reservation,
@@ -733,6 +852,37 @@ class RoomBooking(models.Model):
             'total_revenue': round(total_revenue, 2),
             'today_revenue': round(today_revenue, 2),
             'pending_payment': round(pending_payment, 2),
-            'currency_symbol': self.env.user.company_id.currency_id.symbol,
-            'currency_position': self.env.user.company_id.currency_id.position
-        }
\ No newline at end of file
+            'currency_symbol': company.currency_id.symbol,
+            'currency_position': company.currency_id.position,
+            'company_id': company.id,
+        }
+
+    @api.model
+    def _invalidate_dashboard(self, companies):
+        """Drop the dashboard snapshots of the given companies and tell the
+        open dashboards to refresh once the transaction is committed"""
+        company_ids = self.env.cr.postcommit.data.setdefault(
+            'hotel_dashboard.company_ids', set())
+        if not company_ids:
+            self.env.cr.postcommit.add(self._signal_dashboard_refresh)
+        company_ids.update(companies.ids)
+        for company_id in companies.ids:
+            DASHBOARD_CACHE.pop((self.env.cr.dbname, company_id), None)
+
+    @api.model
+    def _signal_dashboard_refresh(self):
+        """Send a refresh signal to the hotel users of the changed companies,
+        the counts themselves are fetched back through get_details"""
+        company_ids = self.env.cr.postcommit.data.pop(
+            'hotel_dashboard.company_ids', set())
+        for company_id in company_ids:
+            DASHBOARD_CACHE.pop((self.env.cr.dbname, company_id), None)
+        with self.env.registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            group = env.ref('hotel_management_odoo.hotel_group_reception')
+            since = fields.Datetime.to_string(cr.now())
+            for company_id in company_ids:
+                env['bus.bus']._sendone(group, 'hotel_dashboard/refresh', {
+                    'company_id': company_id,
+                    'since': since,
+                })
@@ -19,13 +19,25 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 ###############################################################################
+from datetime import date, timedelta
 from odoo import api, fields, models, tools, _
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+from ..tools.room_assignment import assign_rooms
+from .hotel_room_block import BLOCK_RANGE
+
+# Stay range of a booking line as indexed by ``room_booking_line_stay_idx``.
+# Availability queries must use this exact expression for PostgreSQL to pick
+# the GiST index; GREATEST() keeps the range valid for early check-outs.
+STAY_RANGE = ("tsrange({alias}checkin_date, GREATEST({alias}checkin_date, "
+              "{alias}checkout_date), '[]')")
 
 
 class RoomBookingLine(models.Model):
     """Model that handles the room booking form"""
     _name = "room.booking.line"
+    _inherit = ["hotel.booking.line.mixin"]
     _description = "Hotel Folio Line"
     _rec_name = 'room_id'
 
@@ -45,8 +57,17 @@ class RoomBookingLine(models.Model):
                                          " Otherwise sets to current Date",
                                     required=True)
     room_id = fields.Many2one('hotel.room', string="Room",
-                              help="Indicates the Room",
-                              required=True)
+                              help="Indicates the Room, can be assigned "
+                                   "later when the room type is given",
+                              index=True)
+    room_type = fields.Selection([('single', 'Single'),
+                                  ('double', 'Double'),
+                                  ('dormitory', 'Dormitory')],
+                                 string="Room Type",
+                                 compute='_compute_room_type', store=True,
+                                 readonly=False, precompute=True,
+                                 help="Type of the booked room, used to "
+                                      "assign a room automatically")
     uom_qty = fields.Float(string="Duration",
                            help="The quantity converted into the UoM used by "
                                 "the product", readonly=True)
@@ -55,9 +76,11 @@ class RoomBookingLine(models.Model):
                              string="Unit of Measure",
                              help="This will set the unit of measure used",
                              readonly=True)
-    price_unit = fields.Float(related='room_id.list_price', string='Rent',
-                              digits='Product Price',
-                              help="The rent price of the selected room.")
+    price_unit = fields.Float(string='Rent', digits='Product Price',
+                              compute='_compute_price_unit', store=True,
+                              readonly=False,
+                              help="Average nightly rent of the stay, from "
+                                   "the rate plans or the rent of the room")
     tax_ids = fields.Many2many('account.tax',
                                'hotel_room_order_line_taxes_rel',
                                'room_id', 'tax_id',
@@ -84,6 +107,7 @@ class RoomBookingLine(models.Model):
                              string="Order Status",
                              help=" Status of the Order",
                              copy=False)
+    invoice_line_ids = fields.One2many(inverse_name='room_booking_line_id')
     booking_line_visible = fields.Boolean(default=False,
                                           string="Booking Line Visible",
                                           help="If True, then Booking Line "
@@ -105,20 +129,55 @@ class RoomBookingLine(models.Model):
                 qty = qty + 1
             self.uom_qty = qty
 
+    @api.depends('room_id')
+    def _compute_room_type(self):
+        """The room type is the one of the assigned room"""
+        for line in self:
+            line.room_type = line.room_id.room_type or line.room_type
+
+    @api.constrains('room_id', 'room_type')
+    def _check_room_or_room_type(self):
+        """A line books either a room or a room type"""
+        for line in self:
+            if not line.room_id and not line.room_type:
+                raise ValidationError(
+                    _("Please choose a room or a room type."))
+
+    @api.depends('room_id', 'room_type', 'checkin_date', 'uom_qty',
+                 'booking_id.company_id')
+    def _compute_price_unit(self):
+        """Price the nights of the stays from the rate calendar, all lines
+        being looked up together. Lines booked by room type are priced as
+        the cheapest room of the type."""
+        cheapest = self.env['hotel.room']._get_cheapest_rooms(
+            self.filtered(lambda line: not line.room_id).mapped('room_type'))
+        lines = self.filtered(
+            lambda line: (line.room_id or line.room_type in cheapest)
+            and line.checkin_date)
+        prices = self.env['hotel.rate.calendar']._get_stay_prices([
+            (line.room_id or cheapest[line.room_type],
+             line.checkin_date.date(), max(int(line.uom_qty), 1),
+             line.booking_id.company_id or self.env.company)
+            for line in lines])
+        for line, nightly_prices in zip(lines, prices):
+            line.price_unit = sum(nightly_prices) / len(nightly_prices)
+        for line in self - lines:
+            line.price_unit = (line.room_id or cheapest.get(
+                line.room_type, line.room_id)).list_price
+
     @api.depends('uom_qty', 'price_unit', 'tax_ids','currency_id')
     def _compute_price_subtotal(self):
         """Compute the amounts of the room booking line."""
-        for line in self:
-            base_line = line._prepare_base_line_for_taxes_computation()
-            self.env['account.tax']._add_tax_details_in_base_line(base_line, self.env.company)
-            line.price_subtotal = base_line['tax_details']['raw_total_excluded_currency']
-            line.price_total = base_line['tax_details']['raw_total_included_currency']
-            line.price_tax = line.price_total - line.price_subtotal
-            if self.env.context.get('import_file',
-                                    False) and not self.env.user. \
-                    user_has_groups('account.group_account_manager'):
-                line.tax_id.invalidate_recordset(
-                    ['invoice_repartition_line_ids'])
+        self._compute_tax_amounts()
+
+    def _prepare_invoice_line(self, quantity):
+        """Invoice the room, or its room type while no room is assigned"""
+        return dict(
+            super()._prepare_invoice_line(quantity),
+            name=self.room_id.name or dict(
+                self._fields['room_type']._description_selection(self.env)
+            ).get(self.room_type),
+            product_type='room')
 
     def _prepare_base_line_for_taxes_computation(self):
         """ Convert the current record to a dictionary in order to use the generic taxes computation method
@@ -140,113 +199,218 @@ class RoomBookingLine(models.Model):
             },
         )
 
+    def init(self):
+        """Index the stay range of the lines so that overlap lookups done by
+        hotel.room.find_conflicts do not scan the whole table."""
+        create_index(self.env.cr, 'room_booking_line_stay_idx', self._table,
+                     [STAY_RANGE.format(alias='')], method='gist')
+
     @api.onchange('checkin_date', 'checkout_date', 'room_id')
     def onchange_checkin_date(self):
         """On change of check-in date, check-out date, or room ID,
            this method validates if the selected room is available
-           for the given dates. It searches for existing bookings
-           in the 'reserved' or 'check_in' state and checks for date
-           conflicts. If a conflict is found, a ValidationError is raised."""
-        records = self.env['room.booking'].search(
-            [('state', 'in', ['reserved', 'check_in'])])
-        for rec in records:
-            rec_room_id = rec.room_line_ids.room_id
-            rec_checkin_date = rec.room_line_ids.checkin_date
-            rec_checkout_date = rec.room_line_ids.checkout_date
-            if rec_room_id and rec_checkin_date and rec_checkout_date:
-                # Check for conflicts with existing room lines
-                for line in self:
-                    if line.id != rec.id and line.room_id == rec_room_id:
-                        # Check if the dates overlap
-                        if (rec_checkin_date <= line.checkin_date <= rec_checkout_date or
-                                rec_checkin_date <= line.checkout_date <= rec_checkout_date):
-                            raise ValidationError(
-                                _("Sorry, You cannot create a reservation for "
-                                  "this date since it overlaps with another "
-                                  "reservation..!!"))
-                        if rec_checkout_date <= line.checkout_date and rec_checkin_date >= line.checkin_date:
-                            raise ValidationError(
-                                "Sorry You cannot create a reservation for this"
-                                "date due to an existing reservation between "
-                                "this date")
-                            
-    def _get_target_status_from_booking_state(self):
-        """Return the desired room status and availability based on the
-        parent booking's state.
-
-
-        - reserved -> ("reserved", False)
-        - check_in -> ("occupied", False)
-        - otherwise -> (None, None)
-        """
-        self.ensure_one()
-        state = self.booking_id.state
-        if state == 'reserved':
-            return 'reserved', False
-        if state == 'check_in':
-            return 'occupied', False
-        return None, None
-
-
-    def _recompute_room_status(self, room):
-        """Recompute and set the status for the given room considering all
-        active bookings (reserved/check_in) that reference it.
+           for the given dates against the reserved and checked-in
+           bookings. If a conflict is found, a ValidationError is raised."""
+        for line in self:
+            if not (line.room_id and line.checkin_date and line.checkout_date):
+                continue
+            conflicts = self.env['hotel.room'].find_conflicts(
+                line.room_id.ids, line.checkin_date, line.checkout_date,
+                exclude_line_ids=line._origin.ids)
+            if conflicts:
+                raise ValidationError(
+                    _("Sorry, You cannot create a reservation for "
+                      "this date since it overlaps with another "
+                      "reservation..!!"))
+            self.env['hotel.room.block']._raise_if_blocked(
+                [(line.room_id.id, line.checkin_date, line.checkout_date)])
 
+    @api.constrains('room_id', 'checkin_date', 'checkout_date')
+    def _check_room_availability(self):
+        """Make sure none of the lines overlaps a reserved or checked-in
+        booking of the same room, using one query for the whole recordset,
+        nor an out of order period of the room for the stays to come.
+        Only the stays still held are checked, a late check-out must not
+        be refused because the next guest already arrived."""
+        lines = self.filtered(lambda l: l.room_id and l.checkin_date
+                              and l.checkout_date and l.booking_id.state in
+                              (False, 'draft', 'reserved', 'check_in'))
+        conflicts = self.env['hotel.room']._find_conflicts(
+            [(line.room_id.id, line.checkin_date, line.checkout_date)
+             for line in lines], exclude_line_ids=self.ids)
+        if conflicts:
+            raise ValidationError(
+                _("Sorry, You cannot create a reservation for %(room)s "
+                  "since it overlaps with the reservation %(booking)s.",
+                  room=conflicts[0].room_id.name,
+                  booking=conflicts[0].booking_id.name))
+        # Rooms put out of order during a stay don't prevent its changes,
+        # only the stays still to come are checked.
+        self.env['hotel.room.block']._raise_if_blocked([
+            (line.room_id.id, line.checkin_date, line.checkout_date)
+            for line in lines if line.booking_id.state in
+            (False, 'draft', 'reserved')])
 
-        Priority: check_in -> occupied; reserved -> reserved; none -> available
-        """
-        if not room:
+    def _check_room_type_capacity(self):
+        """Make sure a room of the type of the lines is left on every night
+        of their stays, counting the stays of the reserved and checked-in
+        bookings booked by room type or by room and the out of order
+        rooms. Lines of bookings already reserved are counted as booked."""
+        nights = {}
+        for line in self.filtered(
+                lambda l: l.room_type and l.checkin_date and l.checkout_date
+                and l.booking_id.state not in ('reserved', 'check_in')):
+            night = line.checkin_date.date()
+            last_night = max(line.checkout_date.date() - timedelta(days=1),
+                             night)
+            while night <= last_night:
+                cell = (line.room_type, night)
+                nights[cell] = nights.get(cell, 0) + 1
+                night += timedelta(days=1)
+        if not nights:
             return
-        lines = self.env['room.booking.line'].search([
-            ('room_id', '=', room.id),
-            ('booking_id.state', 'in', ['reserved', 'check_in']),
-        ])
-        if lines.filtered(lambda l: l.booking_id.state == 'check_in'):
-            room.write({'status': 'occupied', 'is_room_avail': False})
-        elif lines:
-            room.write({'status': 'reserved', 'is_room_avail': False})
-        else:
-            room.write({'status': 'available', 'is_room_avail': True})
-
+        availability = self.env['hotel.ari.change']._get_availability(
+            list(nights))
+        room_types = dict(
+            self._fields['room_type']._description_selection(self.env))
+        for (room_type, night), count in sorted(nights.items()):
+            if availability.get((room_type, night), 0) < count:
+                raise ValidationError(
+                    _("No %(room_type)s room is left on %(night)s.",
+                      room_type=room_types.get(room_type, room_type),
+                      night=night))
 
     @api.model
-    def create(self, vals):
-        """Synchronize room status when adding a line to an already
-        reserved or checked-in booking."""
-        record = super().create(vals)
-        status, is_room_avail = record._get_target_status_from_booking_state()
-        if status and record.room_id:
-            record.room_id.write({'status': status, 'is_room_avail': is_room_avail})
-        return record
+    def assign_pending_rooms(self, apply=False):
+        """Assign a room to the lines booked by room type of the draft and
+        reserved bookings
+        ----------------------------------------
+        @param apply: write the rooms on the lines, otherwise only propose
+        @return: dict with the proposed assignments, as a list of dicts with
+                 the line and room ids, and the ids of the lines for which no
+                 room is free"""
+        lines = self.search([('room_id', '=', False),
+                             ('room_type', '!=', False),
+                             ('booking_id.state', 'in',
+                              ['draft', 'reserved'])])
+        assignments, unassigned = lines._assign_rooms(apply=apply)
+        return {
+            'assignments': [{'line_id': line_id, 'room_id': room_id}
+                            for line_id, room_id in assignments.items()],
+            'unassigned_line_ids': unassigned.ids,
+        }
+
+    def _assign_rooms(self, apply=True):
+        """Assign rooms to the lines without room with the best-fit engine
+        of tools/room_assignment.py, the existing reserved and checked-in
+        stays of the rooms being loaded with one query.
+        ----------------------------------------
+        @param apply: write the rooms on the lines, otherwise only propose
+        @return: dict mapping the line ids to their room id and the lines
+                 which could not be assigned"""
+        lines = self.filtered(lambda line: not line.room_id and
+                              line.room_type and line.checkin_date and
+                              line.checkout_date)
+        if not lines:
+            return {}, self.browse()
+        stays = {}
+        for line in lines:
+            start = line.checkin_date.date().toordinal()
+            stays[line.id] = (
+                start, max(line.checkout_date.date().toordinal(), start + 1))
+        rooms = self.env['hotel.room'].search_read(
+            [('room_type', 'in', list(set(lines.mapped('room_type'))))],
+            ['room_type'])
+        self.flush_model(['room_id', 'checkin_date', 'checkout_date',
+                          'booking_id'])
+        self.env['room.booking'].flush_model(['state'])
+        self.env['hotel.room.block'].flush_model(
+            ['room_id', 'date_from', 'date_to'])
+        # Out of order periods hold the rooms like stays, the open ones
+        # until the end of the assigned stays.
+        date_from = date.fromordinal(
+            min(start for start, _end in stays.values()))
+        date_to = date.fromordinal(max(end for _start, end in stays.values()))
+        self.env.cr.execute(SQL("""
+            SELECT line.room_id, line.checkin_date::date,
+                   GREATEST(line.checkout_date::date,
+                            line.checkin_date::date + 1)
+              FROM room_booking_line line
+              JOIN room_booking booking ON booking.id = line.booking_id
+             WHERE booking.state IN ('reserved', 'check_in')
+               AND line.room_id = ANY(%(room_ids)s)
+               AND %(stay)s && tsrange(%(date_from)s, %(date_to)s, '[]')
+             UNION ALL
+            SELECT block.room_id, block.date_from::date,
+                   COALESCE(block.date_to::date, %(date_to)s)
+              FROM hotel_room_block block
+             WHERE block.room_id = ANY(%(room_ids)s)
+               AND %(block)s && tsrange(%(date_from)s, %(date_to)s, '[]')
+               AND COALESCE(block.date_to::date, %(date_to)s)
+                   > block.date_from::date
+        """, room_ids=[room['id'] for room in rooms],
+            stay=SQL(STAY_RANGE.format(alias='line.')),
+            block=SQL(BLOCK_RANGE.format(alias='block.')),
+            date_from=date_from, date_to=date_to))
+        occupied = [(room_id, checkin.toordinal(), checkout.toordinal())
+                    for room_id, checkin, checkout in self.env.cr.fetchall()]
+        assignments, unassigned = assign_rooms(
+            [(line.id, line.room_type) + stays[line.id] for line in lines],
+            [(room['id'], room['room_type']) for room in rooms], occupied)
+        if apply and assignments:
+            line_ids_by_room = {}
+            for line_id, room_id in assignments.items():
+                line_ids_by_room.setdefault(room_id, []).append(line_id)
+            for room_id, line_ids in line_ids_by_room.items():
+                self.browse(line_ids).write({'room_id': room_id})
+        return assignments, self.browse(unassigned)
 
+    def _get_ari_changes(self, active_only=True):
+        """Returns the availability changes of the nights of the lines for
+        the ARI journal, only for reserved and checked-in bookings unless
+        active_only is False"""
+        return [('availability', line.room_type, line.checkin_date.date(),
+                 max(line.checkout_date.date() - timedelta(days=1),
+                     line.checkin_date.date()))
+                for line in self
+                if line.checkin_date and line.checkout_date and (
+                    not active_only or
+                    line.booking_id.state in ('reserved', 'check_in'))]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Synchronize room status when adding lines to already reserved or
+        checked-in bookings."""
+        records = super().create(vals_list)
+        records.filtered(
+            lambda line: line.booking_id.state in ('reserved', 'check_in')
+        ).room_id._recompute_status()
+        self.env['hotel.room.night']._sync_booking_lines(records.ids)
+        self.env['hotel.ari.change']._log_changes(records._get_ari_changes())
+        return records
 
     def write(self, vals):
         """When room changes, free the previous room and set the new room's
         status based on the parent booking's state."""
-        old_rooms_by_line_id = {}
-        if 'room_id' in vals:
-            for line in self:
-                old_rooms_by_line_id[line.id] = line.room_id
+        old_rooms = self.room_id if 'room_id' in vals else None
+        stay_changed = bool({'room_id', 'room_type', 'checkin_date',
+                             'checkout_date', 'booking_id'} & set(vals))
+        ari_changes = self._get_ari_changes() if stay_changed else []
         result = super().write(vals)
-        if 'room_id' in vals:
-            for line in self:
-                old_room = old_rooms_by_line_id.get(line.id)
-                new_room = line.room_id
-                if old_room and new_room and old_room != new_room:
-                    # Recompute status for old room considering other bookings
-                    line._recompute_room_status(old_room)
-                    # Set status for new room according to this booking's state
-                    status, is_room_avail = line._get_target_status_from_booking_state()
-                    if status:
-                        new_room.write({'status': status, 'is_room_avail': is_room_avail})
+        if old_rooms is not None:
+            (old_rooms | self.room_id)._recompute_status()
+        if stay_changed:
+            self.env['hotel.room.night']._sync_booking_lines(self.ids)
+            self.env['hotel.ari.change']._log_changes(
+                ari_changes + self._get_ari_changes())
         return result
 
-
     def unlink(self):
         """When removing the line, release the room if no other active
         bookings hold it."""
-        rooms = self.mapped('room_id')
+        rooms = self.room_id
+        ari_changes = self._get_ari_changes()
         result = super().unlink()
-        for room in rooms:
-            self._recompute_room_status(room)
+        rooms._recompute_status()
+        self.env['hotel.ari.change']._log_changes(ari_changes)
         return result
\ No newline at end of file
@@ -25,6 +25,7 @@ from odoo import api, fields, models, tools
 class ServiceBookingLine(models.Model):
     """Model that handles the service booking form"""
     _name = "service.booking.line"
+    _inherit = ["hotel.booking.line.mixin"]
     _description = "Hotel service Line"
 
     @tools.ormcache()
@@ -75,6 +76,7 @@ class ServiceBookingLine(models.Model):
                              string="Order Status",
                              help=" Status of the Order",
                              copy=False)
+    invoice_line_ids = fields.One2many(inverse_name='service_booking_line_id')
     booking_line_visible = fields.Boolean(default=False,
                                           string="Booking Line Visible",
                                           help="If true, Booking line will be"
@@ -83,17 +85,12 @@ class ServiceBookingLine(models.Model):
     @api.depends('uom_qty', 'price_unit', 'tax_ids')
     def _compute_price_subtotal(self):
         """Compute the amounts of the room booking line."""
-        for line in self:
-            base_line = line._prepare_base_line_for_taxes_computation()
-            self.env['account.tax']._add_tax_details_in_base_line(base_line, self.env.company)
-            line.price_subtotal = base_line['tax_details']['raw_total_excluded_currency']
-            line.price_total = base_line['tax_details']['raw_total_included_currency']
-            line.price_tax = line.price_total - line.price_subtotal
-            if self.env.context.get('import_file',
-                                    False) and not self.env.user. \
-                    user_has_groups('account.group_account_manager'):
-                line.tax_id.invalidate_recordset(
-                    ['invoice_repartition_line_ids'])
+        self._compute_tax_amounts()
+
+    def _prepare_invoice_line(self, quantity):
+        """Invoice the service of the line"""
+        return dict(super()._prepare_invoice_line(quantity),
+                    name=self.service_id.name, product_type='service')
 
     def _prepare_base_line_for_taxes_computation(self):
         """ Convert the current record to a dictionary in order to use the generic taxes computation method
@@ -1,8 +1,9 @@
 /** @odoo-module */
 import { registry} from '@web/core/registry';
 import { useService } from "@web/core/utils/hooks";
-const { Component, onWillStart, onMounted} = owl
+const { Component, onWillStart, onMounted, onWillUnmount} = owl
 import { rpc } from "@web/core/network/rpc";
+import { user } from "@web/core/user";
 import { Domain } from "@web/core/domain";
 import { _t } from "@web/core/l10n/translation";
 import {serializeDate,serializeDateTime,} from "@web/core/l10n/dates";
@@ -19,6 +20,17 @@ export class CustomDashBoard extends Component {
 setup() {
     this.action = useService("action");
     this.orm = useService("orm");
+    this.busService = this.env.services.bus_service;
+    // The server signals the hotel users whenever bookings, invoices or
+    // events of a company change, so the dashboard does not have to poll.
+    const onDashboardRefresh = async (payload) => {
+        if (payload.company_id === user.activeCompany.id) {
+            await this.fetch_data(payload.since);
+            this.render();
+        }
+    };
+    this.busService.subscribe("hotel_dashboard/refresh", onDashboardRefresh);
+    onWillUnmount(() => this.busService.unsubscribe("hotel_dashboard/refresh", onDashboardRefresh));
     onWillStart(this.onWillStart);
     onMounted(this.onMounted);
 }
@@ -31,44 +43,46 @@ async onMounted() {
 // this.render_top_employees_graph();
 // this.render_filter();
 }
-async fetch_data() {
+async fetch_data(since) {
        var self = this;
        //RPC call for retrieving data for displaying on dashboard tiles
        var def1= await rpc('/web/dataset/call_kw/room.booking/get_details'
        ,{ model:'room.booking',
           method:'get_details',
            args: [{}],
-           kwargs: {},
+           kwargs: since ? {since: since} : {},
        }).then(function(result){
-            document.getElementsByClassName("total_room").innerHTML=['total_room']
-            self.total_room=result['total_room']
-            self.available_room=result['available_room']
-            self.staff=result['staff']
-            self.check_in=result['check_in']
-            self.reservation=result['reservation']
-            self.check_out=result['check_out']
-            self.total_vehicle=result['total_vehicle']
-            self.available_vehicle=result['available_vehicle']
-            self.total_event=result['total_event']
-            self.today_events=result['today_events']
-            self.pending_events=result['pending_events']
-            self.food_items=result['food_items']
-            self.food_order=result['food_order']
-            if(result['currency_position']=='before'){
-                self.total_revenue=result['currency_symbol']+" "+result['total_revenue']
-                self.today_revenue=result['currency_symbol']+" "+result['today_revenue']
-                self.pending_payment=result['currency_symbol']+" "+result['pending_payment']
-            }
-            else{
-                self.total_revenue=+result['total_revenue']+" "+result['currency_symbol']
-                self.today_revenue=result['today_revenue']+" "+result['currency_symbol']
-                self.pending_payment=result['pending_payment']+" "+result['currency_symbol']
-            }
-
+            self.set_details(result)
        });
 
            return def1;
      }
+     set_details(result){
+        var self = this;
+        self.total_room=result['total_room']
+        self.available_room=result['available_room']
+        self.staff=result['staff']
+        self.check_in=result['check_in']
+        self.reservation=result['reservation']
+        self.check_out=result['check_out']
+        self.total_vehicle=result['total_vehicle']
+        self.available_vehicle=result['available_vehicle']
+        self.total_event=result['total_event']
+        self.today_events=result['today_events']
+        self.pending_events=result['pending_events']
+        self.food_items=result['food_items']
+        self.food_order=result['food_order']
+        if(result['currency_position']=='before'){
+            self.total_revenue=result['currency_symbol']+" "+result['total_revenue']
+            self.today_revenue=result['currency_symbol']+" "+result['today_revenue']
+            self.pending_payment=result['currency_symbol']+" "+result['pending_payment']
+        }
+        else{
+            self.total_revenue=+result['total_revenue']+" "+result['currency_symbol']
+            self.today_revenue=result['today_revenue']+" "+result['currency_symbol']
+            self.pending_payment=result['pending_payment']+" "+result['currency_symbol']
+        }
+     }
      total_rooms(e){
         var self = this;
         e.stopPropagation();
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from datetime import datetime
+from odoo import Command
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestEventAvailability(TransactionCase):
+    """Events offered on the event lines of a folio"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'Guest'})
+        cls.event_during = cls.env['event.event'].create({
+            'name': 'Gala Dinner',
+            'date_begin': datetime(2030, 5, 2, 18, 0),
+            'date_end': datetime(2030, 5, 2, 23, 0),
+        })
+        cls.event_overlapping = cls.env['event.event'].create({
+            'name': 'Trade Fair',
+            'date_begin': datetime(2030, 4, 28, 9, 0),
+            'date_end': datetime(2030, 5, 1, 18, 0),
+        })
+        cls.event_after = cls.env['event.event'].create({
+            'name': 'Concert',
+            'date_begin': datetime(2030, 5, 10, 20, 0),
+            'date_end': datetime(2030, 5, 10, 23, 0),
+        })
+        cls.booking = cls.env['room.booking'].create({
+            'partner_id': cls.partner.id,
+            'checkin_date': datetime(2030, 5, 1, 12, 0),
+            'checkout_date': datetime(2030, 5, 4, 11, 0),
+        })
+
+    def test_search_available(self):
+        """Only the events taking place during the window are returned"""
+        events = self.env['event.event'].search_available(
+            datetime(2030, 5, 1, 12, 0), datetime(2030, 5, 4, 11, 0),
+            [('id', 'in', (self.event_during | self.event_overlapping |
+                           self.event_after).ids)])
+        self.assertEqual(events, self.event_during | self.event_overlapping)
+
+    def test_archived_event(self):
+        """Archived events are not offered"""
+        self.event_during.active = False
+        events = self.env['event.event'].search_available(
+            datetime(2030, 5, 1, 12, 0), datetime(2030, 5, 4, 11, 0))
+        self.assertNotIn(self.event_during, events)
+
+    def test_available_event_ids(self):
+        """The event lines offer the events of the stay and keep their own
+        event when the stay moves"""
+        self.booking.write({'event_line_ids': [
+            Command.create({'event_id': self.event_during.id})]})
+        line = self.booking.event_line_ids
+        self.assertIn(self.event_during, line.available_event_ids)
+        self.assertIn(self.event_overlapping, line.available_event_ids)
+        self.assertNotIn(self.event_after, line.available_event_ids)
+        self.booking.write({
+            'checkin_date': datetime(2030, 5, 9, 12, 0),
+            'checkout_date': datetime(2030, 5, 11, 11, 0),
+        })
+        self.assertIn(self.event_after, line.available_event_ids)
+        self.assertIn(self.event_during, line.available_event_ids)
+        self.assertNotIn(self.event_overlapping, line.available_event_ids)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from datetime import timedelta
+from odoo import Command, fields
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestRoomAvailability(TransactionCase):
+    """Overlap checks of the room booking lines"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'Guest'})
+        cls.room = cls.env['hotel.room'].create({
+            'name': 'Room 101',
+            'num_person': 2,
+            'list_price': 100,
+        })
+        cls.now = fields.Datetime.now().replace(microsecond=0)
+
+    def _create_booking(self, checkin_date, checkout_date, state):
+        booking = self.env['room.booking'].create({
+            'partner_id': self.partner.id,
+            'checkin_date': checkin_date,
+            'checkout_date': checkout_date,
+            'room_line_ids': [Command.create({
+                'room_id': self.room.id,
+                'checkin_date': checkin_date,
+                'checkout_date': checkout_date,
+            })],
+        })
+        booking.state = state
+        return booking
+
+    def test_late_checkout_before_same_day_arrival(self):
+        """A guest leaving after the arrival of the next guest of the room
+        can still be checked out"""
+        departing = self._create_booking(
+            self.now - timedelta(days=2), self.now - timedelta(hours=3),
+            'check_in')
+        arriving = self._create_booking(
+            self.now - timedelta(hours=2), self.now + timedelta(days=2),
+            'reserved')
+        departing.action_checkout()
+        self.assertEqual(departing.state, 'check_out')
+        self.assertEqual(arriving.state, 'reserved')
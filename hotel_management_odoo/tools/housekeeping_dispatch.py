@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+"""Dispatch of the housekeeping tasks to the cleaning staff.
+
+This module does not depend on Odoo, floors are given by their level and
+the workload of a member is the sum of the weights of the tasks they hold.
+
+Tasks are taken floor by floor, each one going to the member with the
+lowest cost, the cost being the workload of the member once the task is
+given plus the number of floors they have to walk from their last task,
+weighted by ``floor_weight``. Members without a known position are
+considered on the floor of the task, ties are broken by member order.
+"""
+
+
+def dispatch_tasks(tasks, members, floor_weight=0.5):
+    """Assign the tasks to the members.
+
+    :param tasks: iterable of (key, floor_level, weight)
+    :param members: iterable of (member_id, workload, floor_level), the
+                    floor level being None when unknown
+    :param floor_weight: workload units a member is worth walking one floor
+    :return: dict mapping the keys of the tasks to their member id, empty
+             when there is no member
+    """
+    members = [[member_id, workload, level]
+               for member_id, workload, level in members]
+    assignments = {}
+    if not members:
+        return assignments
+    for key, level, weight in sorted(tasks, key=lambda task: task[1]):
+        best = min(members, key=lambda member: (
+            member[1] + weight + floor_weight * (
+                0 if member[2] is None else abs(member[2] - level))))
+        best[1] += weight
+        best[2] = level
+        assignments[key] = best[0]
+    return assignments
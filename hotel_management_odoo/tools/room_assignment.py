@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+"""Assignment of rooms to reservations made by room type.
+
+This module does not depend on Odoo so that it can be benchmarked on its
+own, see room_assignment_benchmark.py. Days are integers (e.g. date
+ordinals) and stays are half-open intervals [start, end) of nights.
+
+Reservations of a room type are swept by start day, each one being put in
+the room which became free last before its start (best fit), i.e. the room
+leaving the smallest gap, among the rooms not held by an existing stay
+before its end. Rooms which were never used come last, so reservations are
+packed on as few rooms as possible and whole rooms are kept free.
+"""
+from bisect import bisect_right, insort
+from collections import defaultdict
+
+# Free-from day of the rooms holding no stay yet, before any real day.
+NEVER = float('-inf')
+
+
+def assign_rooms(reservations, rooms, occupied=()):
+    """Assign a room to the reservations.
+
+    :param reservations: iterable of (key, room_type, start, end)
+    :param rooms: iterable of (room_id, room_type)
+    :param occupied: iterable of (room_id, start, end) of the stays already
+                     holding a room
+    :return: tuple of a dict mapping the keys of the assigned reservations
+             to their room id and of the list of the keys which could not
+             be assigned
+    """
+    rooms_by_type = defaultdict(list)
+    for room_id, room_type in rooms:
+        rooms_by_type[room_type].append(room_id)
+    fixed = defaultdict(list)
+    for room_id, start, end in occupied:
+        fixed[room_id].append((start, end))
+    pending = defaultdict(list)
+    for key, room_type, start, end in reservations:
+        pending[room_type].append((start, end, key))
+    assignments = {}
+    unassigned = []
+    for room_type, stays in pending.items():
+        type_assignments = _assign_room_type(
+            stays, rooms_by_type.get(room_type, []), fixed)
+        assignments.update(type_assignments)
+        unassigned.extend(key for _start, _end, key in stays
+                          if key not in type_assignments)
+    return assignments, unassigned
+
+
+def _assign_room_type(stays, room_ids, fixed):
+    """Best-fit sweep of the stays of one room type over its rooms"""
+    # Existing stays are swept along the reservations: when reached, they
+    # move the free-from day of their room past their end.
+    events = []
+    for room_id in room_ids:
+        for start, end in fixed.get(room_id, ()):
+            events.append((start, 0, end, room_id))
+    events.extend((start, 1, end, key) for start, end, key in stays)
+    events.sort(key=lambda event: (event[0], event[1], event[0] - event[2]))
+    next_fixed = {room_id: sorted(fixed.get(room_id, ()))
+                  for room_id in room_ids}
+    next_index = dict.fromkeys(room_ids, 0)
+    free_from = dict.fromkeys(room_ids, NEVER)
+    free = sorted((NEVER, room_id) for room_id in room_ids)
+    assignments = {}
+    for start, kind, end, ref in events:
+        if kind == 0:
+            room_id = ref
+            next_index[room_id] += 1
+            if end > free_from[room_id]:
+                _move(free, free_from, room_id, end)
+            continue
+        # Rooms free on the start day, the best fit being the last one.
+        position = bisect_right(free, (start, float('inf')))
+        while position:
+            position -= 1
+            room_id = free[position][1]
+            intervals = next_fixed[room_id]
+            index = next_index[room_id]
+            if index < len(intervals) and intervals[index][0] < end:
+                continue
+            assignments[ref] = room_id
+            _move(free, free_from, room_id, end)
+            break
+    return assignments
+
+
+def _move(free, free_from, room_id, day):
+    """Change the free-from day of a room in the sorted free list"""
+    position = bisect_right(free, (free_from[room_id], room_id)) - 1
+    del free[position]
+    free_from[room_id] = day
+    insort(free, (day, room_id))
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+"""Benchmark of the room assignment engine, run it with
+``python3 hotel_management_odoo/tools/room_assignment_benchmark.py``.
+
+Reservations and existing stays are generated with a fixed seed, assigned,
+then checked for overlaps.
+"""
+import argparse
+import random
+import time
+from collections import defaultdict
+
+try:
+    from .room_assignment import assign_rooms
+except ImportError:
+    from room_assignment import assign_rooms
+
+ROOM_TYPES = ['single', 'double', 'dormitory']
+
+
+def generate(reservation_count, room_count, days, occupied_ratio, seed):
+    """Return rooms, existing stays and reservations"""
+    rng = random.Random(seed)
+    rooms = [(room_id, ROOM_TYPES[room_id % len(ROOM_TYPES)])
+             for room_id in range(room_count)]
+    occupied = []
+    for room_id, _room_type in rooms:
+        day = rng.randrange(7)
+        while day < days:
+            length = rng.randint(1, 7)
+            if rng.random() < occupied_ratio:
+                occupied.append((room_id, day, day + length))
+            day += length + rng.randint(0, 5)
+    reservations = []
+    for key in range(reservation_count):
+        start = rng.randrange(days)
+        reservations.append((key, rng.choice(ROOM_TYPES), start,
+                             start + rng.randint(1, 7)))
+    return rooms, occupied, reservations
+
+
+def check(rooms, occupied, reservations, assignments):
+    """Raise when two stays overlap in the same room"""
+    room_types = dict(rooms)
+    stays = defaultdict(list)
+    for room_id, start, end in occupied:
+        stays[room_id].append((start, end))
+    for key, room_type, start, end in reservations:
+        if key in assignments:
+            room_id = assignments[key]
+            assert room_types[room_id] == room_type, key
+            stays[room_id].append((start, end))
+    for room_id, intervals in stays.items():
+        intervals.sort()
+        for (_start, end), (next_start, _end) in zip(intervals,
+                                                     intervals[1:]):
+            assert end <= next_start, room_id
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--reservations', type=int, default=10000)
+    parser.add_argument('--rooms', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--occupied', type=float, default=0.3,
+                        help="share of the room nights already booked")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    rooms, occupied, reservations = generate(
+        args.reservations, args.rooms, args.days, args.occupied, args.seed)
+    started = time.perf_counter()
+    assignments, unassigned = assign_rooms(reservations, rooms, occupied)
+    duration = time.perf_counter() - started
+    check(rooms, occupied, reservations, assignments)
+    used_rooms = len(set(assignments.values()))
+    print("%d reservations, %d rooms, %d existing stays: %d assigned on "
+          "%d rooms, %d unassigned in %.3fs" % (
+              len(reservations), len(rooms), len(occupied),
+              len(assignments), used_rooms, len(unassigned), duration))
+
+
+if __name__ == '__main__':
+    main()
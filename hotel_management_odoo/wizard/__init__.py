@@ -21,3 +21,5 @@
 ###############################################################################
 from .import room_booking_detail
 from .import sale_order_detail
+from .import hotel_night_audit_wizard
+from .import room_booking_block_wizard
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from datetime import timedelta
+from odoo import fields, models, _
+from odoo.exceptions import ValidationError
+
+
+class HotelNightAuditWizard(models.TransientModel):
+    """Wizard starting the night audit of a business date in the
+    background"""
+    _name = 'hotel.night.audit.wizard'
+    _description = 'Run Night Audit'
+
+    business_date = fields.Date(
+        string="Business Date", required=True,
+        default=lambda self: self.env.company.hotel_business_date or
+        fields.Date.context_today(self) - timedelta(days=1),
+        help="Date of the nights to audit")
+    chunk_size = fields.Integer(string="Chunk Size", default=200,
+                                required=True,
+                                help="Number of bookings processed and "
+                                     "committed at once")
+
+    def action_run_night_audit(self):
+        """Create the audit and let the night audit cron process it"""
+        if self.business_date > fields.Date.context_today(self):
+            raise ValidationError(
+                _("The night audit cannot be run for a future date."))
+        audit = self.env['hotel.night.audit'].create({
+            'business_date': self.business_date,
+            'chunk_size': self.chunk_size,
+        })
+        self.env.ref('hotel_management_odoo.ir_cron_hotel_night_audit'
+                     )._trigger()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': 'Night Audit',
+            'res_model': 'hotel.night.audit',
+            'view_mode': 'form',
+            'res_id': audit.id,
+        }
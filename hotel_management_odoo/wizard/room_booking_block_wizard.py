@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: ADARSH K (odoo@cybrosys.com)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import fields, models, _
+from odoo.exceptions import ValidationError
+
+
+class RoomBookingBlockWizard(models.TransientModel):
+    """Wizard booking a block of rooms for a group"""
+    _name = 'room.booking.block.wizard'
+    _description = 'Group Booking'
+
+    partner_id = fields.Many2one('res.partner', string="Customer",
+                                 required=True,
+                                 help="Customer of the group booking")
+    checkin_date = fields.Datetime(string="Check In", required=True,
+                                   default=fields.Datetime.now,
+                                   help="Check-in date of the group")
+    checkout_date = fields.Datetime(string="Check Out", required=True,
+                                    help="Check-out date of the group")
+    room_type = fields.Selection([('single', 'Single'),
+                                  ('double', 'Double'),
+                                  ('dormitory', 'Dormitory')],
+                                 string="Room Type",
+                                 help="Type of the rooms added by Add "
+                                      "Available Rooms")
+    room_count = fields.Integer(string="Number of Rooms", default=1,
+                                help="Number of rooms added by Add Available "
+                                     "Rooms")
+    room_ids = fields.Many2many('hotel.room', string="Rooms",
+                                help="Rooms of the block")
+    reserve = fields.Boolean(string="Reserve", default=True,
+                             help="Reserve the rooms at once, otherwise the "
+                                  "booking is created as draft")
+
+    def action_add_available_rooms(self):
+        """Add rooms free for the whole stay to the block"""
+        self.ensure_one()
+        if not self.checkout_date:
+            raise ValidationError(_("Please Enter the Check Out date"))
+        rooms = self.env['hotel.room'].search_available(
+            self.checkin_date.date(), self.checkout_date.date(),
+            room_type=self.room_type, horizon=0)
+        room_ids = [room['id'] for room in rooms if room['available'] and
+                    room['id'] not in self.room_ids.ids]
+        self.room_ids = [(4, room_id) for room_id in
+                         room_ids[:self.room_count]]
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'view_mode': 'form',
+            'res_id': self.id,
+            'target': 'new',
+        }
+
+    def action_create_block(self):
+        """Create the group booking and open it"""
+        self.ensure_one()
+        booking = self.env['room.booking'].create_block(
+            self.partner_id.id, self.room_ids.ids, self.checkin_date,
+            self.checkout_date, reserve=self.reserve)
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': 'room.booking',
+            'view_mode': 'form',
+            'res_id': booking.id,
+        }
@@ -19,11 +19,9 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 ###############################################################################
-import io
 import json
-from odoo import fields, models, _
+from odoo import api, fields, models, _
 from odoo.exceptions import ValidationError
-from odoo.tools import json_default
 
 try:
     from odoo.tools.misc import xlsxwriter
@@ -52,66 +50,90 @@ class RoomBookingWizard(models.TransientModel):
         ).report_action(self, data=data)
 
     def action_room_booking_excel(self):
-        """Button action for creating Room Booking Excel report"""
-        data = {
-            "booking": self.generate_data(),
-        }
+        """Button action for creating Room Booking Excel report, only the
+        filter criteria are sent, the rows are read by the server while
+        the file is written."""
         return {
             "type": "ir.actions.report",
             "data": {
                 "model": "room.booking.detail",
-                "options": json.dumps(data, default=json_default),
+                "options": json.dumps(self._get_report_criteria()),
                 "output_format": "xlsx",
                 "report_name": "Excel Report",
             },
             "report_type": "xlsx",
         }
 
-    def generate_data(self):
-        """Generate data to be printed in the report"""
-        domain = []
-        room_list = []
+    def action_enqueue_report(self):
+        """Button action generating the report in the background, the format
+        is given by the report_format key of the context. A report already
+        generated for the same criteria and data is downloaded at once."""
+        job = self.env["hotel.report.job"]._enqueue(
+            "room_booking", self.env.context.get("report_format", "pdf"),
+            self._get_report_criteria())
+        return job.action_open_result()
+
+    def _get_report_criteria(self):
+        """Return the filters of the report as a JSON serializable dict"""
+        self.ensure_one()
         if self.checkin and self.checkout:
             if self.checkin > self.checkout:
                 raise ValidationError(
                     _("Check-in date should be less than Check-out date")
                 )
-        if self.checkin:
-            domain.append(
-                ("checkin_date", ">=", self.checkin),
-            )
-        if self.checkout:
-            domain.append(
-                ("checkout_date", "<=", self.checkout),
-            )
-        room_booking = self.env["room.booking"].search_read(
-            domain=domain,
-            fields=["partner_id", "name", "checkin_date", "checkout_date"],
-        )
-        for rec in room_booking:
-            rooms = (
-                self.env["room.booking"]
-                .browse(rec["id"])
-                .room_line_ids.room_id.mapped("name")
-            )
-            rec["partner_id"] = rec["partner_id"][1]
-            for room in rooms:
-                if self.room_id:
-                    if self.room_id.name == room:
-                        rec_copy = rec.copy()
-                        rec_copy["room"] = room  # Ensure this key is added
-                        room_list.append(rec_copy)
-                else:
-                    rec_copy = rec.copy()
-                    rec_copy["room"] = room  # Ensure this key is added
-                    room_list.append(rec_copy)
+        return {
+            "checkin": fields.Date.to_string(self.checkin),
+            "checkout": fields.Date.to_string(self.checkout),
+            "room_id": self.room_id.id,
+        }
+
+    def generate_data(self):
+        """Generate data to be printed in the report"""
+        return list(self._iter_report_rows(self._get_report_criteria()))
 
-        return room_list
+    @api.model
+    def _iter_report_rows(self, criteria):
+        """Yield one row per booked room of the bookings matching the
+        criteria. Bookings are read by chunks and the room names of each
+        chunk are fetched with a single query."""
+        domain = []
+        if criteria.get("checkin"):
+            domain.append(("checkin_date", ">=", criteria["checkin"]))
+        if criteria.get("checkout"):
+            domain.append(("checkout_date", "<=", criteria["checkout"]))
+        line_domain = []
+        if criteria.get("room_id"):
+            line_domain.append(("room_id", "=", criteria["room_id"]))
+        for bookings in self.env["room.booking"]._search_read_chunks(
+                domain,
+                ["partner_id", "name", "checkin_date", "checkout_date"]):
+            lines = self.env["room.booking.line"].search_read(
+                [("booking_id", "in", [rec["id"] for rec in bookings]),
+                 ("room_id", "!=", False)] + line_domain,
+                ["booking_id", "room_id"], order="booking_id, id")
+            rooms_by_booking = {}
+            for line in lines:
+                rooms_by_booking.setdefault(line["booking_id"][0], []).append(
+                    line["room_id"][1])
+            for rec in bookings:
+                for room in rooms_by_booking.get(rec["id"], []):
+                    yield {
+                        "id": rec["id"],
+                        "name": rec["name"],
+                        "partner_id": rec["partner_id"][1],
+                        "checkin_date": fields.Datetime.to_string(
+                            rec["checkin_date"]),
+                        "checkout_date": fields.Datetime.to_string(
+                            rec["checkout_date"]),
+                        "room": room,
+                    }
 
-    def get_xlsx_report(self, data, response):
-        """Organizing xlsx report"""
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {"in_memory": True})
+    @api.model
+    def get_xlsx_report(self, criteria, output):
+        """Write the xlsx report of the criteria into the output file. The
+        workbook is in constant memory mode, rows are flushed to disk as
+        they are written."""
+        workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
         sheet = workbook.add_worksheet()
         cell_format = workbook.add_format(
             {"font_size": "14px", "bold": True, "align": "center",
@@ -123,9 +145,9 @@ class RoomBookingWizard(models.TransientModel):
         )
         body = workbook.add_format(
             {"align": "left", "text_wrap": True, "border": True})
-        sheet.merge_range("A1:F1", "Room Booking", head)
         sheet.set_column("A2:F2", 18)
         sheet.set_row(0, 30)
+        sheet.merge_range("A1:F1", "Room Booking", head)
         sheet.set_row(1, 20)
         sheet.write("A2", "Sl No.", cell_format)
         sheet.write("B2", "Guest Name", cell_format)
@@ -136,7 +158,7 @@ class RoomBookingWizard(models.TransientModel):
         row = 2
         column = 0
         value = 1
-        for i in data["booking"]:
+        for i in self._iter_report_rows(criteria):
             sheet.write(row, column, value, body)
             sheet.write(row, column + 1, i["partner_id"], body)
             sheet.write(row, column + 2, i["room"], body)
@@ -146,6 +168,3 @@ class RoomBookingWizard(models.TransientModel):
             row = row + 1
             value = value + 1
         workbook.close()
-        output.seek(0)
-        response.stream.write(output.read())
-        output.close()
@@ -19,11 +19,9 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 ###############################################################################
-import io
 import json
-from odoo import fields, models, _
+from odoo import api, fields, models, _
 from odoo.exceptions import ValidationError
-from odoo.tools import json_default
 
 try:
     from odoo.tools.misc import xlsxwriter
@@ -49,47 +47,67 @@ class SaleOrderWizard(models.TransientModel):
             self, data=data)
 
     def action_sale_order_excel(self):
-        """Button action for creating Sale Order Report"""
-        data = {
-            'booking': self.generate_data(),
-        }
+        """Button action for creating Sale Order Report, only the filter
+        criteria are sent to the xlsx controller"""
         return {
             'type': 'ir.actions.report',
             'data': {'model': 'sale.order.detail',
-                     'options': json.dumps(data,
-                                           default=json_default),
+                     'options': json.dumps(self._get_report_criteria()),
                      'output_format': 'xlsx',
                      'report_name': 'Excel Report',
                      },
             'report_type': 'xlsx',
         }
 
-    def generate_data(self):
-        """Generate data to be printed in the report"""
-        domain = []
+    def action_enqueue_report(self):
+        """Button action generating the report in the background, the format
+        is given by the report_format key of the context. A report already
+        generated for the same criteria and data is downloaded at once."""
+        job = self.env['hotel.report.job']._enqueue(
+            'sale_order', self.env.context.get('report_format', 'pdf'),
+            self._get_report_criteria())
+        return job.action_open_result()
+
+    def _get_report_criteria(self):
+        """Return the filters of the report as a JSON serializable dict"""
+        self.ensure_one()
         if self.checkin and self.checkout:
             if self.checkin > self.checkout:
                 raise ValidationError(_(
                     'Check-in date should be less than Check-out date'))
-        if self.checkin:
-            domain.append(('checkin_date', '>=', self.checkin), )
-        if self.checkout:
-            domain.append(('checkout_date', '<=', self.checkout), )
-        room_booking = self.env['room.booking'].search_read(domain=domain,
-                                                            fields=[
-                                                                'partner_id',
-                                                                'name',
-                                                                'checkin_date',
-                                                                'checkout_date',
-                                                                'amount_total'])
-        for rec in room_booking:
-            rec['partner_id'] = rec['partner_id'][1]
-        return room_booking
+        return {
+            'checkin': fields.Date.to_string(self.checkin),
+            'checkout': fields.Date.to_string(self.checkout),
+        }
+
+    def generate_data(self):
+        """Generate data to be printed in the report"""
+        return list(self._iter_report_rows(self._get_report_criteria()))
 
-    def get_xlsx_report(self, data, response):
-        """Organizing xlsx report"""
-        output = io.BytesIO()
-        workbook = xlsxwriter.Workbook(output, {'in_memory': True})
+    @api.model
+    def _iter_report_rows(self, criteria):
+        """Yield the bookings matching the criteria, read by chunks"""
+        domain = []
+        if criteria.get('checkin'):
+            domain.append(('checkin_date', '>=', criteria['checkin']), )
+        if criteria.get('checkout'):
+            domain.append(('checkout_date', '<=', criteria['checkout']), )
+        for bookings in self.env['room.booking']._search_read_chunks(
+                domain, ['partner_id', 'name', 'checkin_date',
+                         'checkout_date', 'amount_total']):
+            for rec in bookings:
+                rec['partner_id'] = rec['partner_id'][1]
+                rec['checkin_date'] = fields.Datetime.to_string(
+                    rec['checkin_date'])
+                rec['checkout_date'] = fields.Datetime.to_string(
+                    rec['checkout_date'])
+                yield rec
+
+    @api.model
+    def get_xlsx_report(self, criteria, output):
+        """Write the xlsx report of the criteria into the output file in
+        constant memory mode"""
+        workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
         sheet = workbook.add_worksheet()
         cell_format = workbook.add_format(
             {'font_size': '14px', 'bold': True, 'align': 'center',
@@ -99,9 +117,9 @@ class SaleOrderWizard(models.TransientModel):
              'border': True})
         body = workbook.add_format(
             {'align': 'left', 'text_wrap': True, 'border': True})
-        sheet.merge_range('A1:F1', 'Sale Order', head)
         sheet.set_column('A2:F2', 18)
         sheet.set_row(0, 30)
+        sheet.merge_range('A1:F1', 'Sale Order', head)
         sheet.set_row(1, 20)
         sheet.write('A2', 'Sl No.', cell_format)
         sheet.write('B2', 'Guest Name', cell_format)
@@ -112,7 +130,7 @@ class SaleOrderWizard(models.TransientModel):
         row = 2
         column = 0
         value = 1
-        for i in data['booking']:
+        for i in self._iter_report_rows(criteria):
             sheet.write(row, column, value, body)
             sheet.write(row, column + 1, i['partner_id'], body)
             sheet.write(row, column + 2, i['checkin_date'], body)
@@ -123,6 +141,3 @@ class SaleOrderWizard(models.TransientModel):
             row = row + 1
             value = value + 1
         workbook.close()
-        output.seek(0)
-        response.stream.write(output.read())
-        output.close()
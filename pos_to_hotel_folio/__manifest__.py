@@ -9,10 +9,12 @@
     'depends': ['point_of_sale', 'pos_restaurant', 'hotel_management_odoo'],
     'data': [
         'security/ir.model.access.csv',
+        'data/ir_cron_data.xml',
         'views/pos_order_views.xml',
         'views/room_booking_views.xml',
         'views/room_booking_beneficiary_view.xml',
         'views/account_move_report.xml',
+        'views/pos_folio_charge_views.xml',
     ],
     'assets': {
         'point_of_sale._assets_pos': [
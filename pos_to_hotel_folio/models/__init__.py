@@ -2,5 +2,9 @@ from . import pos_order
 from . import service_booking_line
 from . import room_booking
 from . import account_move
+from . import hotel_service
+from . import pos_config
+from . import room_booking_line
+from . import pos_folio_charge
 
 from . import pos_order
\ No newline at end of file
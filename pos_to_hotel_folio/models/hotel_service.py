@@ -0,0 +1,45 @@
+from odoo import api, fields, models
+
+
+class HotelService(models.Model):
+    _inherit = 'hotel.service'
+
+    product_id = fields.Many2one(
+        'product.product',
+        string='POS Product',
+        index='btree_not_null',
+        copy=False,
+        help='Product this service is created from when POS orders are sent to folio.',
+    )
+
+    _sql_constraints = [
+        ('product_uniq', 'unique(product_id)',
+         'A product can only be linked to one hotel service.'),
+    ]
+
+    @api.model
+    def _get_services_for_products(self, products, prices=None):
+        """Return a dict mapping product ids to their hotel service, linking
+        or creating the missing services in batch."""
+        prices = prices or {}
+        services = self.search([('product_id', 'in', products.ids)])
+        service_by_product = {service.product_id.id: service for service in services}
+        missing = products.filtered(lambda product: product.id not in service_by_product)
+        if missing:
+            # Services created before the product link are matched by name once,
+            # products sharing a name each get their own service.
+            products_by_name = {}
+            for product in missing.sorted('id'):
+                products_by_name.setdefault(product.display_name, []).append(product)
+            for service in self.search([('name', 'in', list(products_by_name)), ('product_id', '=', False)]):
+                if products_by_name.get(service.name):
+                    product = products_by_name[service.name].pop(0)
+                    service.product_id = product
+                    service_by_product[product.id] = service
+            created = self.create([{
+                'name': product.display_name,
+                'unit_price': prices.get(product.id, product.lst_price),
+                'product_id': product.id,
+            } for product in missing if product.id not in service_by_product])
+            service_by_product.update({service.product_id.id: service for service in created})
+        return service_by_product
@@ -0,0 +1,21 @@
+from odoo import api, fields, models
+
+
+class PosConfig(models.Model):
+    _inherit = 'pos.config'
+
+    hotel_occupied_rooms = fields.Json(
+        string='Occupied Rooms',
+        compute='_compute_hotel_occupied_rooms',
+        help='Rooms with an active folio, loaded with the POS data and kept up to date over the bus.',
+    )
+
+    def _compute_hotel_occupied_rooms(self):
+        for config in self:
+            config.hotel_occupied_rooms = self.env['room.booking']._get_pos_occupied_rooms(config.company_id)
+
+    @api.model
+    def _load_pos_data_fields(self, config_id):
+        fields_list = super()._load_pos_data_fields(config_id)
+        # An empty list loads all the fields
+        return fields_list + ['hotel_occupied_rooms'] if fields_list else fields_list
@@ -0,0 +1,152 @@
+import logging
+import threading
+from datetime import timedelta
+
+from odoo import api, fields, models, _
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Charges are retried with an exponential backoff (in minutes) and marked as
+# failed after this many attempts, so they can be fixed and retried by hand.
+MAX_ATTEMPTS = 5
+MAX_BACKOFF = 60
+
+
+class PosFolioCharge(models.Model):
+    """Outbox of POS orders charged to a room, posted to folios by a cron."""
+    _name = 'pos.folio.charge'
+    _description = 'POS Charge to Room'
+    _order = 'id desc'
+    _rec_name = 'pos_order_id'
+
+    pos_order_id = fields.Many2one(
+        'pos.order',
+        string='POS Order',
+        required=True,
+        readonly=True,
+        ondelete='cascade',
+        help='Order charged to the room.',
+    )
+    room_id = fields.Many2one(
+        'hotel.room',
+        string='Room',
+        required=True,
+        readonly=True,
+        help='Room whose active folio receives the order lines.',
+    )
+    company_id = fields.Many2one(
+        related='pos_order_id.company_id',
+        store=True,
+        help='Company of the POS order.',
+    )
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('done', 'Posted'),
+        ('failed', 'Failed'),
+    ], string='Status', default='pending', required=True, readonly=True, index=True,
+        help='Pending charges are posted by the background worker.')
+    attempts = fields.Integer(
+        readonly=True,
+        help='Number of failed posting attempts.',
+    )
+    next_attempt = fields.Datetime(
+        string='Next Attempt',
+        default=fields.Datetime.now,
+        readonly=True,
+        help='Pending charges are not posted before this date.',
+    )
+    date_done = fields.Datetime(
+        string='Posted On',
+        readonly=True,
+        help='Date the order lines were added to the folio.',
+    )
+    error = fields.Text(
+        readonly=True,
+        help='Error raised by the last failed attempt.',
+    )
+
+    _sql_constraints = [
+        ('pos_order_uniq', 'unique(pos_order_id)',
+         'A POS order can only be charged to a room once.'),
+    ]
+
+    @api.model
+    def _enqueue(self, orders):
+        """Queue the orders for posting; orders already queued are ignored, so
+        sending the same order twice never charges it twice."""
+        if not orders:
+            return
+        self.env.cr.execute(SQL("""
+            INSERT INTO pos_folio_charge (pos_order_id, room_id, company_id, state,
+                                          attempts, next_attempt, create_uid, create_date,
+                                          write_uid, write_date)
+            SELECT o.id, o.room_id, o.company_id, 'pending', 0, %(now)s,
+                   %(uid)s, %(now)s, %(uid)s, %(now)s
+              FROM pos_order o
+             WHERE o.id IN %(ids)s
+            ON CONFLICT (pos_order_id) DO NOTHING
+        """, now=fields.Datetime.now(), uid=self.env.uid, ids=tuple(orders.ids)))
+        self.invalidate_model()
+        self.env.ref('pos_to_hotel_folio.ir_cron_pos_folio_charge')._trigger()
+
+    def action_retry(self):
+        self.write({'state': 'pending', 'attempts': 0, 'error': False,
+                    'next_attempt': fields.Datetime.now()})
+        self.env.ref('pos_to_hotel_folio.ir_cron_pos_folio_charge')._trigger()
+
+    @api.model
+    def _cron_post_charges(self, batch_size=100):
+        """Post the pending charges in batches, committing after each one.
+
+        Rows are claimed with SKIP LOCKED so concurrent workers never post the
+        same order; a failing batch is replayed charge by charge so one bad
+        order does not hold back the others."""
+        commit = not getattr(threading.current_thread(), 'testing', False)
+        while True:
+            self.env.cr.execute(SQL("""
+                SELECT id FROM pos_folio_charge
+                 WHERE state = 'pending' AND next_attempt <= %s
+                 ORDER BY id
+                 LIMIT %s
+                   FOR UPDATE SKIP LOCKED
+            """, fields.Datetime.now(), batch_size))
+            charges = self.browse(row[0] for row in self.env.cr.fetchall())
+            if not charges:
+                break
+            try:
+                with self.env.cr.savepoint():
+                    charges._post()
+            except Exception:
+                for charge in charges:
+                    try:
+                        with self.env.cr.savepoint():
+                            charge._post()
+                    except Exception as e:
+                        _logger.warning("Could not post POS order %s to folio", charge.pos_order_id.name, exc_info=True)
+                        charge._register_failure(e)
+            if commit:
+                self.env.cr.commit()
+            if len(charges) < batch_size:
+                break
+
+    def _post(self):
+        self.pos_order_id._post_to_folio()
+        self.write({'state': 'done', 'date_done': fields.Datetime.now(), 'error': False})
+
+    def _register_failure(self, error):
+        self.ensure_one()
+        attempts = self.attempts + 1
+        self.write({
+            'attempts': attempts,
+            'error': str(error),
+            'state': 'failed' if attempts >= MAX_ATTEMPTS else 'pending',
+            'next_attempt': fields.Datetime.now() + timedelta(minutes=min(2 ** attempts, MAX_BACKOFF)),
+        })
+
+    @api.autovacuum
+    def _gc_posted_charges(self):
+        self.search([
+            ('state', '=', 'done'),
+            ('date_done', '<', fields.Datetime.now() - timedelta(days=30)),
+        ]).unlink()
@@ -25,30 +25,27 @@ class PosOrder(models.Model):
 
     @api.depends()
     def _compute_occupied_room_ids(self):
-        BookingLine = self.env['room.booking.line']
-        active_lines = BookingLine.search([
-            ('booking_id.state', 'in', ['draft', 'check_in'])
-        ])
-        room_ids = active_lines.mapped('room_id').ids
-        for order in self:
-            order.occupied_room_ids = [(6, 0, room_ids)]
+        """Rooms with an active folio, read once per company of the orders."""
+        for company, orders in self.grouped('company_id').items():
+            rooms = self.env['room.booking']._get_pos_occupied_rooms(company)
+            orders.occupied_room_ids = [(6, 0, [room['id'] for room in rooms])]
 
     @api.model
     def get_occupied_rooms(self):
-        BookingLine = self.env['room.booking.line']
-        active_lines = BookingLine.search([
-            ('booking_id.state', 'in', ['draft', 'check_in'])
-        ])
-        rooms = active_lines.mapped('room_id')
-        return [{'id': room.id, 'name': room.display_name} for room in rooms] if rooms else []
+        return self.env['room.booking']._get_pos_occupied_rooms()
 
     def _get_active_booking_for_room(self, room):
         self.ensure_one()
-        Booking = self.env['room.booking']
-        return Booking.search([
-            ('state', 'in', ['draft', 'check_in']),
-            ('room_line_ids.room_id', '=', room.id),
-        ], limit=1, order='id desc')
+        return self._get_active_bookings_for_rooms(room).get(room.id, self.env['room.booking'])
+
+    @api.model
+    def _get_active_bookings_for_rooms(self, rooms):
+        """Return a dict mapping room ids to their latest active folio, in one query."""
+        groups = self.env['room.booking.line']._read_group([
+            ('room_id', 'in', rooms.ids),
+            ('booking_id.state', 'in', ['draft', 'check_in']),
+        ], ['room_id'], ['booking_id:max'])
+        return {room.id: booking for room, booking in groups}
 
     def action_send_to_folio(self):
         for order in self:
@@ -57,33 +54,34 @@ class PosOrder(models.Model):
             if not order.room_id:
                 raise UserError(_('Please select a room before sending to folio.'))
 
-            booking = order._get_active_booking_for_room(order.room_id)
-            if not booking:
+        booking_by_room = self._get_active_bookings_for_rooms(self.room_id)
+        for order in self:
+            if order.room_id.id not in booking_by_room:
                 raise UserError(_('No active folio found for the selected room.'))
 
-            # Create service lines in folio (no category; appears in services section via module UI)
-            for line in order.lines:
-                product = line.product_id
-                quantity = line.qty
-                price_unit = line.price_unit
+        # The folio is updated by the outbox worker, so the till never waits on
+        # locks held on busy bookings.
+        self.env['pos.folio.charge']._enqueue(self)
+        self.write({'sent_to_folio': True, 'state': 'done'})
+        return True
+
+    def _post_to_folio(self):
+        """Add the order lines to the active folio of their room."""
+        booking_by_room = self._get_active_bookings_for_rooms(self.room_id)
+        for order in self:
+            if order.room_id.id not in booking_by_room:
+                raise UserError(_('No active folio found for room %s.', order.room_id.name))
 
-                hotel_service = self.env['hotel.service'].search([
-                    ('name', '=', product.display_name),
-                ], limit=1)
-                if not hotel_service:
-                    hotel_service = self.env['hotel.service'].create({
-                        'name': product.display_name,
-                        'unit_price': price_unit,
-                        # No category_id; Cybrosys module uses default service type or UI grouping for "Food"
-                    })
-                self.env['service.booking.line'].create({
-                    'booking_id': booking.id,
-                    'service_id': hotel_service.id,
-                    'uom_qty': quantity,
-                    'pos_order_date': order.date_order,
-                    'pos_table_id': getattr(order, 'table_id', False) and order.table_id.id or False,
-                })
+        # Services are linked to the POS products, resolved for all the lines at once
+        lines = self.lines
+        service_by_product = self.env['hotel.service']._get_services_for_products(
+            lines.product_id, {line.product_id.id: line.price_unit for line in lines})
 
-            order.sent_to_folio = True
-            order.state = 'done'
-        return True
\ No newline at end of file
+        # Create service lines in folio (no category; appears in services section via module UI)
+        self.env['service.booking.line'].create([{
+            'booking_id': booking_by_room[order.room_id.id].id,
+            'service_id': service_by_product[line.product_id.id].id,
+            'uom_qty': line.qty,
+            'pos_order_date': order.date_order,
+            'pos_table_id': getattr(order, 'table_id', False) and order.table_id.id or False,
+        } for order in self for line in order.lines])
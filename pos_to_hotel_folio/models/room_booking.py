@@ -1,4 +1,7 @@
-from odoo import fields, models
+from odoo import api, fields, models, SUPERUSER_ID
+
+# Folio states in which POS orders can be charged to the room.
+POS_FOLIO_STATES = ['draft', 'check_in']
 
 
 class RoomBooking(models.Model):
@@ -20,16 +23,82 @@ class RoomBooking(models.Model):
         domain="[('parent_id','=',partner_id)]",
     )
 
-    def action_invoice(self):
-        res = super().action_invoice()
-        # Link created invoice to booking and set beneficiary if available
-        if isinstance(res, dict) and res.get('res_id'):
-            invoice = self.env['account.move'].browse(res['res_id'])
-            for booking in self:
-                invoice.write({
-                    'booking_id': booking.id,
-                    'beneficiary_id': booking.beneficiary_id.id or False,
-                    'beneficiary_ids': [(6, 0, booking.beneficiary_ids.ids)],
-                })
+    def _create_invoices(self, until=None):
+        # Invoices are linked to their booking by the hotel module, carry the beneficiaries over
+        moves = super()._create_invoices(until)
+        for move in moves:
+            move.write({
+                'beneficiary_id': move.booking_id.beneficiary_id.id or False,
+                'beneficiary_ids': [(6, 0, move.booking_id.beneficiary_ids.ids)],
+            })
+        return moves
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'state' in vals:
+            self._invalidate_pos_occupied_rooms(self._get_pos_rooms_by_company())
+        return res
+
+    def unlink(self):
+        rooms_by_company = self._get_pos_rooms_by_company()
+        res = super().unlink()
+        self._invalidate_pos_occupied_rooms(rooms_by_company)
         return res
 
+    def _get_pos_rooms_by_company(self):
+        rooms_by_company = {}
+        for booking in self:
+            rooms_by_company.setdefault(booking.company_id.id, set()).update(
+                booking.room_line_ids.room_id.ids)
+        return rooms_by_company
+
+    @api.model
+    def _get_pos_occupied_rooms(self, company=None):
+        """Return the rooms with an active folio of the company as a list of
+        dicts with their id and name, open POS sessions get the changes
+        pushed over the bus."""
+        company = company or self.env.company
+        groups = self.env['room.booking.line'].sudo()._read_group([
+            ('booking_id.state', 'in', POS_FOLIO_STATES),
+            ('booking_id.company_id', '=', company.id),
+            ('room_id', '!=', False),
+        ], ['room_id'])
+        return [{'id': room.id, 'name': room.display_name} for room, in groups]
+
+    @api.model
+    def _invalidate_pos_occupied_rooms(self, rooms_by_company):
+        """Queue the given rooms (dict of company id to room ids) for a push
+        of their occupation to the open POS sessions once committed."""
+        pending = self.env.cr.postcommit.data.setdefault(
+            'pos_to_hotel_folio.occupied_rooms', {})
+        if not pending:
+            self.env.cr.postcommit.add(self._push_pos_occupied_rooms)
+        for company_id, room_ids in rooms_by_company.items():
+            pending.setdefault(company_id, set()).update(room_ids)
+
+    @api.model
+    def _push_pos_occupied_rooms(self):
+        """Send the occupation of the queued rooms to the open POS sessions of
+        their company, read from the committed data."""
+        pending = self.env.cr.postcommit.data.pop('pos_to_hotel_folio.occupied_rooms', {})
+        with self.env.registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            for company_id, room_ids in pending.items():
+                if not room_ids:
+                    continue
+                groups = env['room.booking.line']._read_group([
+                    ('booking_id.state', 'in', POS_FOLIO_STATES),
+                    ('booking_id.company_id', '=', company_id),
+                    ('room_id', 'in', list(room_ids)),
+                ], ['room_id'])
+                occupied = [{'id': room.id, 'name': room.display_name} for room, in groups]
+                released = sorted(set(room_ids) - {room['id'] for room in occupied})
+                configs = env['pos.session'].search([
+                    ('state', '!=', 'closed'),
+                    ('config_id.company_id', '=', company_id),
+                ]).config_id
+                for config in configs:
+                    config._notify('HOTEL_OCCUPIED_ROOMS', {
+                        'occupied': occupied,
+                        'released': released,
+                    })
@@ -0,0 +1,29 @@
+from odoo import api, models
+
+
+class RoomBookingLine(models.Model):
+    _inherit = 'room.booking.line'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super().create(vals_list)
+        lines._invalidate_pos_occupied_rooms()
+        return lines
+
+    def write(self, vals):
+        if not {'room_id', 'booking_id'} & set(vals):
+            return super().write(vals)
+        self._invalidate_pos_occupied_rooms()
+        res = super().write(vals)
+        self._invalidate_pos_occupied_rooms()
+        return res
+
+    def unlink(self):
+        self._invalidate_pos_occupied_rooms()
+        return super().unlink()
+
+    def _invalidate_pos_occupied_rooms(self):
+        rooms_by_company = {}
+        for line in self.filtered('room_id'):
+            rooms_by_company.setdefault(line.booking_id.company_id.id, set()).add(line.room_id.id)
+        self.env['room.booking']._invalidate_pos_occupied_rooms(rooms_by_company)
@@ -7,18 +7,24 @@ import { ActionpadWidget } from '@point_of_sale/app/screens/product_screen/actio
 import { SelectionPopup } from '@point_of_sale/app/utils/input_popups/selection_popup';
 import { makeAwaitable } from '@point_of_sale/app/store/make_awaitable_dialog';
 
-// Load occupied rooms after the POS data is processed
+// Occupied rooms are loaded with the POS config and kept up to date by the
+// changes pushed on the POS bus channel when folios change.
 patch(PosStore.prototype, {
     async afterProcessServerData() {
         const res = await super.afterProcessServerData(...arguments);
-        try {
-            this.occupied_rooms = await this.data.call('pos.order', 'get_occupied_rooms', []);
-        } catch (error) {
-            console.error('pos_to_hotel_folio: failed to load occupied rooms', error);
-            this.occupied_rooms = [];
-        }
+        this.occupied_rooms = this.config.hotel_occupied_rooms || [];
+        this.data.connectWebSocket('HOTEL_OCCUPIED_ROOMS', (payload) => {
+            this.updateOccupiedRooms(payload);
+        });
         return res;
     },
+    updateOccupiedRooms({ occupied = [], released = [] }) {
+        const changed = new Set([...released, ...occupied.map((room) => room.id)]);
+        this.occupied_rooms = (this.occupied_rooms || [])
+            .filter((room) => !changed.has(room.id))
+            .concat(occupied)
+            .sort((a, b) => a.id - b.id);
+    },
     async pay() {
         // Intercept the default payment flow in restaurant mode
         if (this.config?.module_pos_restaurant) {